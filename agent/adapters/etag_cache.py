@@ -0,0 +1,146 @@
+"""Persistent ETag cache for conditional GitHub REST requests.
+
+GitHub answers a request carrying If-None-Match with 304 Not Modified when the
+resource is unchanged, and 304s do not count against the primary rate limit.
+The cache keeps each response's ETag and body on disk so unchanged resources
+cost a 304 even after a restart, and keeps the parsed body in memory so a hit
+skips JSON parsing entirely. Callers always get their own copy of a body, so
+mutating a response cannot corrupt the cache.
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional, Tuple
+from agent.config.storage import data_path
+
+GITHUB_CACHE_ENABLED = os.getenv("GITHUB_CACHE", "true").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+GITHUB_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "5000"))
+
+
+class ETagCache:
+    """SQLite-backed store of (ETag, body) per request, with hit/miss counters.
+
+    A hit is a request answered with 304 from a cached body; a miss is one that
+    had to download the body.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or data_path("github_etags.sqlite")
+        self.max_entries = max_entries or GITHUB_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (etag, parsed body) for entries already parsed in this process
+        self._parsed: dict[str, Tuple[str, Any]] = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                etag TEXT NOT NULL,
+                body TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(url: str, token: str) -> str:
+        """Cache key for a URL - responses differ per token, so it is included."""
+        return hashlib.sha256(f"{token}\0{url}".encode()).hexdigest()
+
+    def etag(self, key: str) -> Optional[str]:
+        """ETag to send as If-None-Match, or None if nothing is cached."""
+        with self._lock:
+            if key in self._parsed:
+                return self._parsed[key][0]
+            row = self._conn.execute(
+                "SELECT etag FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def hit(self, key: str) -> Optional[Any]:
+        """Copy of the cached body after a 304, or None if it has gone missing."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            if key in self._parsed:
+                self.hits += 1
+                return copy.deepcopy(self._parsed[key][1])
+            row = self._conn.execute(
+                "SELECT etag, body FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.hits += 1
+            # Parsed once per process, then served from memory
+            value = json.loads(row[1])
+            self._parsed[key] = (row[0], value)
+            return copy.deepcopy(value)
+
+    def store(self, key: str, etag: Optional[str], body: str, value: Any):
+        """Record a downloaded response (a miss) and cache it if it has an ETag."""
+        with self._lock:
+            self.misses += 1
+            if not etag:
+                return
+            self._parsed[key] = (etag, copy.deepcopy(value))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, etag, body, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, etag, body, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        rows = self._conn.execute(
+            "SELECT key FROM entries ORDER BY last_used ASC LIMIT ?",
+            (count - self.max_entries,),
+        ).fetchall()
+        for (key,) in rows:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._parsed.pop(key, None)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the number of cached entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_cache: Optional[ETagCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_etag_cache() -> Optional[ETagCache]:
+    """Get the shared cache, or None when GITHUB_CACHE is disabled."""
+    global _cache
+    if not GITHUB_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ETagCache()
+    return _cache
@@ -3,10 +3,19 @@
 import os
 import re
 import httpx
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel
+from agent.adapters.etag_cache import get_etag_cache
+from agent.adapters.rate_limit import github_limiter, send_with_retries
 
 GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+# Pull requests resolved per GraphQL query (keeps the query cost well below limits)
+PR_BATCH_SIZE = 50
+# Most recently updated PRs listed per repo when polling (one conditional request)
+RECENT_PRS_PER_REPO = int(os.getenv("GITHUB_RECENT_PRS", "100"))
+
+PR_URL_PATTERN = re.compile(r"github\.com/([^/]+)/([^/]+)/pull/(\d+)")
 
 
 class PullRequest(BaseModel):
@@ -18,6 +27,22 @@ class PullRequest(BaseModel):
     merged: bool
     html_url: str
     head_ref: str  # branch name
+    merge_commit_sha: Optional[str] = None  # set once merged
+
+
+def _pr_from_rest(data: dict) -> PullRequest:
+    """Build a PullRequest from a REST pull request object (single or listed)."""
+    merged = data.get("merged_at") is not None
+    return PullRequest(
+        number=data["number"],
+        title=data["title"],
+        state=data["state"],
+        merged=merged,
+        html_url=data["html_url"],
+        head_ref=data["head"]["ref"],
+        # Before the merge this is GitHub's test merge commit
+        merge_commit_sha=data.get("merge_commit_sha") if merged else None,
+    )
 
 
 class GitHubAdapter:
@@ -37,14 +62,163 @@ class GitHubAdapter:
             "X-GitHub-Api-Version": "2022-11-28",
         }
 
-    def _get(self, path: str) -> dict:
-        """Execute a GET request to GitHub API."""
+    def _get(self, path: str) -> Any:
+        """Execute a GET request to GitHub API, paced by the shared rate limiter.
+
+        Requests are conditional when the ETag cache has the resource: an
+        unchanged resource comes back as a 304 (free against the rate limit)
+        and the cached body is returned without parsing.
+        """
         url = f"{GITHUB_API_URL}{path}"
-        response = httpx.get(url, headers=self.headers)
+        cache = get_etag_cache()
+        key = cache.key(url, self.api_key) if cache else None
+        etag = cache.etag(key) if cache else None
+
+        headers = {**self.headers, "If-None-Match": etag} if etag else self.headers
+        response = send_with_retries(
+            github_limiter, lambda: httpx.get(url, headers=headers)
+        )
+        if response.status_code == 304:
+            cached = cache.hit(key)
+            if cached is not None:
+                return cached
+            # Entry was evicted meanwhile - fetch the body unconditionally
+            response = send_with_retries(
+                github_limiter, lambda: httpx.get(url, headers=self.headers)
+            )
+
+        if response.status_code != 200:
+            print(f"GitHub API error: {response.status_code} - {response.text}")
+        response.raise_for_status()
+        data = response.json()
+        if cache:
+            cache.store(key, response.headers.get("ETag"), response.text, data)
+        return data
+
+    def _graphql(self, query: str, variables: dict) -> dict:
+        """Execute a GraphQL query, paced by the shared rate limiter.
+
+        Returns:
+            The response's data; errors for individual aliases (e.g. a deleted
+            PR) are logged and leave that alias null.
+        """
+        response = send_with_retries(
+            github_limiter,
+            lambda: httpx.post(
+                GITHUB_GRAPHQL_URL,
+                headers=self.headers,
+                json={"query": query, "variables": variables},
+            ),
+        )
         if response.status_code != 200:
             print(f"GitHub API error: {response.status_code} - {response.text}")
         response.raise_for_status()
-        return response.json()
+
+        result = response.json()
+        for error in result.get("errors") or []:
+            print(f"GitHub GraphQL error: {error.get('message')}")
+        return result.get("data") or {}
+
+    def get_recent_prs(self, repo: str) -> Dict[int, PullRequest]:
+        """List a repo's most recently updated PRs, open and closed.
+
+        This is a single conditional request: while none of the repo's PRs
+        change, GitHub answers 304 and the cached listing is reused without
+        touching the rate limit. A PR that merges or closes moves to the top
+        of the listing, so tracked PRs stay inside it.
+
+        Args:
+            repo: Repository as owner/name
+
+        Returns:
+            Mapping of PR number to PullRequest for up to RECENT_PRS_PER_REPO PRs
+        """
+        data = self._get(
+            f"/repos/{repo}/pulls?state=all&sort=updated&direction=desc"
+            f"&per_page={RECENT_PRS_PER_REPO}"
+        )
+        return {pr["number"]: _pr_from_rest(pr) for pr in data}
+
+    def get_prs_by_urls(self, pr_urls: List[str]) -> Dict[str, Optional[PullRequest]]:
+        """Get many PRs at once.
+
+        Each repo's recent-PR listing is fetched first (a conditional request
+        that usually comes back 304); PRs missing from it are resolved with
+        one GraphQL query per PR_BATCH_SIZE URLs, each PR an aliased
+        repository.pullRequest lookup.
+
+        Args:
+            pr_urls: Full PR URLs like https://github.com/owner/repo/pull/123
+
+        Returns:
+            Mapping of each URL to its PullRequest, or None if it could not be
+            parsed or fetched.
+        """
+        prs: Dict[str, Optional[PullRequest]] = {}
+        parsed = []
+        for url in dict.fromkeys(pr_urls):
+            match = PR_URL_PATTERN.search(url)
+            if match:
+                parsed.append((url, *match.groups()))
+            else:
+                print(f"Could not extract PR number from: {url}")
+                prs[url] = None
+
+        recent: Dict[str, Dict[int, PullRequest]] = {}
+        for owner, name in dict.fromkeys((owner, name) for _, owner, name, _ in parsed):
+            try:
+                recent[f"{owner}/{name}"] = self.get_recent_prs(f"{owner}/{name}")
+            except Exception as e:
+                print(f"Error listing PRs of {owner}/{name}: {e}")
+        missing = []
+        for url, owner, name, number in parsed:
+            pr = recent.get(f"{owner}/{name}", {}).get(int(number))
+            if pr:
+                prs[url] = pr
+            else:
+                missing.append((url, owner, name, number))
+        parsed = missing
+
+        for start in range(0, len(parsed), PR_BATCH_SIZE):
+            batch = parsed[start : start + PR_BATCH_SIZE]
+            params, fields, variables = [], [], {}
+            for i, (_, owner, name, number) in enumerate(batch):
+                params.append(
+                    f"$owner{i}: String!, $name{i}: String!, $number{i}: Int!"
+                )
+                fields.append(
+                    f"pr{i}: repository(owner: $owner{i}, name: $name{i}) {{ "
+                    f"pullRequest(number: $number{i}) {{ "
+                    "number title state merged url headRefName mergeCommit { oid } } }"
+                )
+                variables.update(
+                    {f"owner{i}": owner, f"name{i}": name, f"number{i}": int(number)}
+                )
+            query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+
+            try:
+                data = self._graphql(query, variables)
+            except Exception as e:
+                print(f"Error fetching {len(batch)} PRs: {e}")
+                data = {}
+
+            for i, (url, *_) in enumerate(batch):
+                pr = (data.get(f"pr{i}") or {}).get("pullRequest")
+                prs[url] = (
+                    PullRequest(
+                        number=pr["number"],
+                        title=pr["title"],
+                        # GraphQL reports MERGED where REST reports closed
+                        state="open" if pr["state"] == "OPEN" else "closed",
+                        merged=pr["merged"],
+                        html_url=pr["url"],
+                        head_ref=pr["headRefName"],
+                        merge_commit_sha=(pr.get("mergeCommit") or {}).get("oid"),
+                    )
+                    if pr
+                    else None
+                )
+        return prs
 
     def get_pr_by_url(self, pr_url: str) -> Optional[PullRequest]:
         """Get PR details from a GitHub PR URL.
@@ -68,15 +242,7 @@ class GitHubAdapter:
         repo = repo_match.group(1) if repo_match else self.repo
 
         try:
-            data = self._get(f"/repos/{repo}/pulls/{pr_number}")
-            return PullRequest(
-                number=data["number"],
-                title=data["title"],
-                state=data["state"],
-                merged=data.get("merged", False),
-                html_url=data["html_url"],
-                head_ref=data["head"]["ref"],
-            )
+            return _pr_from_rest(self._get(f"/repos/{repo}/pulls/{pr_number}"))
         except Exception as e:
             print(f"Error fetching PR {pr_number}: {e}")
             return None
@@ -99,17 +265,7 @@ class GitHubAdapter:
         """Get all open PRs for the configured repo."""
         try:
             data = self._get(f"/repos/{self.repo}/pulls?state=open")
-            return [
-                PullRequest(
-                    number=pr["number"],
-                    title=pr["title"],
-                    state=pr["state"],
-                    merged=pr.get("merged", False),
-                    html_url=pr["html_url"],
-                    head_ref=pr["head"]["ref"],
-                )
-                for pr in data
-            ]
+            return [_pr_from_rest(pr) for pr in data]
         except Exception as e:
             print(f"Error fetching open PRs: {e}")
             return []
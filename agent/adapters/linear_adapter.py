@@ -1,10 +1,211 @@
 import os
+import time
+import atexit
+import threading
+import importlib.util
 import httpx
-from typing import Optional, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Iterator, Optional, List, Tuple
 from pydantic import BaseModel
+from agent.adapters.rate_limit import (
+    asend_with_retries,
+    linear_limiter,
+    send_with_retries,
+)
 
 LINEAR_API_URL = "https://api.linear.app/graphql"
 
+# Connection pool settings shared by the sync and async clients
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("LINEAR_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("LINEAR_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=60.0,
+)
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# Default number of nodes requested per page for list queries
+PAGE_SIZE = int(os.getenv("LINEAR_PAGE_SIZE", "50"))
+# Nodes per nested connection (children, comments) inside a list query. Linear
+# scores a query by multiplying nested page sizes, so these stay small and
+# overflow is fetched per issue.
+NESTED_PAGE_SIZE = int(os.getenv("LINEAR_NESTED_PAGE_SIZE", "10"))
+
+# How long team and workflow-state IDs are trusted before being refetched
+ID_CACHE_TTL = float(os.getenv("LINEAR_ID_CACHE_TTL", "3600"))  # seconds
+
+
+class IdCache:
+    """Thread-safe TTL cache for Linear team and workflow-state IDs.
+
+    Keys are tuples such as ("team", team_key) or ("state", team_key, name).
+    A team_key of None is used for lookups that are not scoped to a team.
+    """
+
+    def __init__(self, ttl: float = ID_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Return a cached ID, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: tuple, value: str):
+        """Store an ID for the configured TTL."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def invalidate(self, key: Optional[tuple] = None):
+        """Drop one entry, or the whole cache when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: tuple):
+        """Drop every entry whose key starts with prefix, e.g. ("state", team)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[: len(prefix)] == prefix]:
+                del self._entries[key]
+
+
+# Shared by every adapter in the process - IDs are stable across instances
+id_cache = IdCache()
+
+
+class MutationBatch:
+    """Mutations collected by LinearAdapter.batch(), sent as one GraphQL document.
+
+    Each mutation becomes an aliased field (m0, m1, ...) of a single mutation
+    operation. Linear runs top-level mutation fields in document order, so the
+    writes land in the order they were made.
+    """
+
+    def __init__(self, adapter: "LinearAdapter"):
+        self.adapter = adapter
+        # (field with {i} placeholders, {variable: (type, value)}, replay, idempotent)
+        self._mutations: list[tuple[str, dict, Callable[[], bool], bool]] = []
+
+    def __len__(self) -> int:
+        return len(self._mutations)
+
+    def add(
+        self,
+        field: str,
+        variables: dict,
+        replay: Callable[[], bool],
+        idempotent: bool = True,
+    ):
+        """Queue a mutation field.
+
+        Args:
+            field: Mutation field selecting `success`, with variables written
+                as $name{i} so they can be suffixed per alias
+            variables: Variable name -> (GraphQL type, value)
+            replay: Sends the mutation on its own, used when it fails in the
+                batch (e.g. a stale cached state ID)
+            idempotent: Whether sending the mutation twice is harmless. A
+                non-idempotent mutation (commentCreate) is only replayed when
+                the response shows it did not run.
+        """
+        self._mutations.append((field, variables, replay, idempotent))
+
+    def flush(self) -> bool:
+        """Send every queued mutation in one request.
+
+        Mutations that report `success` are done. The rest are replayed on
+        their own - idempotent ones always, others only when the response
+        proves they did not run: their alias came back without `success`, or
+        the whole document was rejected before execution (errors, no data).
+
+        Returns:
+            True if every mutation succeeded (in the batch or on replay).
+        """
+        mutations, self._mutations = self._mutations, []
+        if not mutations:
+            return True
+
+        definitions, fields, values = [], [], {}
+        for i, (field, variables, _, _) in enumerate(mutations):
+            fields.append(f"m{i}: {field.format(i=i)}")
+            for name, (type_, value) in variables.items():
+                definitions.append(f"${name}{i}: {type_}")
+                values[f"{name}{i}"] = value
+        document = f"mutation Batch({', '.join(definitions)}) {{ {' '.join(fields)} }}"
+
+        try:
+            result = self.adapter._query(document, values)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 400:
+                raise
+            result = _json_body(e.response)
+
+        data = result.get("data")
+        # Per-alias outcomes are known if the document executed (data object)
+        # or was rejected outright (errors without a data key)
+        outcome_known = isinstance(data, dict) or (
+            "errors" in result and "data" not in result
+        )
+        ok = True
+        for i, (field, _, replay, idempotent) in enumerate(mutations):
+            if ((data or {}).get(f"m{i}") or {}).get("success"):
+                continue
+            if idempotent or outcome_known:
+                ok = replay() and ok
+            else:
+                name = field.split("(", 1)[0]
+                print(f"⚠️  Batched {name} may have been applied - not resending")
+                ok = False
+        return ok
+
+
+def _is_complexity_error(body: dict) -> bool:
+    """Whether Linear rejected a query for exceeding its complexity limit."""
+    return any(
+        "complex" in str(error.get("message", "")).lower()
+        for error in body.get("errors") or []
+        if isinstance(error, dict)
+    )
+
+
+def _is_invalid_input(body: dict) -> bool:
+    """Whether Linear rejected a request for referencing invalid input."""
+    for error in body.get("errors") or []:
+        extensions = (error.get("extensions") or {}) if isinstance(error, dict) else {}
+        if (
+            extensions.get("code") == "INVALID_INPUT"
+            or extensions.get("type") == "invalid input"
+        ):
+            return True
+    return False
+
+
+def _json_body(response: httpx.Response) -> dict:
+    """Decode a GraphQL error response, or {} if it is not JSON."""
+    try:
+        body = response.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+# Batch collecting this context's mutations (per thread and per asyncio task)
+_active_batch: ContextVar[Optional[MutationBatch]] = ContextVar(
+    "linear_mutation_batch", default=None
+)
+
 
 class LinearIssue(BaseModel):
     id: str
@@ -14,12 +215,122 @@ class LinearIssue(BaseModel):
     state: str
     priority: int
     parent_id: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class BoardSnapshot(BaseModel):
+    """Issues in every watched workflow state, fetched in a single request."""
+
+    states: dict[str, List[LinearIssue]] = {}
+    # Keyed by issue ID
+    comments: dict[str, List[str]] = {}
+    sub_issues: dict[str, List[LinearIssue]] = {}
+
+    def issues_in_state(self, state_name: str) -> List[LinearIssue]:
+        """Issues currently in a state (empty if the state was not fetched)."""
+        return self.states.get(state_name, [])
+
+
+PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+
+ISSUE_FIELDS = """
+    id
+    identifier
+    title
+    description
+    state { name }
+    priority
+    parent { id }
+    updatedAt
+"""
+
+# Shared by the sync and async issue lookups
+GET_ISSUE_QUERY = f"""
+query GetIssue($id: String!) {{
+    issue(id: $id) {{ {ISSUE_FIELDS} }}
+}}
+"""
+
+GET_COMMENTS_QUERY = f"""
+query GetComments($issueId: String!, $first: Int!, $after: String) {{
+    issue(id: $issueId) {{
+        comments(first: $first, after: $after) {{
+            nodes {{ body }}
+            {PAGE_INFO}
+        }}
+    }}
+}}
+"""
+
+
+def parse_issue(issue: dict) -> LinearIssue:
+    """Build a LinearIssue from a GraphQL issue node."""
+    return LinearIssue(
+        id=issue["id"],
+        identifier=issue["identifier"],
+        title=issue["title"],
+        description=issue.get("description"),
+        state=issue["state"]["name"],
+        priority=issue.get("priority", 0),
+        parent_id=issue.get("parent", {}).get("id") if issue.get("parent") else None,
+        updated_at=issue.get("updatedAt"),
+    )
+
+
+def client_options(headers: dict) -> dict:
+    """Keyword arguments shared by the sync and async HTTP clients."""
+    return {
+        "headers": headers,
+        "timeout": HTTP_TIMEOUT,
+        "limits": HTTP_LIMITS,
+        "http2": HTTP2_ENABLED,
+    }
+
+
+# One keep-alive client per API key, shared by every adapter in the process
+_shared_clients: dict[str, httpx.Client] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def shared_client(headers: dict) -> httpx.Client:
+    """Get the process-wide pooled client for these credentials."""
+    api_key = headers["Authorization"]
+    with _shared_clients_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            client = httpx.Client(**client_options(headers))
+            _shared_clients[api_key] = client
+    return client
+
+
+@atexit.register
+def close_shared_clients():
+    """Close the shared connection pools (runs at interpreter exit)."""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        client.close()
 
 
 class LinearAdapter:
-    """Adapter for Linear API interactions."""
+    """Adapter for Linear API interactions.
+
+    Adapters send requests through a keep-alive connection pool shared by the
+    whole process, so short-lived adapters (one per graph node) reuse open
+    TCP/TLS sessions instead of paying a handshake each.
 
-    def __init__(self):
+    The async methods (used by nodes under app.ainvoke) go through a pooled
+    httpx.AsyncClient owned by the adapter, since an async client is tied to
+    the event loop it was created in. Use `async with` (or call aclose()) to
+    release it.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.api_key = os.getenv("LINEAR_API_KEY")
         if not self.api_key:
             raise ValueError("LINEAR_API_KEY not set")
@@ -27,64 +338,487 @@ class LinearAdapter:
             "Authorization": self.api_key,
             "Content-Type": "application/json",
         }
+        # Team used to scope state-name lookups when callers don't pass one
+        self.default_team_key = os.getenv("LINEAR_TEAM_KEY")
+        # Caller-provided clients are used instead of the pools and never
+        # closed by the adapter
+        self._client = client
+        self._async_client = async_client
+        self._owns_async_client = async_client is None
 
-    def _query(self, query: str, variables: dict = None) -> dict:
-        """Execute a GraphQL query against Linear."""
+    @property
+    def client(self) -> httpx.Client:
+        """HTTP client - the process-wide pool unless one was passed in."""
+        if self._client is None:
+            self._client = shared_client(self.headers)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client, created on first use inside an event loop."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(**client_options(self.headers))
+        return self._async_client
+
+    def close(self):
+        """No-op kept for `with` usage.
+
+        The shared pool outlives adapters and a passed-in client belongs to
+        the caller, so an adapter has nothing of its own to release.
+        """
+
+    async def aclose(self):
+        """Close the async connection pool if this adapter owns it."""
+        if self._owns_async_client and self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def __enter__(self) -> "LinearAdapter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __aenter__(self) -> "LinearAdapter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @contextmanager
+    def batch(self) -> Iterator[MutationBatch]:
+        """Collect transitions, comments and description updates as one write.
+
+        Inside the block those calls are queued (and return True) instead of
+        being sent; on exit they are flushed as a single aliased mutation. If
+        the block raises, the queued mutations are dropped, so a failed step
+        leaves no partial writes behind. Nested blocks join the outer batch.
+
+        Usage:
+            with adapter.batch():
+                adapter.transition_issue(issue.id, "Done")
+                adapter.add_comment(issue.id, "Completed")
+        """
+        current = _active_batch.get()
+        if current is not None and current.adapter is self:
+            yield current
+            return
+
+        batch = MutationBatch(self)
+        token = _active_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            _active_batch.reset(token)
+        pending = len(batch)
+        if not batch.flush():
+            print(f"⚠️  Linear batch of {pending} mutation(s) did not fully apply")
+
+    def _batch(self) -> Optional[MutationBatch]:
+        """This context's open batch on this adapter, if any."""
+        batch = _active_batch.get()
+        return batch if batch is not None and batch.adapter is self else None
+
+    @staticmethod
+    def _build_payload(query: str, variables: dict = None) -> dict:
+        """Build a GraphQL request body."""
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
+        return payload
 
-        response = httpx.post(LINEAR_API_URL, headers=self.headers, json=payload)
+    @staticmethod
+    def _handle_response(response: httpx.Response) -> dict:
+        """Raise on HTTP errors and decode the GraphQL response."""
         if response.status_code != 200:
             print(f"Linear API error: {response.status_code} - {response.text}")
         response.raise_for_status()
         return response.json()
 
+    def _query(self, query: str, variables: dict = None) -> dict:
+        """Execute a GraphQL query against Linear.
+
+        Requests are paced by the shared Linear rate limiter, and rate-limited
+        or 5xx responses are retried before an error is raised.
+        """
+        payload = self._build_payload(query, variables)
+        response = send_with_retries(
+            linear_limiter,
+            lambda: self.client.post(LINEAR_API_URL, json=payload),
+            idempotent=not query.lstrip().startswith("mutation"),
+        )
+        return self._handle_response(response)
+
+    async def _aquery(self, query: str, variables: dict = None) -> dict:
+        """Async variant of _query, for nodes running under app.ainvoke."""
+        payload = self._build_payload(query, variables)
+        response = await asend_with_retries(
+            linear_limiter,
+            lambda: self.async_client.post(LINEAR_API_URL, json=payload),
+            idempotent=not query.lstrip().startswith("mutation"),
+        )
+        return self._handle_response(response)
+
+    @staticmethod
+    def _connection(result: dict, path: tuple[str, ...]) -> dict:
+        """The connection at path under a query result's data."""
+        connection = result.get("data") or {}
+        for key in path:
+            connection = connection.get(key) or {}
+        return connection
+
+    def paginate(
+        self,
+        query: str,
+        variables: dict,
+        path: tuple[str, ...],
+        page_size: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Stream the nodes of a GraphQL connection, following pageInfo cursors.
+
+        The query must accept `$first: Int!` and `$after: String` and select
+        `pageInfo { hasNextPage endCursor }` on the connection. Only one page is
+        held in memory at a time.
+
+        Args:
+            query: GraphQL query selecting a paginated connection
+            variables: Query variables (excluding first/after)
+            path: Keys leading from `data` to the connection
+            page_size: Nodes per request (defaults to LINEAR_PAGE_SIZE)
+            after: Cursor to resume from
+
+        Yields:
+            Raw GraphQL nodes, page by page
+        """
+        while True:
+            result = self._query(
+                query, {**variables, "first": page_size or PAGE_SIZE, "after": after}
+            )
+            connection = self._connection(result, path)
+
+            yield from connection.get("nodes", [])
+
+            page_info = connection.get("pageInfo") or {}
+            after = page_info.get("endCursor")
+            if not page_info.get("hasNextPage") or not after:
+                return
+
+    async def apaginate(
+        self,
+        query: str,
+        variables: dict,
+        path: tuple[str, ...],
+        page_size: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """Async variant of paginate."""
+        while True:
+            result = await self._aquery(
+                query, {**variables, "first": page_size or PAGE_SIZE, "after": after}
+            )
+            connection = self._connection(result, path)
+
+            for node in connection.get("nodes", []):
+                yield node
+
+            page_info = connection.get("pageInfo") or {}
+            after = page_info.get("endCursor")
+            if not page_info.get("hasNextPage") or not after:
+                return
+
+    def _mutate(self, mutation: str, variables: dict) -> dict:
+        """Execute a mutation, treating rejected input as a failed mutation.
+
+        Linear answers mutations that reference unknown IDs with a 400
+        carrying an INVALID_INPUT error, which callers use as the signal to
+        refetch cached IDs and retry. Any other error (rate limits that
+        outlasted the retries, authentication, malformed queries) is logged
+        by _query and raised.
+        """
+        try:
+            return self._query(mutation, variables)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 400 and _is_invalid_input(
+                _json_body(e.response)
+            ):
+                return {}
+            raise
+
+    def iter_issues_in_state(
+        self,
+        team_key: str,
+        state_name: str,
+        page_size: Optional[int] = None,
+        after: Optional[str] = None,
+        updated_after: Optional[str] = None,
+    ) -> Iterator[LinearIssue]:
+        """Stream issues in a specific workflow state, page by page.
+
+        When updated_after (ISO 8601) is given, only issues changed after that
+        instant are returned.
+        """
+        variables = {"teamKey": team_key, "stateName": state_name}
+        var_defs, updated_filter = "", ""
+        if updated_after:
+            variables["updatedAfter"] = updated_after
+            var_defs = "$updatedAfter: DateTimeOrDuration!"
+            updated_filter = "updatedAt: { gt: $updatedAfter }"
+
+        query = f"""
+        query IssuesInState(
+            $teamKey: String!, $stateName: String!, $first: Int!, $after: String
+            {var_defs}
+        ) {{
+            issues(first: $first, after: $after, filter: {{
+                team: {{ key: {{ eq: $teamKey }} }}
+                state: {{ name: {{ eq: $stateName }} }}
+                {updated_filter}
+            }}) {{
+                nodes {{ {ISSUE_FIELDS} }}
+                {PAGE_INFO}
+            }}
+        }}
+        """
+        nodes = self.paginate(query, variables, ("issues",), page_size, after)
+        for node in nodes:
+            yield parse_issue(node)
+
     def get_issues_in_state(self, team_key: str, state_name: str) -> List[LinearIssue]:
-        """Fetch issues in a specific workflow state."""
-        query = """
-        query IssuesInState($teamKey: String!, $stateName: String!) {
-            issues(filter: {
-                team: { key: { eq: $teamKey } }
-                state: { name: { eq: $stateName } }
-            }) {
-                nodes {
-                    id
-                    identifier
-                    title
-                    description
-                    state { name }
-                    priority
-                    parent { id }
-                }
-            }
+        """Fetch all issues in a specific workflow state."""
+        return list(self.iter_issues_in_state(team_key, state_name))
+
+    def get_board_snapshot(
+        self,
+        team_key: str,
+        state_names: List[str],
+        page_size: Optional[int] = None,
+        updated_after: Optional[str] = None,
+        incremental_states: Optional[List[str]] = None,
+        comment_states: Optional[List[str]] = None,
+        children_states: Optional[List[str]] = None,
+    ) -> BoardSnapshot:
+        """Fetch issues in several states, with their children and comments.
+
+        Every state is requested through its own alias in one GraphQL document,
+        so a whole poll cycle costs a single round-trip. Comments and children
+        are only selected for the states that need them, and only
+        LINEAR_NESTED_PAGE_SIZE of each per issue, to stay under Linear's query
+        complexity limit. States with more issues than fit on the first page
+        are completed with follow-up pages; issues whose children or comments
+        overflow are left out of those maps so callers fetch the full lists
+        themselves. If Linear still rejects the document as too complex, each
+        state is fetched with its own query.
+
+        Args:
+            team_key: Team key (e.g., "ENG")
+            state_names: Workflow states to include in the snapshot
+            page_size: Issues per state in the first request (defaults to
+                LINEAR_PAGE_SIZE)
+            updated_after: Only return issues changed after this ISO 8601
+                watermark (incremental polling)
+            incremental_states: States the updated_after filter applies to
+                (defaults to all of state_names); other states are fetched
+                in full
+            comment_states: States whose issues' comments are included
+            children_states: States whose issues' sub-issues are included
+
+        Returns:
+            BoardSnapshot with issues grouped by state name
+        """
+        if incremental_states is None:
+            incremental_states = state_names
+        comment_states = comment_states or []
+        children_states = children_states or []
+
+        variable_defs = ["$teamKey: String!", "$first: Int!", "$nestedFirst: Int!"]
+        selections = []
+        variables = {
+            "teamKey": team_key,
+            "first": page_size or PAGE_SIZE,
+            "nestedFirst": NESTED_PAGE_SIZE,
         }
+        if updated_after:
+            variable_defs.append("$updatedAfter: DateTimeOrDuration!")
+            variables["updatedAfter"] = updated_after
+
+        for i, state_name in enumerate(state_names):
+            variable_defs.append(f"$state{i}: String!")
+            variables[f"state{i}"] = state_name
+            updated_filter = ""
+            if updated_after and state_name in incremental_states:
+                updated_filter = "updatedAt: { gt: $updatedAfter }"
+            nested = ""
+            if state_name in children_states:
+                nested += f"""
+                    children(first: $nestedFirst) {{
+                        nodes {{ ...SnapshotIssue }}
+                        {PAGE_INFO}
+                    }}"""
+            if state_name in comment_states:
+                nested += f"""
+                    comments(first: $nestedFirst) {{
+                        nodes {{ body }}
+                        {PAGE_INFO}
+                    }}"""
+            selections.append(
+                f"""
+            state{i}: issues(
+                first: $first
+                filter: {{
+                    team: {{ key: {{ eq: $teamKey }} }}
+                    state: {{ name: {{ eq: $state{i} }} }}
+                    {updated_filter}
+                }}
+            ) {{
+                nodes {{
+                    ...SnapshotIssue{nested}
+                }}
+                {PAGE_INFO}
+            }}"""
+            )
+
+        query = f"""
+        query BoardSnapshot({", ".join(variable_defs)}) {{
+            {"".join(selections)}
+        }}
+
+        fragment SnapshotIssue on Issue {{
+            {ISSUE_FIELDS}
+        }}
+        """
+        try:
+            result = self._query(query, variables)
+        except httpx.HTTPStatusError as e:
+            result = _json_body(e.response)
+            if e.response.status_code != 400 or not _is_complexity_error(result):
+                raise
+
+        if _is_complexity_error(result):
+            return self._board_snapshot_per_state(
+                team_key,
+                state_names,
+                page_size,
+                updated_after,
+                incremental_states,
+                comment_states,
+                children_states,
+            )
+        data = result.get("data") or {}
+
+        snapshot = BoardSnapshot()
+        for i, state_name in enumerate(state_names):
+            connection = data.get(f"state{i}") or {}
+            nodes = connection.get("nodes", [])
+            issues = [parse_issue(node) for node in nodes]
+
+            for node in nodes:
+                comments = node.get("comments")
+                if comments is not None and not (
+                    (comments.get("pageInfo") or {}).get("hasNextPage")
+                ):
+                    snapshot.comments[node["id"]] = [
+                        c["body"] for c in comments.get("nodes", [])
+                    ]
+                children = node.get("children")
+                if children is not None and not (
+                    (children.get("pageInfo") or {}).get("hasNextPage")
+                ):
+                    snapshot.sub_issues[node["id"]] = [
+                        parse_issue(child) for child in children.get("nodes", [])
+                    ]
+
+            page_info = connection.get("pageInfo") or {}
+            if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                issues.extend(
+                    self.iter_issues_in_state(
+                        team_key,
+                        state_name,
+                        page_size=page_size,
+                        after=page_info["endCursor"],
+                        updated_after=updated_after
+                        if state_name in incremental_states
+                        else None,
+                    )
+                )
+            snapshot.states[state_name] = issues
+
+        return snapshot
+
+    def _board_snapshot_per_state(
+        self,
+        team_key: str,
+        state_names: List[str],
+        page_size: Optional[int],
+        updated_after: Optional[str],
+        incremental_states: List[str],
+        comment_states: List[str],
+        children_states: List[str],
+    ) -> BoardSnapshot:
+        """Fallback for a snapshot too complex for one request: a query per state.
+
+        A single state that is still too complex is fetched without comments
+        or children, which callers then fetch per issue.
         """
-        result = self._query(query, {"teamKey": team_key, "stateName": state_name})
-        issues = result.get("data", {}).get("issues", {}).get("nodes", [])
-
-        return [
-            LinearIssue(
-                id=issue["id"],
-                identifier=issue["identifier"],
-                title=issue["title"],
-                description=issue.get("description"),
-                state=issue["state"]["name"],
-                priority=issue["priority"],
-                parent_id=issue.get("parent", {}).get("id")
-                if issue.get("parent")
+        if len(state_names) == 1:
+            state_name = state_names[0]
+            print(f"⚠️  Snapshot of {state_name} too complex - fetching issues only")
+            issues = self.iter_issues_in_state(
+                team_key,
+                state_name,
+                page_size=page_size,
+                updated_after=updated_after
+                if state_name in incremental_states
                 else None,
             )
-            for issue in issues
-        ]
+            return BoardSnapshot(states={state_name: list(issues)})
+
+        print("⚠️  Board snapshot too complex - fetching one state per query")
+        snapshot = BoardSnapshot()
+        for state_name in state_names:
+            part = self.get_board_snapshot(
+                team_key,
+                [state_name],
+                page_size=page_size,
+                updated_after=updated_after,
+                incremental_states=incremental_states,
+                comment_states=comment_states,
+                children_states=children_states,
+            )
+            snapshot.states.update(part.states)
+            snapshot.comments.update(part.comments)
+            snapshot.sub_issues.update(part.sub_issues)
+        return snapshot
 
     def get_ready_issues(self, team_key: str) -> List[LinearIssue]:
         """Fetch issues in the 'AI: Create PRD' state. (Legacy - use get_issues_in_state)"""
         return self.get_issues_in_state(team_key, "AI: Create PRD")
 
-    def transition_issue(self, issue_id: str, state_name: str) -> bool:
-        """Move an issue to a different state."""
-        # First, get the state ID
+    def get_state_id(
+        self, state_name: str, team_key: Optional[str] = None, refresh: bool = False
+    ) -> Optional[str]:
+        """Resolve a workflow state name to its ID, using the shared ID cache.
+
+        Args:
+            state_name: Workflow state name (e.g., "AI: In Progress")
+            team_key: Scope the lookup to a team. When omitted, the first state
+                with this name across all teams is used.
+            refresh: Ignore any cached value and refetch from Linear.
+
+        Returns:
+            State ID, or None if no such state exists.
+        """
+        key = ("state", team_key, state_name)
+        if not refresh:
+            cached = id_cache.get(key)
+            if cached:
+                return cached
+
+        if team_key:
+            # Warms the cache for every state on the team in one request
+            self.get_workflow_states(team_key, refresh=refresh)
+            return id_cache.get(key)
+
         state_query = """
         query GetState($name: String!) {
             workflowStates(filter: { name: { eq: $name } }) {
@@ -96,10 +830,14 @@ class LinearAdapter:
         states = state_result.get("data", {}).get("workflowStates", {}).get("nodes", [])
 
         if not states:
-            return False
+            id_cache.invalidate(key)
+            return None
 
-        state_id = states[0]["id"]
+        id_cache.set(key, states[0]["id"])
+        return states[0]["id"]
 
+    def _update_issue_state(self, issue_id: str, state_id: str) -> bool:
+        """Run the issueUpdate mutation that moves an issue to a state ID."""
         mutation = """
         mutation UpdateIssue($id: String!, $stateId: String!) {
             issueUpdate(id: $id, input: { stateId: $stateId }) {
@@ -107,11 +845,50 @@ class LinearAdapter:
             }
         }
         """
-        result = self._query(mutation, {"id": issue_id, "stateId": state_id})
+        result = self._mutate(mutation, {"id": issue_id, "stateId": state_id})
         return result.get("data", {}).get("issueUpdate", {}).get("success", False)
 
+    def transition_issue(
+        self, issue_id: str, state_name: str, team_key: Optional[str] = None
+    ) -> bool:
+        """Move an issue to a different state (queued inside batch())."""
+        team_key = team_key or self.default_team_key
+        state_id = self.get_state_id(state_name, team_key)
+        if not state_id:
+            return False
+
+        batch = self._batch()
+        if batch is not None:
+            batch.add(
+                "issueUpdate(id: $id{i}, input: {{ stateId: $stateId{i} }}) "
+                "{{ success }}",
+                {"id": ("String!", issue_id), "stateId": ("String!", state_id)},
+                lambda: self.transition_issue(issue_id, state_name, team_key),
+            )
+            return True
+
+        if self._update_issue_state(issue_id, state_id):
+            return True
+
+        # The cached ID may be stale (state deleted or recreated) - refetch once
+        fresh_id = self.get_state_id(state_name, team_key, refresh=True)
+        if not fresh_id or fresh_id == state_id:
+            return False
+        return self._update_issue_state(issue_id, fresh_id)
+
     def add_comment(self, issue_id: str, body: str) -> bool:
-        """Add a comment to an issue."""
+        """Add a comment to an issue (queued inside batch())."""
+        batch = self._batch()
+        if batch is not None:
+            batch.add(
+                "commentCreate(input: {{ issueId: $issueId{i}, body: $body{i} }}) "
+                "{{ success }}",
+                {"issueId": ("String!", issue_id), "body": ("String!", body)},
+                lambda: self.add_comment(issue_id, body),
+                idempotent=False,
+            )
+            return True
+
         mutation = """
         mutation AddComment($issueId: String!, $body: String!) {
             commentCreate(input: { issueId: $issueId, body: $body }) {
@@ -123,7 +900,17 @@ class LinearAdapter:
         return result.get("data", {}).get("commentCreate", {}).get("success", False)
 
     def update_issue_description(self, issue_id: str, description: str) -> bool:
-        """Update an issue's description."""
+        """Update an issue's description (queued inside batch())."""
+        batch = self._batch()
+        if batch is not None:
+            batch.add(
+                "issueUpdate(id: $id{i}, input: {{ description: $description{i} }}) "
+                "{{ success }}",
+                {"id": ("String!", issue_id), "description": ("String!", description)},
+                lambda: self.update_issue_description(issue_id, description),
+            )
+            return True
+
         mutation = """
         mutation UpdateIssueDescription($id: String!, $description: String!) {
             issueUpdate(id: $id, input: { description: $description }) {
@@ -134,8 +921,14 @@ class LinearAdapter:
         result = self._query(mutation, {"id": issue_id, "description": description})
         return result.get("data", {}).get("issueUpdate", {}).get("success", False)
 
-    def get_team_id(self, team_key: str) -> Optional[str]:
-        """Get team ID by team key."""
+    def get_team_id(self, team_key: str, refresh: bool = False) -> Optional[str]:
+        """Get team ID by team key (cached)."""
+        key = ("team", team_key)
+        if not refresh:
+            cached = id_cache.get(key)
+            if cached:
+                return cached
+
         query = """
         query GetTeam($key: String!) {
             teams(filter: { key: { eq: $key } }) {
@@ -145,7 +938,12 @@ class LinearAdapter:
         """
         result = self._query(query, {"key": team_key})
         teams = result.get("data", {}).get("teams", {}).get("nodes", [])
-        return teams[0]["id"] if teams else None
+        if not teams:
+            id_cache.invalidate(key)
+            return None
+
+        id_cache.set(key, teams[0]["id"])
+        return teams[0]["id"]
 
     def create_sub_issue(
         self,
@@ -163,16 +961,7 @@ class LinearAdapter:
             return None
 
         # Get state ID for initial state
-        state_query = """
-        query GetState($name: String!) {
-            workflowStates(filter: { name: { eq: $name } }) {
-                nodes { id }
-            }
-        }
-        """
-        state_result = self._query(state_query, {"name": state_name})
-        states = state_result.get("data", {}).get("workflowStates", {}).get("nodes", [])
-        state_id = states[0]["id"] if states else None
+        state_id = self.get_state_id(state_name, team_key)
 
         # Create the sub-issue
         mutation = """
@@ -206,9 +995,24 @@ class LinearAdapter:
         if state_id:
             variables["stateId"] = state_id
 
-        result = self._query(mutation, variables)
+        result = self._mutate(mutation, variables)
         issue_data = result.get("data", {}).get("issueCreate", {})
 
+        if not issue_data.get("success"):
+            # Cached team/state IDs may be stale - refetch them and retry once
+            fresh_team_id = self.get_team_id(team_key, refresh=True)
+            fresh_state_id = self.get_state_id(state_name, team_key, refresh=True)
+            if fresh_team_id and (fresh_team_id, fresh_state_id) != (
+                team_id,
+                state_id,
+            ):
+                variables["teamId"] = fresh_team_id
+                variables.pop("stateId", None)
+                if fresh_state_id:
+                    variables["stateId"] = fresh_state_id
+                result = self._mutate(mutation, variables)
+                issue_data = result.get("data", {}).get("issueCreate", {})
+
         if not issue_data.get("success"):
             print(f"Failed to create sub-issue: {result}")
             return None
@@ -283,39 +1087,48 @@ class LinearAdapter:
         if state_data.get("success"):
             state = state_data.get("workflowState", {})
             print(f"✅ Created workflow state: {state.get('name')} ({state.get('id')})")
+            id_cache.set(("state", team_key, name), state.get("id"))
             return state.get("id")
         else:
             errors = result.get("errors", [])
             print(f"Failed to create workflow state: {errors}")
             return None
 
-    def get_workflow_states(self, team_key: str) -> List[str]:
-        """Get all workflow state names for a team."""
-        team_id = self.get_team_id(team_key)
+    def get_workflow_states(self, team_key: str, refresh: bool = False) -> List[str]:
+        """Get all workflow state names for a team.
+
+        Also warms the shared ID cache with every state ID on the team.
+        """
+        team_id = self.get_team_id(team_key, refresh=refresh)
         if not team_id:
             return []
 
-        query = """
-        query GetStates($teamId: String!) {
-            team(id: $teamId) {
-                states {
-                    nodes {
+        query = f"""
+        query GetStates($teamId: String!, $first: Int!, $after: String) {{
+            team(id: $teamId) {{
+                states(first: $first, after: $after) {{
+                    nodes {{
+                        id
                         name
-                    }
-                }
-            }
-        }
+                    }}
+                    {PAGE_INFO}
+                }}
+            }}
+        }}
         """
-        result = self._query(query, {"teamId": team_id})
-        states = (
-            result.get("data", {}).get("team", {}).get("states", {}).get("nodes", [])
-        )
-        return [s["name"] for s in states]
+        states = list(self.paginate(query, {"teamId": team_id}, ("team", "states")))
+        if refresh:
+            # Deleted or renamed states must not linger under their old names
+            id_cache.invalidate_prefix(("state", team_key))
+        for state in states:
+            id_cache.set(("state", team_key, state["name"]), state["id"])
+        return [state["name"] for state in states]
 
     def ensure_workflow_states(self, team_key: str) -> dict:
         """Ensure required workflow states exist for the AI factory.
 
-        Creates any missing states from the required set.
+        Creates any missing states from the required set. This also warms the
+        shared ID cache so later transitions skip the state lookup.
 
         Returns:
             Dict of state name -> created (True) or already existed (False)
@@ -394,102 +1207,151 @@ class LinearAdapter:
 
         return results
 
+    def iter_sub_issues(
+        self,
+        parent_id: str,
+        page_size: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Iterator[LinearIssue]:
+        """Stream sub-issues of a parent issue, page by page."""
+        query = f"""
+        query GetSubIssues($parentId: String!, $first: Int!, $after: String) {{
+            issue(id: $parentId) {{
+                children(first: $first, after: $after) {{
+                    nodes {{ {ISSUE_FIELDS} }}
+                    {PAGE_INFO}
+                }}
+            }}
+        }}
+        """
+        nodes = self.paginate(
+            query, {"parentId": parent_id}, ("issue", "children"), page_size, after
+        )
+        for node in nodes:
+            yield parse_issue(node)
+
     def get_sub_issues(self, parent_id: str) -> List[LinearIssue]:
         """Get all sub-issues of a parent issue."""
-        query = """
-        query GetSubIssues($parentId: String!) {
-            issue(id: $parentId) {
-                children {
-                    nodes {
-                        id
-                        identifier
-                        title
-                        description
-                        state { name }
-                        priority
-                        parent { id }
-                    }
-                }
-            }
-        }
+        return list(self.iter_sub_issues(parent_id))
+
+    def iter_issues_with_children(
+        self,
+        team_key: Optional[str] = None,
+        state_name: Optional[str] = None,
+        issue_ids: Optional[List[str]] = None,
+        top_level_only: bool = False,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Tuple[LinearIssue, List[LinearIssue]]]:
+        """Stream issues together with their sub-issues, page by page.
+
+        The first LINEAR_NESTED_PAGE_SIZE children are fetched in the same
+        request as their parent; only a parent with more children than that
+        costs follow-up pages.
+
+        Args:
+            team_key: Only issues of this team
+            state_name: Only issues in this workflow state
+            issue_ids: Only these issues
+            top_level_only: Only issues without a parent
+            page_size: Issues per request
+
+        Yields:
+            (issue, sub-issues) pairs
         """
-        result = self._query(query, {"parentId": parent_id})
-        children = (
-            result.get("data", {}).get("issue", {}).get("children", {}).get("nodes", [])
-        )
+        variable_defs = ["$first: Int!", "$after: String", "$childFirst: Int!"]
+        filters = []
+        variables = {"childFirst": NESTED_PAGE_SIZE}
+        if team_key:
+            variable_defs.append("$teamKey: String!")
+            filters.append("team: { key: { eq: $teamKey } }")
+            variables["teamKey"] = team_key
+        if state_name:
+            variable_defs.append("$stateName: String!")
+            filters.append("state: { name: { eq: $stateName } }")
+            variables["stateName"] = state_name
+        if issue_ids is not None:
+            if not issue_ids:
+                return
+            variable_defs.append("$ids: [ID!]")
+            filters.append("id: { in: $ids }")
+            variables["ids"] = list(issue_ids)
+        if top_level_only:
+            filters.append("parent: { null: true }")
 
-        return [
-            LinearIssue(
-                id=issue["id"],
-                identifier=issue["identifier"],
-                title=issue["title"],
-                description=issue.get("description"),
-                state=issue["state"]["name"],
-                priority=issue.get("priority", 0),
-                parent_id=issue.get("parent", {}).get("id")
-                if issue.get("parent")
-                else None,
-            )
-            for issue in children
-        ]
+        query = f"""
+        query IssuesWithChildren({", ".join(variable_defs)}) {{
+            issues(first: $first, after: $after, filter: {{ {" ".join(filters)} }}) {{
+                nodes {{
+                    {ISSUE_FIELDS}
+                    children(first: $childFirst) {{
+                        nodes {{ {ISSUE_FIELDS} }}
+                        {PAGE_INFO}
+                    }}
+                }}
+                {PAGE_INFO}
+            }}
+        }}
+        """
+        for node in self.paginate(query, variables, ("issues",), page_size):
+            children = node.get("children") or {}
+            sub_issues = [parse_issue(child) for child in children.get("nodes", [])]
+            page_info = children.get("pageInfo") or {}
+            if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                sub_issues.extend(
+                    self.iter_sub_issues(node["id"], after=page_info["endCursor"])
+                )
+            yield parse_issue(node), sub_issues
+
+    def iter_issue_comments(
+        self, issue_id: str, page_size: Optional[int] = None
+    ) -> Iterator[str]:
+        """Stream comment bodies on an issue, page by page."""
+        nodes = self.paginate(
+            GET_COMMENTS_QUERY, {"issueId": issue_id}, ("issue", "comments"), page_size
+        )
+        for node in nodes:
+            yield node["body"]
 
     def get_issue_comments(self, issue_id: str) -> List[str]:
         """Get all comments on an issue."""
-        query = """
-        query GetComments($issueId: String!) {
-            issue(id: $issueId) {
-                comments {
-                    nodes {
-                        body
-                    }
-                }
-            }
-        }
-        """
-        result = self._query(query, {"issueId": issue_id})
-        comments = (
-            result.get("data", {}).get("issue", {}).get("comments", {}).get("nodes", [])
+        return list(self.iter_issue_comments(issue_id))
+
+    async def aget_issue_comments(self, issue_id: str) -> List[str]:
+        """Async variant of get_issue_comments."""
+        nodes = self.apaginate(
+            GET_COMMENTS_QUERY, {"issueId": issue_id}, ("issue", "comments")
         )
-        return [c["body"] for c in comments]
+        return [node["body"] async for node in nodes]
 
     def get_issue_by_id(self, issue_id: str) -> Optional[LinearIssue]:
         """Get an issue by its ID."""
-        query = """
-        query GetIssue($id: String!) {
-            issue(id: $id) {
-                id
-                identifier
-                title
-                description
-                state { name }
-                priority
-                parent { id }
-            }
-        }
-        """
-        result = self._query(query, {"id": issue_id})
+        result = self._query(GET_ISSUE_QUERY, {"id": issue_id})
         issue = result.get("data", {}).get("issue")
 
         if not issue:
             return None
 
-        return LinearIssue(
-            id=issue["id"],
-            identifier=issue["identifier"],
-            title=issue["title"],
-            description=issue.get("description"),
-            state=issue["state"]["name"],
-            priority=issue.get("priority", 0),
-            parent_id=issue.get("parent", {}).get("id")
-            if issue.get("parent")
-            else None,
-        )
+        return parse_issue(issue)
+
+    async def aget_issue_by_id(self, issue_id: str) -> Optional[LinearIssue]:
+        """Async variant of get_issue_by_id."""
+        result = await self._aquery(GET_ISSUE_QUERY, {"id": issue_id})
+        issue = result.get("data", {}).get("issue")
+
+        if not issue:
+            return None
+
+        return parse_issue(issue)
 
     def all_sub_issues_completed(
         self, parent_id: str, completed_state: str = "Done"
     ) -> bool:
         """Check if all sub-issues of a parent are in the completed state."""
-        sub_issues = self.get_sub_issues(parent_id)
+        return self.sub_issues_completed(self.get_sub_issues(parent_id))
+
+    @staticmethod
+    def sub_issues_completed(sub_issues: List[LinearIssue]) -> bool:
+        """Check if already-fetched sub-issues are all in a completed state."""
         if not sub_issues:
             return False  # No sub-issues means not complete
 
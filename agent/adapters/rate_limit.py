@@ -0,0 +1,294 @@
+"""Rate-limit-aware request scheduling shared by the Linear and GitHub adapters.
+
+Each provider gets one process-wide token bucket. Requests take a token before
+they are sent; the refill rate starts from the provider's documented hourly
+budget and is re-derived from the rate-limit headers on every response, so the
+remaining budget is spread over the time left in the window instead of being
+spent in a burst and then failing. Rate-limited (429) and transient 5xx
+responses are retried with jittered exponential backoff, honouring
+Retry-After and the provider's reset time.
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional
+import httpx
+
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _header_float(headers: httpx.Headers, name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket for one API, kept in sync with its rate-limit headers.
+
+    Args:
+        name: Provider name used in logs and metrics
+        requests_per_hour: Budget assumed until the first response arrives
+        burst: Bucket size - how many requests may go out back to back
+        limit_header: Header with the window's total budget
+        remaining_header: Header with the budget left in the window
+        reset_header: Header with the window's reset time (unix epoch)
+        reset_in_ms: Whether the reset header is in milliseconds
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_hour: float,
+        burst: int,
+        limit_header: str,
+        remaining_header: str,
+        reset_header: str,
+        reset_in_ms: bool = False,
+    ):
+        self.name = name
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.rate = requests_per_hour / 3600
+        self._default_rate = self.rate
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.limit_header = limit_header
+        self.remaining_header = remaining_header
+        self.reset_header = reset_header
+        self.reset_in_ms = reset_in_ms
+
+        # Latest view of the provider's budget
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self.tokens -= 1
+            self.requests += 1
+
+            wait = max(0.0, self._blocked_until - now)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            if wait > 0:
+                self.throttled += 1
+                self.wait_time += wait
+            return wait
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Async variant of acquire."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update(self, response: httpx.Response):
+        """Re-derive the budget from a response's rate-limit headers."""
+        headers = response.headers
+        limit = _header_float(headers, self.limit_header)
+        remaining = _header_float(headers, self.remaining_header)
+        reset = _header_float(headers, self.reset_header)
+        retry_after = _header_float(headers, "Retry-After")
+
+        with self._lock:
+            now = time.monotonic()
+            if limit is not None:
+                self.limit = int(limit)
+            if reset is not None:
+                self.reset_at = reset / 1000 if self.reset_in_ms else reset
+            if remaining is not None:
+                self.remaining = int(remaining)
+                reset_in = (self.reset_at or 0) - time.time()
+                if reset_in > 0:
+                    # Spread what's left evenly over the rest of the window
+                    self.rate = max(self.remaining, 1) / reset_in
+                    self.tokens = min(self.tokens, float(self.remaining))
+                    if self.remaining <= 0:
+                        self._blocked_until = max(self._blocked_until, now + reset_in)
+                else:
+                    self.rate = self._default_rate
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Delay before retry number attempt (0-based).
+
+        Retry-After is honoured up to RETRY_MAX_DELAY; a longer wait is
+        enforced for every request by update(), via _blocked_until.
+        """
+        with self._lock:
+            self.retries += 1
+        if response is not None:
+            retry_after = _header_float(response.headers, "Retry-After")
+            if retry_after is not None:
+                return min(max(retry_after, 0.0), RETRY_MAX_DELAY)
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def stats(self) -> dict:
+        """Remaining budget and scheduling counters for this process."""
+        with self._lock:
+            reset_in = max(0.0, self.reset_at - time.time()) if self.reset_at else None
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_in": reset_in,
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "wait_time": self.wait_time,
+            }
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """Whether a response is a rate-limit rejection.
+
+    Besides 429, GitHub rejects with 403 once the remaining budget is 0 and
+    Linear answers with a RATELIMITED GraphQL error (HTTP 400).
+    """
+    if response.status_code == 429:
+        return True
+    if response.status_code == 403:
+        return response.headers.get("X-RateLimit-Remaining") == "0"
+    if response.status_code == 400:
+        return "RATELIMITED" in response.text
+    return False
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an error is likely to clear up on a later attempt.
+
+    Covers network failures, rate limits and 5xx responses that outlasted
+    send_with_retries; anything else (bad input, bugs) would fail again.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return (
+            is_rate_limited(error.response)
+            or error.response.status_code in RETRY_STATUSES
+        )
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def _should_retry(response: httpx.Response, idempotent: bool) -> bool:
+    # A rejected request never ran; a 5xx may have, so only idempotent ones retry
+    if is_rate_limited(response):
+        return True
+    return idempotent and response.status_code in RETRY_STATUSES
+
+
+def _should_retry_error(error: httpx.TransportError, idempotent: bool) -> bool:
+    # Connection failures happen before anything is sent
+    return idempotent or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def send_with_retries(
+    limiter: RateLimiter, send: Callable[[], httpx.Response], idempotent: bool = True
+) -> httpx.Response:
+    """Send a request through the limiter, retrying 429/5xx and network errors.
+
+    Args:
+        limiter: The provider's rate limiter
+        send: Performs the request
+        idempotent: Whether the request is safe to repeat after it may have
+            been processed (false for mutations: only rate-limit rejections
+            and connection failures are retried)
+
+    Returns:
+        The final response (still an error if retries ran out)
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = send()
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES or not _should_retry_error(e, idempotent):
+                raise
+            delay = limiter.retry_delay(attempt, None)
+            print(f"{limiter.name} request failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        limiter.update(response)
+        if attempt == MAX_RETRIES or not _should_retry(response, idempotent):
+            return response
+
+        delay = limiter.retry_delay(attempt, response)
+        print(f"{limiter.name} API {response.status_code}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+    return response
+
+
+async def asend_with_retries(
+    limiter: RateLimiter,
+    send: Callable[[], Awaitable[httpx.Response]],
+    idempotent: bool = True,
+) -> httpx.Response:
+    """Async variant of send_with_retries."""
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.aacquire()
+        try:
+            response = await send()
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES or not _should_retry_error(e, idempotent):
+                raise
+            delay = limiter.retry_delay(attempt, None)
+            print(f"{limiter.name} request failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        limiter.update(response)
+        if attempt == MAX_RETRIES or not _should_retry(response, idempotent):
+            return response
+
+        delay = limiter.retry_delay(attempt, response)
+        print(f"{limiter.name} API {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    return response
+
+
+# Shared by every adapter in the process
+linear_limiter = RateLimiter(
+    "Linear",
+    requests_per_hour=float(os.getenv("LINEAR_RATE_LIMIT", "1500")),
+    burst=int(os.getenv("LINEAR_RATE_BURST", "20")),
+    limit_header="X-RateLimit-Requests-Limit",
+    remaining_header="X-RateLimit-Requests-Remaining",
+    reset_header="X-RateLimit-Requests-Reset",
+    reset_in_ms=True,
+)
+github_limiter = RateLimiter(
+    "GitHub",
+    requests_per_hour=float(os.getenv("GITHUB_RATE_LIMIT", "5000")),
+    burst=int(os.getenv("GITHUB_RATE_BURST", "50")),
+    limit_header="X-RateLimit-Limit",
+    remaining_header="X-RateLimit-Remaining",
+    reset_header="X-RateLimit-Reset",
+)
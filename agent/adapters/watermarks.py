@@ -0,0 +1,61 @@
+"""Watermarks - persisted per-team updatedAt high-water marks for incremental polling."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+from agent.config.storage import data_path
+
+
+class WatermarkStore:
+    """JSON-file store of the newest `updatedAt` seen per Linear team.
+
+    Also records when each team last had a full (non-incremental) sync so the
+    poller can periodically reconcile changes the watermark cannot see.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or data_path("watermarks.json")
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, data: dict):
+        # Write-then-rename so a crash never leaves a half-written file
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, self.path)
+
+    def get_watermark(self, team_key: str) -> Optional[str]:
+        """Get the newest updatedAt (ISO 8601) seen for a team, if any."""
+        with self._lock:
+            return self._load().get(team_key, {}).get("updated_at")
+
+    def advance(self, team_key: str, updated_at: Optional[str]):
+        """Move a team's watermark forward (never backwards)."""
+        if not updated_at:
+            return
+        with self._lock:
+            data = self._load()
+            entry = data.setdefault(team_key, {})
+            # ISO 8601 UTC timestamps from Linear sort lexicographically
+            if updated_at > entry.get("updated_at", ""):
+                entry["updated_at"] = updated_at
+                self._save(data)
+
+    def last_full_sync(self, team_key: str) -> float:
+        """Get the unix time of the team's last full sync (0 if never)."""
+        with self._lock:
+            return self._load().get(team_key, {}).get("full_sync_at", 0.0)
+
+    def mark_full_sync(self, team_key: str, at: float):
+        """Record that a full sync of the team completed at the given unix time."""
+        with self._lock:
+            data = self._load()
+            data.setdefault(team_key, {})["full_sync_at"] = at
+            self._save(data)
@@ -0,0 +1,117 @@
+"""Durable graph checkpoints so interrupted runs resume instead of restarting.
+
+Each Linear issue gets its own checkpoint thread (thread_id = issue ID) in a
+SQLite database under the factory data directory. After a crash, the next poll
+finds the unfinished thread and continues from the last completed node, so LLM
+and Claude Code work already done is not repeated.
+"""
+
+import os
+import sqlite3
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from agent.config.storage import data_path
+
+CHECKPOINTS_ENABLED = os.getenv("FACTORY_CHECKPOINTS", "true").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+CHECKPOINT_DB = "checkpoints.sqlite"
+
+# langgraph-checkpoint-sqlite is optional - runs just aren't resumable without it
+SQLITE_AVAILABLE = importlib.util.find_spec("langgraph.checkpoint.sqlite") is not None
+
+
+# Pydantic models stored in AgentState that checkpoints may deserialize
+CHECKPOINT_TYPES = [
+    ("agent.adapters.linear_adapter", "LinearIssue"),
+    ("agent.state", "ReviewFeedback"),
+    ("agent.state", "WorkItem"),
+]
+
+
+def _serializer():
+    """Checkpoint serializer that allows the factory's own state models."""
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    try:
+        return JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES)
+    except TypeError:
+        # Older langgraph-checkpoint releases allow every type already
+        return JsonPlusSerializer()
+
+
+def thread_config(issue_id: str) -> dict:
+    """Graph config that ties a run to its Linear issue."""
+    return {"configurable": {"thread_id": issue_id}}
+
+
+def open_checkpointer():
+    """Open the SQLite checkpointer, or None when checkpoints are unavailable."""
+    if not CHECKPOINTS_ENABLED:
+        return None
+    if not SQLITE_AVAILABLE:
+        print("⚠️ langgraph-checkpoint-sqlite not installed - runs won't resume")
+        return None
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    # Workers share one connection; SqliteSaver serializes access itself
+    conn = sqlite3.connect(data_path(CHECKPOINT_DB), check_same_thread=False)
+    return SqliteSaver(conn, serde=_serializer())
+
+
+@asynccontextmanager
+async def open_async_checkpointer() -> AsyncIterator[Optional[object]]:
+    """Async counterpart of open_checkpointer for app.ainvoke runs."""
+    if not CHECKPOINTS_ENABLED or not SQLITE_AVAILABLE:
+        if CHECKPOINTS_ENABLED:
+            print("⚠️ langgraph-checkpoint-sqlite not installed - runs won't resume")
+        yield None
+        return
+
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    async with aiosqlite.connect(data_path(CHECKPOINT_DB)) as conn:
+        yield AsyncSqliteSaver(conn, serde=_serializer())
+
+
+def should_resume(graph, config: dict, phase: str) -> bool:
+    """Check whether the issue has an unfinished run for this phase.
+
+    A finished run, or one left over from a different phase, is deleted so the
+    new run starts from a clean thread.
+
+    Args:
+        graph: Compiled graph
+        config: Config from thread_config()
+        phase: Workflow phase the issue is being processed for
+
+    Returns:
+        True if the graph should be resumed with app.invoke(None, config)
+    """
+    if graph.checkpointer is None:
+        return False
+
+    snapshot = graph.get_state(config)
+    if snapshot.next and snapshot.values.get("workflow_phase") == phase:
+        return True
+    if snapshot.values:
+        graph.checkpointer.delete_thread(config["configurable"]["thread_id"])
+    return False
+
+
+async def ashould_resume(graph, config: dict, phase: str) -> bool:
+    """Async variant of should_resume."""
+    if graph.checkpointer is None:
+        return False
+
+    snapshot = await graph.aget_state(config)
+    if snapshot.next and snapshot.values.get("workflow_phase") == phase:
+        return True
+    if snapshot.values:
+        await graph.checkpointer.adelete_thread(config["configurable"]["thread_id"])
+    return False
@@ -0,0 +1,24 @@
+"""
+Local storage locations for agent state that must survive restarts.
+"""
+
+import os
+from pathlib import Path
+
+# Defaults to agent/.factory (gitignored); override with FACTORY_DATA_DIR
+DATA_DIR = Path(
+    os.getenv("FACTORY_DATA_DIR", Path(__file__).parent.parent / ".factory")
+)
+
+
+def data_path(name: str) -> Path:
+    """Get the path of a file inside the data directory, creating the directory.
+
+    Args:
+        name: File name relative to the data directory.
+
+    Returns:
+        Absolute path to the file (the file itself is not created).
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    return DATA_DIR / name
@@ -1,26 +1,65 @@
-from langgraph.graph import StateGraph, END
-from agent.state import AgentState
-from agent.nodes.product_manager import product_manager_node
-from agent.nodes.approval_gate import approval_gate_node
-from agent.nodes.classifier import classifier_node
-from agent.nodes.architect import architect_node
-from agent.nodes.contractor import contractor_node
-from agent.nodes.contractor_planner import contractor_planner_node
-from agent.nodes.infra_engineer import infra_engineer_node
-from agent.nodes.infra_engineer_planner import infra_engineer_planner_node
-from agent.nodes.software_engineer import software_engineer_node
-from agent.nodes.software_engineer_planner import software_engineer_planner_node
-from agent.nodes.sub_issue_handler import sub_issue_handler_node
-from agent.nodes.security import security_node
-from agent.nodes.compliance import compliance_node
-from agent.nodes.design import design_node
-from agent.nodes.supervisor import supervisor_node
-from agent.nodes.stack_manager import stack_manager_node
-from agent.nodes.publisher import publisher_node
-from agent.nodes.deployer import deployer_node
-from agent.nodes.test_agent import test_agent_node
-from agent.nodes.telemetry import telemetry_node
-from agent.nodes.reverter import reverter_node
+import asyncio
+import threading
+from importlib import import_module
+from agent.state import AgentState, WorkItemOutput
+
+# Node callables, imported on first use so importing this module (and every
+# CLI entry point) doesn't load the LLM, HTTP and CLI stacks up front. An
+# optional async variant is looked up as "a<function>" in the same module.
+NODES = {
+    "product_manager": "agent.nodes.product_manager:product_manager_node",
+    "approval_gate": "agent.nodes.approval_gate:approval_gate_node",
+    "classifier": "agent.nodes.classifier:classifier_node",
+    "contractor_planner": "agent.nodes.contractor_planner:contractor_planner_node",
+    "software_engineer_planner": "agent.nodes.software_engineer_planner:software_engineer_planner_node",
+    "infra_engineer_planner": "agent.nodes.infra_engineer_planner:infra_engineer_planner_node",
+    "sub_issue_handler": "agent.nodes.sub_issue_handler:sub_issue_handler_node",
+    "architect": "agent.nodes.architect:architect_node",
+    "stack_manager": "agent.nodes.stack_manager:stack_manager_node",
+    "start_work_item": "agent.nodes.stack_manager:start_work_item_node",
+    "fail_work_item": "agent.nodes.stack_manager:fail_work_item_node",
+    "contractor": "agent.nodes.contractor:contractor_node",
+    "infra_engineer": "agent.nodes.infra_engineer:infra_engineer_node",
+    "software_engineer": "agent.nodes.software_engineer:software_engineer_node",
+    "security": "agent.nodes.security:security_node",
+    "compliance": "agent.nodes.compliance:compliance_node",
+    "design": "agent.nodes.design:design_node",
+    "supervisor": "agent.nodes.supervisor:supervisor_node",
+    "publisher": "agent.nodes.publisher:publisher_node",
+    "deployer": "agent.nodes.deployer:deployer_node",
+    "test_agent": "agent.nodes.test_agent:test_agent_node",
+    "telemetry": "agent.nodes.telemetry:telemetry_node",
+    "reverter": "agent.nodes.reverter:reverter_node",
+}
+
+
+def resolve_node(name: str):
+    """Import a node and return (sync function, async variant or None)."""
+    module_name, func_name = NODES[name].split(":")
+    module = import_module(module_name)
+    return getattr(module, func_name), getattr(module, f"a{func_name}", None)
+
+
+def _node(name: str):
+    """Wrap a node so its module is only imported when the node first runs.
+
+    app.invoke calls the sync function. Under app.ainvoke the async variant is
+    awaited when the node has one (LLM, CLI and HTTP nodes); Linear- and
+    git-bound nodes without one run in a worker thread.
+    """
+    from langchain_core.runnables import RunnableLambda
+
+    def run(state: AgentState) -> dict:
+        func, _ = resolve_node(name)
+        return func(state)
+
+    async def arun(state: AgentState) -> dict:
+        func, afunc = resolve_node(name)
+        if afunc:
+            return await afunc(state)
+        return await asyncio.to_thread(func, state)
+
+    return RunnableLambda(run, afunc=arun, name=NODES[name].split(":")[1])
 
 
 def route_entry_point(state: AgentState) -> str:
@@ -79,8 +118,6 @@ def route_from_supervisor(state: AgentState) -> str:
         return "publisher"
     elif status == "drafting":
         request_type = state.get("request_type", "general")
-        if state.get("work_items"):
-            return "contractor"
         if request_type == "requires_contract":
             return "contractor"
         elif request_type == "infrastructure":
@@ -91,19 +128,44 @@ def route_from_supervisor(state: AgentState) -> str:
         return "end"
 
 
-def route_from_stack_manager(state: AgentState) -> str:
-    """Route from stack manager based on current work."""
+def route_from_stack_manager(state: AgentState):
+    """Start every ready work item in parallel, or finish the stack."""
+    from langgraph.types import Send
+    from agent.nodes.stack_manager import ready_work_items, work_item_input
+
     status = state.get("status", "")
-    if status.startswith("working_"):
-        return "contractor"
-    elif status == "stack_complete":
+    if status == "stack_complete":
         return "deployer"
-    else:
+    elif status == "failed":
         return "end"
 
+    # Each Send runs its own copy of the work item graph
+    return [
+        Send("work_item", work_item_input(state, item))
+        for item in ready_work_items(state.get("work_items") or [])
+    ] or "end"
+
+
+def route_from_start_work_item(state: AgentState) -> str:
+    """Draft the work item once its branch is ready."""
+    if state.get("status") == "failed":
+        return "end"
+    return "contractor"
+
+
+def route_work_item_from_supervisor(state: AgentState) -> str:
+    """Review loop for a single work item; a failed review fails the item."""
+    status = state["status"]
+    if status == "approved":
+        return "publisher"
+    elif status == "drafting":
+        return "contractor"
+    return "fail_work_item"
+
 
-def route_to_first_reviewer(state: AgentState) -> str:
-    """Route to first reviewer based on work item type."""
+def route_to_reviewers(state: AgentState) -> list[str]:
+    """Pick the reviewers for the current work item; they run in parallel."""
+    reviewers = ["security"]
     current_work = state.get("current_work_item")
     if current_work:
         work_type = (
@@ -112,19 +174,10 @@ def route_to_first_reviewer(state: AgentState) -> str:
             else current_work.type
         )
         if work_type == "BACKEND":
-            return "compliance"
+            reviewers.append("compliance")
         elif work_type == "FRONTEND":
-            return "design"
-    return "security"
-
-
-def route_from_publisher(state: AgentState) -> str:
-    """Route from publisher - continue stack or deploy."""
-    work_items = state.get("work_items", [])
-    current_index = state.get("current_work_index", 0)
-    if work_items and current_index < len(work_items):
-        return "stack_manager"
-    return "deployer"
+            reviewers.append("design")
+    return reviewers
 
 
 def route_from_test_agent(state: AgentState) -> str:
@@ -166,45 +219,102 @@ def route_from_planner(state: AgentState) -> str:
     return "end"
 
 
-def build_graph():
-    """Construct the Phase 3 agent workflow graph with technical review flow."""
+def build_work_item_graph():
+    """Construct the graph that takes one stacked work item to a PR.
+
+    start_work_item -> contractor -> reviewers (parallel) -> supervisor ->
+    publisher, with its own review loop (fail_work_item when the loop gives
+    up). The stack manager runs one of these per ready work item at the same
+    time; only the updated work item and messages are reported back to the
+    parent graph.
+    """
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(AgentState, output_schema=WorkItemOutput)
+
+    workflow.add_node("start_work_item", _node("start_work_item"))
+    workflow.add_node("contractor", _node("contractor"))
+    workflow.add_node("security", _node("security"))
+    workflow.add_node("compliance", _node("compliance"))
+    workflow.add_node("design", _node("design"))
+    workflow.add_node("supervisor", _node("supervisor"))
+    workflow.add_node("publisher", _node("publisher"))
+    workflow.add_node("fail_work_item", _node("fail_work_item"))
+
+    workflow.set_entry_point("start_work_item")
+    workflow.add_conditional_edges(
+        "start_work_item",
+        route_from_start_work_item,
+        {"contractor": "contractor", "end": END},
+    )
+
+    reviewers = ["security", "compliance", "design"]
+    workflow.add_conditional_edges("contractor", route_to_reviewers, reviewers)
+    for reviewer in reviewers:
+        workflow.add_edge(reviewer, "supervisor")
+
+    workflow.add_conditional_edges(
+        "supervisor",
+        route_work_item_from_supervisor,
+        {
+            "contractor": "contractor",
+            "publisher": "publisher",
+            "fail_work_item": "fail_work_item",
+        },
+    )
+    workflow.add_edge("publisher", END)
+    workflow.add_edge("fail_work_item", END)
+
+    return workflow.compile()
+
+
+def build_graph(checkpointer=None):
+    """Construct the Phase 3 agent workflow graph with technical review flow.
+
+    Args:
+        checkpointer: Optional LangGraph checkpointer; runs then need a
+            thread_id in their config and can be resumed after a crash
+    """
+    from langgraph.graph import StateGraph, END
+
     workflow = StateGraph(AgentState)
 
     # Entry router (determines if sub-issue or parent)
     workflow.add_node("entry_router", lambda state: state)  # Pass-through
 
     # Product Manager nodes
-    workflow.add_node("product_manager", product_manager_node)
-    workflow.add_node("approval_gate", approval_gate_node)
+    workflow.add_node("product_manager", _node("product_manager"))
+    workflow.add_node("approval_gate", _node("approval_gate"))
 
     # Classifier
-    workflow.add_node("classifier", classifier_node)
+    workflow.add_node("classifier", _node("classifier"))
 
     # Planner nodes (for parent issues)
-    workflow.add_node("contractor_planner", contractor_planner_node)
-    workflow.add_node("software_engineer_planner", software_engineer_planner_node)
-    workflow.add_node("infra_engineer_planner", infra_engineer_planner_node)
-    workflow.add_node("sub_issue_handler", sub_issue_handler_node)
+    workflow.add_node("contractor_planner", _node("contractor_planner"))
+    workflow.add_node("software_engineer_planner", _node("software_engineer_planner"))
+    workflow.add_node("infra_engineer_planner", _node("infra_engineer_planner"))
+    workflow.add_node("sub_issue_handler", _node("sub_issue_handler"))
 
     # Implementation nodes (for sub-issues)
-    workflow.add_node("architect", architect_node)
-    workflow.add_node("stack_manager", stack_manager_node)
-    workflow.add_node("contractor", contractor_node)
-    workflow.add_node("infra_engineer", infra_engineer_node)
-    workflow.add_node("software_engineer", software_engineer_node)
+    workflow.add_node("architect", _node("architect"))
+    workflow.add_node("stack_manager", _node("stack_manager"))
+    workflow.add_node("work_item", build_work_item_graph())
+    workflow.add_node("contractor", _node("contractor"))
+    workflow.add_node("infra_engineer", _node("infra_engineer"))
+    workflow.add_node("software_engineer", _node("software_engineer"))
 
     # Review nodes
-    workflow.add_node("security", security_node)
-    workflow.add_node("compliance", compliance_node)
-    workflow.add_node("design", design_node)
-    workflow.add_node("supervisor", supervisor_node)
+    workflow.add_node("security", _node("security"))
+    workflow.add_node("compliance", _node("compliance"))
+    workflow.add_node("design", _node("design"))
+    workflow.add_node("supervisor", _node("supervisor"))
 
     # Publishing & deployment nodes
-    workflow.add_node("publisher", publisher_node)
-    workflow.add_node("deployer", deployer_node)
-    workflow.add_node("test_agent", test_agent_node)
-    workflow.add_node("telemetry", telemetry_node)
-    workflow.add_node("reverter", reverter_node)
+    workflow.add_node("publisher", _node("publisher"))
+    workflow.add_node("deployer", _node("deployer"))
+    workflow.add_node("test_agent", _node("test_agent"))
+    workflow.add_node("telemetry", _node("telemetry"))
+    workflow.add_node("reverter", _node("reverter"))
 
     # Entry point: router decides if sub-issue or parent
     workflow.set_entry_point("entry_router")
@@ -263,33 +373,24 @@ def build_graph():
     # Architect -> Stack Manager (for contract requests)
     workflow.add_edge("architect", "stack_manager")
 
+    # Stack manager -> ready work items (parallel) -> stack manager, until
+    # every item is done (or one fails)
     workflow.add_conditional_edges(
         "stack_manager",
         route_from_stack_manager,
-        {"contractor": "contractor", "deployer": "deployer", "end": END},
+        {"work_item": "work_item", "deployer": "deployer", "end": END},
     )
+    workflow.add_edge("work_item", "stack_manager")
 
-    # Implementation nodes -> first reviewer
-    workflow.add_conditional_edges(
-        "contractor",
-        route_to_first_reviewer,
-        {"security": "security", "compliance": "compliance", "design": "design"},
-    )
-    workflow.add_conditional_edges(
-        "infra_engineer",
-        route_to_first_reviewer,
-        {"security": "security", "compliance": "compliance", "design": "design"},
-    )
-    workflow.add_conditional_edges(
-        "software_engineer",
-        route_to_first_reviewer,
-        {"security": "security", "compliance": "compliance", "design": "design"},
-    )
+    # Implementation nodes -> reviewers (parallel fan-out)
+    reviewers = ["security", "compliance", "design"]
+    for engineer in ["contractor", "infra_engineer", "software_engineer"]:
+        workflow.add_conditional_edges(engineer, route_to_reviewers, reviewers)
 
-    # Specialized reviewers -> Security (series)
-    workflow.add_edge("compliance", "security")
-    workflow.add_edge("design", "security")
-    workflow.add_edge("security", "supervisor")
+    # Reviewers -> Supervisor (fan-in: runs once after every reviewer in the
+    # step has appended its feedback)
+    for reviewer in reviewers:
+        workflow.add_edge(reviewer, "supervisor")
 
     workflow.add_conditional_edges(
         "supervisor",
@@ -303,11 +404,7 @@ def build_graph():
         },
     )
 
-    workflow.add_conditional_edges(
-        "publisher",
-        route_from_publisher,
-        {"stack_manager": "stack_manager", "deployer": "deployer"},
-    )
+    workflow.add_edge("publisher", "deployer")
 
     workflow.add_edge("deployer", "test_agent")
 
@@ -321,7 +418,26 @@ def build_graph():
 
     workflow.add_edge("reverter", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_app():
+    """Get the default compiled graph, building it on first use."""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = build_graph()
+    return _app
 
 
-app = build_graph()
+def __getattr__(name: str):
+    # `from agent.graph import app` / langgraph.json's graph.py:app compile on
+    # first access instead of at import
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,328 @@
+"""Durable job queue for issue processing, shared by every factory worker.
+
+Polling and webhooks enqueue one job per Linear issue; workers lease jobs,
+keep the lease alive with heartbeats while the graph runs, and mark them done
+or failed. A worker that crashes stops heartbeating, so its lease expires and
+another worker picks the job up again (resuming from the graph checkpoint).
+Jobs are deduplicated by issue ID, so several pollers never process the same
+issue twice. Jobs that fail with a transient error (network, rate limit, 5xx)
+are retried with exponential backoff; any other graph error marks the issue
+AI: Failed without a retry.
+
+The queue is a SQLite database in the factory data directory. Workers on one
+host share it automatically; workers on several hosts need FACTORY_JOB_DB to
+point at storage with working SQLite file locking.
+"""
+
+import os
+import json
+import time
+import random
+import socket
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional
+from pydantic import BaseModel
+from agent.adapters.linear_adapter import LinearIssue
+from agent.config.storage import data_path
+
+JOB_DB = os.getenv("FACTORY_JOB_DB")
+# Seconds a lease lasts without a heartbeat before the job is handed out again
+LEASE_SECONDS = int(os.getenv("FACTORY_JOB_LEASE", "300"))
+HEARTBEAT_INTERVAL = LEASE_SECONDS / 3
+MAX_ATTEMPTS = int(os.getenv("FACTORY_JOB_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = 30  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 900
+
+WORKER_ID = os.getenv("FACTORY_WORKER_ID", f"{socket.gethostname()}:{os.getpid()}")
+
+
+class Job(BaseModel):
+    """A leased unit of work: one issue in one workflow phase."""
+
+    issue: LinearIssue
+    phase_info: dict
+    attempts: int
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _changed_since(updated_at: Optional[str], finished_at: Optional[str]) -> bool:
+    """Whether an issue was updated after its last job finished."""
+    if not updated_at or not finished_at:
+        return True
+    try:
+        updated = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+        return updated > datetime.fromisoformat(finished_at)
+    except ValueError:
+        return True
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for a job that failed attempts times."""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobQueue:
+    """SQLite-backed job queue with leases, heartbeats and retries.
+
+    Job status is one of queued, leased, done or dead (out of attempts).
+    """
+
+    def __init__(self, path: Optional[str] = None, worker_id: str = WORKER_ID):
+        self.path = path or JOB_DB or data_path("jobs.sqlite")
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        # Autocommit mode - transactions are opened explicitly below
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                issue_id TEXT PRIMARY KEY,
+                identifier TEXT NOT NULL,
+                phase TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                finished_at TEXT
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at)"
+        )
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can't
+        # both read a job as available and lease it
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def enqueue(self, issue: LinearIssue, phase_info: dict) -> bool:
+        """Add a job for an issue unless one is already pending.
+
+        A job still waiting in the queue takes the new phase, priority and
+        issue data, so it runs what the board shows now. A finished job is
+        only re-queued when the issue changed after it finished, so a stale
+        board snapshot can't re-run an issue.
+
+        Returns:
+            True if a job was queued, False if it was a duplicate.
+        """
+        payload = json.dumps(
+            {"issue": issue.model_dump(mode="json"), "phase_info": phase_info}
+        )
+        now = time.time()
+
+        with self._lock:
+            self._transaction()
+            try:
+                row = self._conn.execute(
+                    "SELECT status, finished_at FROM jobs WHERE issue_id = ?",
+                    (issue.id,),
+                ).fetchone()
+
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO jobs (issue_id, identifier, phase, priority, "
+                        "payload, status, available_at, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                        (
+                            issue.id,
+                            issue.identifier,
+                            phase_info["phase"],
+                            issue.priority,
+                            payload,
+                            now,
+                            now,
+                        ),
+                    )
+                    queued = True
+                elif row[0] in ("done", "dead") and _changed_since(
+                    issue.updated_at, row[1]
+                ):
+                    self._conn.execute(
+                        "UPDATE jobs SET phase = ?, priority = ?, payload = ?, "
+                        "status = 'queued', attempts = 0, available_at = ?, "
+                        "lease_owner = NULL, lease_expires = NULL, last_error = NULL, "
+                        "created_at = ?, finished_at = NULL WHERE issue_id = ?",
+                        (
+                            phase_info["phase"],
+                            issue.priority,
+                            payload,
+                            now,
+                            now,
+                            issue.id,
+                        ),
+                    )
+                    queued = True
+                else:
+                    if row[0] == "queued":
+                        self._conn.execute(
+                            "UPDATE jobs SET phase = ?, priority = ?, payload = ? "
+                            "WHERE issue_id = ?",
+                            (phase_info["phase"], issue.priority, payload, issue.id),
+                        )
+                    queued = False
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return queued
+
+    def lease(self, exclude_phases: Optional[List[str]] = None) -> Optional[Job]:
+        """Lease the most urgent available job.
+
+        Queued jobs whose backoff has passed and leased jobs whose lease
+        expired (crashed worker) are both available. Urgent Linear priorities
+        go first, then the oldest job.
+
+        Args:
+            exclude_phases: Workflow phases this worker has no free slot for
+
+        Returns:
+            The leased job, or None if nothing is available.
+        """
+        now = time.time()
+        phase_filter = ""
+        params: list = [now, now]
+        if exclude_phases:
+            phase_filter = (
+                f"AND phase NOT IN ({', '.join('?' for _ in exclude_phases)})"
+            )
+            params.extend(exclude_phases)
+
+        with self._lock:
+            self._transaction()
+            try:
+                row = self._conn.execute(
+                    f"""SELECT issue_id, payload, attempts FROM jobs
+                    WHERE ((status = 'queued' AND available_at <= ?)
+                        OR (status = 'leased' AND lease_expires < ?))
+                    {phase_filter}
+                    ORDER BY CASE WHEN priority BETWEEN 1 AND 4 THEN priority
+                        ELSE 5 END, created_at
+                    LIMIT 1""",
+                    params,
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                issue_id, payload, attempts = row
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'leased', attempts = ?, "
+                    "lease_owner = ?, lease_expires = ? WHERE issue_id = ?",
+                    (attempts + 1, self.worker_id, now + LEASE_SECONDS, issue_id),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        data = json.loads(payload)
+        return Job(
+            issue=LinearIssue(**data["issue"]),
+            phase_info=data["phase_info"],
+            attempts=attempts + 1,
+        )
+
+    def heartbeat(self, issue_ids: List[str]) -> int:
+        """Extend this worker's leases on the given jobs.
+
+        Returns:
+            Number of leases still held (lower than len(issue_ids) if a lease
+            already expired and was taken over).
+        """
+        if not issue_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in issue_ids)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE status = 'leased' "
+                f"AND lease_owner = ? AND issue_id IN ({placeholders})",
+                [time.time() + LEASE_SECONDS, self.worker_id, *issue_ids],
+            )
+        return cursor.rowcount
+
+    def complete(self, issue_id: str):
+        """Mark a leased job done."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, "
+                "lease_expires = NULL, finished_at = ? "
+                "WHERE issue_id = ? AND status = 'leased' AND lease_owner = ?",
+                (_now_iso(), issue_id, self.worker_id),
+            )
+
+    def fail(self, issue_id: str, error: str) -> Optional[float]:
+        """Release a failed job for a retry after a backoff delay.
+
+        Returns:
+            Seconds until the retry, or None if the job is out of attempts.
+        """
+        with self._lock:
+            self._transaction()
+            try:
+                row = self._conn.execute(
+                    "SELECT attempts FROM jobs WHERE issue_id = ? "
+                    "AND status = 'leased' AND lease_owner = ?",
+                    (issue_id, self.worker_id),
+                ).fetchone()
+                if row is None:
+                    # Lease was lost to another worker - it owns the job now
+                    self._conn.execute("COMMIT")
+                    return None
+
+                if row[0] >= MAX_ATTEMPTS:
+                    delay = None
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'dead', lease_owner = NULL, "
+                        "lease_expires = NULL, last_error = ?, finished_at = ? "
+                        "WHERE issue_id = ?",
+                        (error, _now_iso(), issue_id),
+                    )
+                else:
+                    delay = retry_delay(row[0])
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'queued', available_at = ?, "
+                        "lease_owner = NULL, lease_expires = NULL, last_error = ? "
+                        "WHERE issue_id = ?",
+                        (time.time() + delay, error, issue_id),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return delay
+
+    def stats(self) -> dict:
+        """Job counts by status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue, opening it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+    return _queue
@@ -0,0 +1,92 @@
+"""Shared, lazily-built LLM clients for the graph nodes.
+
+Nodes ask for a model with get_llm() at call time instead of constructing
+their own client at import. The first call loads .env and builds one
+ChatGoogleGenerativeAI per model name; other temperatures and the cached
+variant are shallow copies that share its underlying google-genai client (and
+so its connection pool).
+
+Set FACTORY_LLM=fake, or call use_llm() with any chat model, to run the graph
+against a local fake model in tests and benchmarks.
+"""
+
+import os
+import threading
+from typing import Optional
+from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
+from agent.llm_cache import get_llm_cache
+
+DEFAULT_MODEL = os.getenv("FACTORY_LLM_MODEL", "gemini-2.0-flash")
+
+_base_clients: dict[str, BaseChatModel] = {}
+_variants: dict[tuple, BaseChatModel] = {}
+_override: Optional[BaseChatModel] = None
+_lock = threading.Lock()
+
+
+def _build_client(model: str) -> BaseChatModel:
+    """Construct the provider client for a model name."""
+    load_dotenv()
+
+    if os.getenv("FACTORY_LLM", "").lower() == "fake":
+        from langchain_core.language_models.fake_chat_models import (
+            FakeListChatModel,
+        )
+
+        # Nodes fall back to their defaults when the JSON is empty
+        return FakeListChatModel(responses=["{}"])
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model=model, temperature=0)
+
+
+def get_llm(
+    temperature: float = 0, cached: bool = False, model: Optional[str] = None
+) -> BaseChatModel:
+    """Get a shared chat model, building the client on first use.
+
+    Args:
+        temperature: Sampling temperature
+        cached: Serve repeated prompts from the on-disk LLM cache (only
+            meaningful for deterministic, temperature-0 prompts)
+        model: Model name (defaults to FACTORY_LLM_MODEL)
+
+    Returns:
+        A chat model instance shared by every caller with the same arguments
+    """
+    if _override is not None:
+        return _override
+
+    model = model or DEFAULT_MODEL
+    key = (model, temperature, cached)
+    llm = _variants.get(key)
+    if llm is not None:
+        return llm
+
+    with _lock:
+        if key not in _variants:
+            if model not in _base_clients:
+                _base_clients[model] = _build_client(model)
+            base = _base_clients[model]
+
+            update = {"cache": get_llm_cache() if cached else None}
+            if "temperature" in type(base).model_fields:
+                update["temperature"] = temperature
+            # Shallow copy - the provider client and its transport are shared
+            _variants[key] = base.model_copy(update=update)
+        return _variants[key]
+
+
+def use_llm(llm: Optional[BaseChatModel]):
+    """Route every get_llm() call to the given model (None restores clients)."""
+    global _override
+    _override = llm
+
+
+def reset_llm_clients():
+    """Drop every built client so the next get_llm() call rebuilds it."""
+    with _lock:
+        _base_clients.clear()
+        _variants.clear()
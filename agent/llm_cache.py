@@ -0,0 +1,169 @@
+"""Persistent, content-addressed cache for deterministic LLM calls.
+
+Entries are keyed by a hash of LangChain's llm_string (model name, temperature
+and other call parameters) plus the prompt, so re-reviewing an unchanged
+contract or re-classifying a re-polled issue is answered from disk without
+spending tokens. The cache is size-bounded and evicts least-recently-used
+entries first.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Optional, Sequence
+from langchain_core.caches import BaseCache
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration, Generation
+from agent.config.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "true").lower() in {"1", "true", "yes"}
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "100"))
+
+
+class LLMCache(BaseCache):
+    """SQLite-backed LangChain cache with LRU eviction and hit/miss counters."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or data_path("llm_cache.sqlite")
+        self.max_bytes = max_bytes or int(LLM_CACHE_MAX_MB * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    @staticmethod
+    def _dump(generations: Sequence[Generation]) -> str:
+        return json.dumps(
+            [
+                {"message": messages_to_dict([g.message])[0]}
+                if isinstance(g, ChatGeneration)
+                else {"text": g.text}
+                for g in generations
+            ]
+        )
+
+    @staticmethod
+    def _load(value: str) -> list[Generation]:
+        generations = []
+        for item in json.loads(value):
+            if "message" in item:
+                message = messages_from_dict([item["message"]])[0]
+                generations.append(ChatGeneration(message=message))
+            else:
+                generations.append(Generation(text=item["text"]))
+        return generations
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list[Generation]]:
+        """Return cached generations for the prompt, or None on a miss."""
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        try:
+            return self._load(row[0])
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Dropping unreadable LLM cache entry: {e}")
+            return None
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        """Store generations and evict least-recently-used entries over budget."""
+        value = self._dump(return_val)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), value, len(value), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_used ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"LLM cache evicted {evicted} entries")
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the on-disk footprint."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Get the shared cache, or None when LLM_CACHE is disabled."""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+    return _cache
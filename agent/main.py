@@ -1,6 +1,6 @@
 import sys
 from dotenv import load_dotenv
-from agent.graph import app
+from agent.graph import get_app
 from agent.state import AgentState
 
 load_dotenv()
@@ -17,7 +17,7 @@ def run_factory(task: str) -> dict:
         "messages": [],
     }
 
-    result = app.invoke(initial_state)
+    result = get_app().invoke(initial_state)
     return result
 
 
@@ -94,7 +94,7 @@ def approval_gate_node(state: AgentState) -> dict:
     if not prd:
         return {
             "status": "failed",
-            "messages": state.get("messages", []) + ["No PRD to review"],
+            "messages": ["No PRD to review"],
         }
 
     # Format PRD for display
@@ -107,25 +107,26 @@ def approval_gate_node(state: AgentState) -> dict:
         try:
             from agent.adapters.linear_adapter import LinearAdapter
 
-            adapter = LinearAdapter()
-            # Save original ticket content as a comment before overwriting
-            original_description = issue.description
-            if original_description:
-                adapter.add_comment(
-                    issue.id, f"## Original ticket request\n\n{original_description}"
-                )
-            # Replace the ticket description with the PRD
-            adapter.update_issue_description(issue.id, prd_markdown)
-            # Move to Human: Review PRD for human approval
-            adapter.transition_issue(issue.id, "Human: Review PRD")
-            print(f"   ✅ Posted PRD to Linear issue {issue.identifier}")
-            print("   ⏸️  Moved to 'Human: Review PRD' - waiting for human approval")
+            # Comment, description and transition go out as one write
+            with LinearAdapter() as adapter, adapter.batch():
+                # Save original ticket content as a comment before overwriting
+                original_description = issue.description
+                if original_description:
+                    adapter.add_comment(
+                        issue.id,
+                        f"## Original ticket request\n\n{original_description}",
+                    )
+                # Replace the ticket description with the PRD
+                adapter.update_issue_description(issue.id, prd_markdown)
+                # Move to Human: Review PRD for human approval
+                adapter.transition_issue(issue.id, "Human: Review PRD")
+                print(f"   ✅ Posted PRD to Linear issue {issue.identifier}")
+                print("   ⏸️  Moved to 'Human: Review PRD' - waiting for human approval")
         except Exception as e:
             print(f"   ⚠️ Could not post to Linear: {e}")
 
     # End flow here - human will move issue back to "AI: Ready" when approved
     return {
         "status": "awaiting_prd_review",
-        "messages": state.get("messages", [])
-        + ["PRD posted for review - awaiting human approval"],
+        "messages": ["PRD posted for review - awaiting human approval"],
     }
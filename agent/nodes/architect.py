@@ -1,11 +1,7 @@
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from agent.state import AgentState
-
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+from agent.llm import get_llm
+from agent.state import AgentState, WorkItem
 
 ARCHITECT_PROMPT = """You are a Software Architect breaking down a feature into stacked PRs.
 
@@ -45,11 +41,13 @@ Output JSON:
 """
 
 
-def architect_node(state: AgentState) -> dict:
-    """Break down a feature into stacked work items."""
-    prompt = ARCHITECT_PROMPT.format(task_description=state["task_description"])
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
+    return ARCHITECT_PROMPT.format(task_description=state["task_description"])
 
-    response = llm.invoke(prompt)
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     content = response.content
     if isinstance(content, list):
         content = content[0] if content else ""
@@ -61,16 +59,26 @@ def architect_node(state: AgentState) -> dict:
 
     try:
         breakdown = json.loads(content)
-        work_items = breakdown.get("work_items", [])
-    except json.JSONDecodeError:
+        work_items = [WorkItem(**item) for item in breakdown.get("work_items", [])]
+    except (json.JSONDecodeError, ValueError, TypeError):
         work_items = []
 
     print(f"   🏗️ Architect: {len(work_items)} work items planned")
 
     return {
         "work_items": work_items,
-        "current_work_index": 0,
         "status": "architected" if work_items else "failed",
-        "messages": state.get("messages", [])
-        + [f"Architected {len(work_items)} work items"],
+        "messages": [f"Architected {len(work_items)} work items"],
     }
+
+
+def architect_node(state: AgentState) -> dict:
+    """Break down a feature into stacked work items."""
+    response = get_llm(cached=True).invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
+
+async def aarchitect_node(state: AgentState) -> dict:
+    """Async variant of architect_node."""
+    response = await get_llm(cached=True).ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
@@ -1,12 +1,8 @@
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agent.llm import get_llm
 from agent.state import AgentState
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
-
 CLASSIFIER_PROMPT = """You are a request classifier for a software development AI system.
 
 Analyze this task and classify it into ONE of these categories:
@@ -39,11 +35,13 @@ Respond with ONLY a JSON object:
 """
 
 
-def classifier_node(state: AgentState) -> dict:
-    """Classify the request type to determine workflow path."""
-    prompt = CLASSIFIER_PROMPT.format(task_description=state["task_description"])
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
+    return CLASSIFIER_PROMPT.format(task_description=state["task_description"])
 
-    response = llm.invoke(prompt)
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     content = response.content
     if isinstance(content, list):
         content = content[0] if content else ""
@@ -65,5 +63,17 @@ def classifier_node(state: AgentState) -> dict:
 
     return {
         "request_type": request_type,
-        "messages": state.get("messages", []) + [f"Classified as: {request_type}"],
+        "messages": [f"Classified as: {request_type}"],
     }
+
+
+def classifier_node(state: AgentState) -> dict:
+    """Classify the request type to determine workflow path."""
+    response = get_llm(cached=True).invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
+
+async def aclassifier_node(state: AgentState) -> dict:
+    """Async variant of classifier_node."""
+    response = await get_llm(cached=True).ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
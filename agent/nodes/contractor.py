@@ -1,12 +1,8 @@
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agent.llm import get_llm
 from agent.state import AgentState
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
-
 CONTRACTOR_PROMPT = """You are a Software Contract Designer.
 Your job is to take a task description and produce a Pydantic-style data contract.
 
@@ -25,8 +21,8 @@ Output raw JSON only, no markdown code blocks.
 """
 
 
-def contractor_node(state: AgentState) -> dict:
-    """Generate or refine a data contract based on the task."""
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
     feedback_list = state.get("review_feedback", [])
     feedback_str = (
         "\n".join(
@@ -37,11 +33,13 @@ def contractor_node(state: AgentState) -> dict:
         or "None - this is the first draft."
     )
 
-    prompt = CONTRACTOR_PROMPT.format(
+    return CONTRACTOR_PROMPT.format(
         task_description=state["task_description"], feedback=feedback_str
     )
 
-    response = llm.invoke(prompt)
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     content = response.content
     if isinstance(content, list):
         content = content[0] if content else ""
@@ -70,3 +68,15 @@ def contractor_node(state: AgentState) -> dict:
         "iteration_count": state.get("iteration_count", 0) + 1,
         "review_feedback": [],  # Clear for new review cycle
     }
+
+
+def contractor_node(state: AgentState) -> dict:
+    """Generate or refine a data contract based on the task."""
+    response = get_llm(cached=True).invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
+
+async def acontractor_node(state: AgentState) -> dict:
+    """Async variant of contractor_node."""
+    response = await get_llm(cached=True).ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
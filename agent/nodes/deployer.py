@@ -1,33 +1,36 @@
 from agent.state import AgentState
-from agent.tools.deploy import deploy_preview, provision_ephemeral_db
+from agent.tools.deploy import (
+    adeploy_preview,
+    aprovision_ephemeral_db,
+    deploy_preview,
+    provision_ephemeral_db,
+)
 
 
-def deployer_node(state: AgentState) -> dict:
-    """Deploy ephemeral environment for testing."""
-    branch = state.get("stack_base_branch")
-    if not branch:
-        print("   🚀 Deployer: Skipped (no branch)")
-        return {
-            "ephemeral_status": "skipped",
-            "messages": state.get("messages", []) + ["No branch to deploy"],
-        }
+def _no_branch() -> dict:
+    print("   🚀 Deployer: Skipped (no branch)")
+    return {
+        "ephemeral_status": "skipped",
+        "messages": ["No branch to deploy"],
+    }
 
-    db_success, db_result = provision_ephemeral_db(branch)
-    if not db_success:
-        print("   🚀 Deployer: DB provisioning skipped")
-        return {
-            "ephemeral_status": "db_skipped",
-            "messages": state.get("messages", [])
-            + [f"DB provisioning skipped: {db_result}"],
-        }
 
-    deploy_success, preview_url = deploy_preview(branch)
+def _db_skipped(db_result: str) -> dict:
+    print("   🚀 Deployer: DB provisioning skipped")
+    return {
+        "ephemeral_status": "db_skipped",
+        "messages": [f"DB provisioning skipped: {db_result}"],
+    }
+
+
+def _handle_deploy(db_result: str, deploy_success: bool, preview_url: str) -> dict:
+    """Turn the preview deploy into a state update."""
     if not deploy_success:
         print("   🚀 Deployer: Deploy skipped")
         return {
             "ephemeral_status": "deploy_skipped",
             "ephemeral_db_url": db_result,
-            "messages": state.get("messages", []) + [f"Deploy skipped: {preview_url}"],
+            "messages": [f"Deploy skipped: {preview_url}"],
         }
 
     print(f"   🚀 Deployer: Deployed to {preview_url}")
@@ -35,5 +38,31 @@ def deployer_node(state: AgentState) -> dict:
         "ephemeral_status": "deployed",
         "preview_url": preview_url,
         "ephemeral_db_url": db_result,
-        "messages": state.get("messages", []) + [f"Deployed to {preview_url}"],
+        "messages": [f"Deployed to {preview_url}"],
     }
+
+
+def deployer_node(state: AgentState) -> dict:
+    """Deploy ephemeral environment for testing."""
+    branch = state.get("stack_base_branch")
+    if not branch:
+        return _no_branch()
+
+    db_success, db_result = provision_ephemeral_db(branch)
+    if not db_success:
+        return _db_skipped(db_result)
+
+    return _handle_deploy(db_result, *deploy_preview(branch))
+
+
+async def adeployer_node(state: AgentState) -> dict:
+    """Async variant of deployer_node."""
+    branch = state.get("stack_base_branch")
+    if not branch:
+        return _no_branch()
+
+    db_success, db_result = await aprovision_ephemeral_db(branch)
+    if not db_success:
+        return _db_skipped(db_result)
+
+    return _handle_deploy(db_result, *await adeploy_preview(branch))
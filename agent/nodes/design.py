@@ -1,12 +1,8 @@
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agent.llm import get_llm
 from agent.state import AgentState, ReviewFeedback
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
-
 DESIGN_PROMPT = """You are a Design System Purist reviewing frontend code.
 
 Code under review:
@@ -30,13 +26,15 @@ Approve if the code follows reasonable design patterns.
 """
 
 
-def design_node(state: AgentState) -> dict:
-    """Review frontend code for design consistency."""
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
     content = state.get("current_contract") or ""
 
-    prompt = DESIGN_PROMPT.format(content=content)
-    response = llm.invoke(prompt)
+    return DESIGN_PROMPT.format(content=content)
 
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     resp_content = response.content
     if isinstance(resp_content, list):
         resp_content = resp_content[0] if resp_content else ""
@@ -64,5 +62,16 @@ def design_node(state: AgentState) -> dict:
 
     print(f"   🎨 Design: {'✅ Approved' if feedback.approved else '❌ Issues found'}")
 
-    existing = state.get("review_feedback", [])
-    return {"review_feedback": existing + [feedback]}
+    return {"review_feedback": [feedback]}
+
+
+def design_node(state: AgentState) -> dict:
+    """Review frontend code for design consistency."""
+    response = get_llm(cached=True).invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
+
+async def adesign_node(state: AgentState) -> dict:
+    """Async variant of design_node."""
+    response = await get_llm(cached=True).ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
@@ -4,96 +4,14 @@ This node orchestrates Claude Code CLI to generate actual code implementations
 based on approved contracts, with native file system access and validation.
 """
 
-import subprocess
-import json
 import logging
 from agent.state import AgentState
+from agent.tools.claude_pool import claude_pool, priority_for
+from agent.tools.worktree import workspace_for
 
 logger = logging.getLogger(__name__)
 
 
-def run_claude_code(
-    prompt: str,
-    working_dir: str,
-    allowed_tools: list[str] | None = None,
-    output_format: str = "json",
-    timeout: int = 300,
-) -> dict:
-    """Execute Claude Code CLI in headless mode.
-
-    Args:
-        prompt: The task prompt to send to Claude Code.
-        working_dir: Directory to run the command in.
-        allowed_tools: List of tools to auto-approve (Read, Edit, Write, Bash).
-        output_format: Output format - 'json', 'text', or 'stream-json'.
-        timeout: Command timeout in seconds.
-
-    Returns:
-        dict with 'result', 'error', and optionally 'metadata' keys.
-    """
-    if allowed_tools is None:
-        allowed_tools = ["Read", "Edit", "Bash"]
-
-    cmd = [
-        "claude",
-        "-p",
-        prompt,
-        "--allowedTools",
-        ",".join(allowed_tools),
-        "--output-format",
-        output_format,
-    ]
-
-    logger.info(f"Running Claude Code CLI: {' '.join(cmd[:3])}...")
-
-    try:
-        result = subprocess.run(
-            cmd, cwd=working_dir, capture_output=True, text=True, timeout=timeout
-        )
-
-        if result.returncode != 0:
-            logger.warning(f"Claude Code exited with code {result.returncode}")
-            if result.stderr:
-                logger.error(f"Claude Code stderr: {result.stderr}")
-            if result.stdout:
-                logger.error(f"Claude Code stdout: {result.stdout}")
-            return {
-                "result": None,
-                "error": result.stderr or f"Exit code: {result.returncode}",
-                "stdout": result.stdout,
-            }
-
-        if output_format == "json":
-            try:
-                parsed = json.loads(result.stdout)
-                return {
-                    "result": parsed.get("result", result.stdout),
-                    "error": None,
-                    "metadata": parsed.get("metadata", {}),
-                }
-            except json.JSONDecodeError:
-                # Claude Code may return plain text even with --output-format json
-                return {"result": result.stdout, "error": None}
-
-        return {
-            "result": result.stdout,
-            "error": result.stderr if result.stderr else None,
-        }
-
-    except subprocess.TimeoutExpired:
-        logger.error(f"Claude Code timed out after {timeout}s")
-        return {"result": None, "error": f"Command timed out after {timeout} seconds"}
-    except FileNotFoundError:
-        logger.error("Claude Code CLI not found - ensure it's installed")
-        return {
-            "result": None,
-            "error": "Claude Code CLI not found. Install with: npm install -g @anthropic-ai/claude-code",
-        }
-    except Exception as e:
-        logger.error(f"Claude Code error: {e}")
-        return {"result": None, "error": str(e)}
-
-
 BACKEND_PROMPT = """You are implementing a backend feature for a FastAPI/Python application.
 
 ## Contract
@@ -210,8 +128,14 @@ def implementation_engineer_node(state: AgentState) -> dict:
         else:
             context = f"Title: {getattr(prd, 'title', '')}\nProblem: {getattr(prd, 'problem_statement', '')}"
 
-    # Get workspace path - default to current directory
-    working_dir = state.get("workspace_path", ".")
+    # Isolated worktree per work item (or the explicit workspace_path)
+    ok, working_dir = workspace_for(state, mode)
+    if not ok:
+        return {
+            "claude_code_result": {"result": None, "error": working_dir},
+            "implementation_engineer_mode": mode,
+            "status": "implementation_ready",
+        }
 
     # Select prompt based on mode
     if mode == "BACKEND":
@@ -226,10 +150,11 @@ def implementation_engineer_node(state: AgentState) -> dict:
     logger.info(f"Implementation Engineer node running in {mode} mode")
 
     # Run Claude Code CLI
-    result = run_claude_code(
+    result = claude_pool.run(
         prompt=prompt,
         working_dir=working_dir,
         allowed_tools=["Read", "Edit", "Write", "Bash"],
+        priority=priority_for(state.get("current_issue")),
     )
 
     # Return state updates
@@ -277,7 +202,14 @@ def implementation_engineer_correction_node(state: AgentState) -> dict:
     else:
         task = state.get("task_description", "")
 
-    working_dir = state.get("workspace_path", ".")
+    mode = state.get("implementation_engineer_mode", "BACKEND")
+    ok, working_dir = workspace_for(state, mode)
+    if not ok:
+        return {
+            "claude_code_result": {"result": None, "error": working_dir},
+            "correction_count": state.get("correction_count", 0) + 1,
+            "status": "implementation_ready",
+        }
 
     # Format errors for prompt
     if isinstance(errors, list):
@@ -289,8 +221,11 @@ def implementation_engineer_correction_node(state: AgentState) -> dict:
 
     logger.info("Implementation Engineer correction node running")
 
-    result = run_claude_code(
-        prompt=prompt, working_dir=working_dir, allowed_tools=["Read", "Edit", "Bash"]
+    result = claude_pool.run(
+        prompt=prompt,
+        working_dir=working_dir,
+        allowed_tools=["Read", "Edit", "Bash"],
+        priority=priority_for(state.get("current_issue")),
     )
 
     correction_count = state.get("correction_count", 0) + 1
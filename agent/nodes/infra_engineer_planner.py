@@ -1,8 +1,11 @@
 """Infra Engineer Planner - creates technical specs for infrastructure changes using Claude Code."""
 
+import asyncio
 from agent.state import AgentState
 from agent.config.context import get_context_for_prompt
-from agent.tools.claude_code import run_claude_code, extract_json_from_response
+from agent.tools.claude_code import extract_json_from_response
+from agent.tools.claude_pool import claude_pool, priority_for
+from agent.tools.worktree import workspace_for
 
 
 INFRA_ENGINEER_PLANNER_PROMPT = """You are a Senior Infrastructure Architect creating a technical specification.
@@ -53,62 +56,86 @@ Output your response as JSON (no markdown code blocks):
 """
 
 
-def infra_engineer_planner_node(state: AgentState) -> dict:
-    """Generate a technical spec for infrastructure changes using Claude Code."""
-    # Fetch fresh issue content from Linear - PRD is in the description after approval
+def _print_progress(line: str):
+    print(f"      🔧 {line}")
+
+
+def _fetch_issue(state: AgentState) -> tuple:
+    """Fetch the issue and its comments fresh from Linear.
+
+    Returns:
+        (issue or None, comment bodies), with comments None when Linear
+        could not be reached
+    """
     issue = state.get("current_issue")
-    prd_content = ""
+    if not issue:
+        return None, []
 
-    if issue:
-        from agent.adapters.linear_adapter import LinearAdapter
+    from agent.adapters.linear_adapter import LinearAdapter
 
-        try:
-            adapter = LinearAdapter()
+    try:
+        with LinearAdapter() as adapter:
             fresh_issue = adapter.get_issue_by_id(issue.id)
-            if fresh_issue and fresh_issue.description:
-                prd_content = fresh_issue.description
-                print(
-                    f"   📄 Fetched fresh PRD from Linear issue {fresh_issue.identifier}"
-                )
-
-            # Fetch comments
-            comments = adapter.get_issue_comments(issue.id)
-            if comments:
-                comments_text = "\n\n".join(comments)
-                print(f"   💬 Fetched {len(comments)} comments")
-            else:
-                comments_text = "No comments available."
-        except Exception as e:
-            print(f"   ⚠️ Could not fetch fresh issue or comments: {e}")
-            comments_text = "Could not fetch comments."
+            return fresh_issue, adapter.get_issue_comments(issue.id)
+    except Exception as e:
+        print(f"   ⚠️ Could not fetch fresh issue or comments: {e}")
+        return None, None
+
+
+async def _afetch_issue(state: AgentState) -> tuple:
+    """Async variant of _fetch_issue; both lookups are sent concurrently."""
+    issue = state.get("current_issue")
+    if not issue:
+        return None, []
+
+    from agent.adapters.linear_adapter import LinearAdapter
+
+    try:
+        async with LinearAdapter() as adapter:
+            return await asyncio.gather(
+                adapter.aget_issue_by_id(issue.id),
+                adapter.aget_issue_comments(issue.id),
+            )
+    except Exception as e:
+        print(f"   ⚠️ Could not fetch fresh issue or comments: {e}")
+        return None, None
+
+
+def _build_prompt(state: AgentState, fresh_issue, comments) -> str:
+    """Format the prompt from the issue and comments fetched from Linear."""
+    # PRD is in the issue description after approval
+    prd_content = ""
+    if fresh_issue and fresh_issue.description:
+        prd_content = fresh_issue.description
+        print(f"   📄 Fetched fresh PRD from Linear issue {fresh_issue.identifier}")
+
+    if comments is None:
+        comments_text = "Could not fetch comments."
+    elif comments:
+        comments_text = "\n\n".join(comments)
+        print(f"   💬 Fetched {len(comments)} comments")
+    else:
+        comments_text = "No comments available."
 
     # Use fresh content, or fall back to task_description
     if not prd_content:
         prd_content = state.get("task_description", "No PRD available")
 
-    prompt = INFRA_ENGINEER_PLANNER_PROMPT.format(
+    return INFRA_ENGINEER_PLANNER_PROMPT.format(
         project_context=get_context_for_prompt(),
         prd_content=prd_content,
         comments=comments_text,
     )
 
-    # Run Claude Code CLI
-    print("   🤖 Running Claude Code for infrastructure planning...")
-    result = run_claude_code(
-        prompt=prompt,
-        working_dir=state.get("workspace_path", "."),
-        allowed_tools=["Read"],  # Read-only for planning
-        output_format="text",
-        timeout=120,
-    )
 
+def _handle_result(state: AgentState, result: dict) -> dict:
+    """Turn the CLI result into a state update."""
     if result.get("error"):
         print(f"   ⚠️ Claude Code error: {result['error']}")
         return {
             "technical_spec": {"error": result["error"]},
             "status": "spec_failed",
-            "messages": state.get("messages", [])
-            + [f"Infra planner failed: {result['error']}"],
+            "messages": [f"Infra planner failed: {result['error']}"],
         }
 
     # Parse the response
@@ -128,6 +155,51 @@ def infra_engineer_planner_node(state: AgentState) -> dict:
     return {
         "technical_spec": tech_spec,
         "status": "spec_ready",
-        "messages": state.get("messages", [])
-        + ["Infra Engineer Planner created technical spec"],
+        "messages": ["Infra Engineer Planner created technical spec"],
+    }
+
+
+def _prepare_run(state: AgentState, prompt: str) -> tuple[dict | None, dict | None]:
+    """Build the Claude Code request for this issue.
+
+    Returns:
+        (keyword arguments for claude_pool.run/arun, None), or (None, failed
+        state update) when no workspace could be checked out.
+    """
+    # Read-only checkout of the base branch, isolated from other runs
+    ok, workspace = workspace_for(state, read_only=True)
+    if not ok:
+        return None, _handle_result(state, {"result": None, "error": workspace})
+
+    print("   🤖 Running Claude Code for infrastructure planning...")
+    request = {
+        "prompt": prompt,
+        "working_dir": workspace,
+        "allowed_tools": ["Read"],  # Read-only for planning
+        "timeout": 120,
+        "priority": priority_for(state.get("current_issue")),
+        "on_progress": _print_progress,
     }
+    return request, None
+
+
+def infra_engineer_planner_node(state: AgentState) -> dict:
+    """Generate a technical spec for infrastructure changes using Claude Code."""
+    request, failed = _prepare_run(state, _build_prompt(state, *_fetch_issue(state)))
+    if failed:
+        return failed
+
+    result = claude_pool.run(**request)
+    return {**_handle_result(state, result), "workspace_path": request["working_dir"]}
+
+
+async def ainfra_engineer_planner_node(state: AgentState) -> dict:
+    """Async variant of infra_engineer_planner_node."""
+    prompt = _build_prompt(state, *await _afetch_issue(state))
+    # git calls are synchronous - keep them off the event loop
+    request, failed = await asyncio.to_thread(_prepare_run, state, prompt)
+    if failed:
+        return failed
+
+    result = await claude_pool.arun(**request)
+    return {**_handle_result(state, result), "workspace_path": request["working_dir"]}
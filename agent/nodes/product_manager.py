@@ -2,13 +2,10 @@
 
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agent.llm import get_llm
 from agent.state import AgentState
 from agent.config.context import get_context_for_prompt
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.3)
 
 PRODUCT_MANAGER_PROMPT = """You are a Senior Product Manager creating a Product Requirements Document.
 
@@ -66,17 +63,19 @@ Output JSON:
 """
 
 
-def product_manager_node(state: AgentState) -> dict:
-    """Generate a structured PRD from user input."""
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
     feedback = state.get("prd_feedback") or "None - first draft"
 
-    prompt = PRODUCT_MANAGER_PROMPT.format(
+    return PRODUCT_MANAGER_PROMPT.format(
         project_context=get_context_for_prompt(),
         user_request=state["task_description"],
         feedback=feedback,
     )
 
-    response = llm.invoke(prompt)
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     content = response.content
     if isinstance(content, list):
         content = content[0] if content else ""
@@ -104,5 +103,17 @@ def product_manager_node(state: AgentState) -> dict:
     return {
         "prd": prd,
         "status": "prd_ready",
-        "messages": state.get("messages", []) + ["Product Manager created PRD"],
+        "messages": ["Product Manager created PRD"],
     }
+
+
+def product_manager_node(state: AgentState) -> dict:
+    """Generate a structured PRD from user input."""
+    response = get_llm(temperature=0.3).invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
+
+async def aproduct_manager_node(state: AgentState) -> dict:
+    """Async variant of product_manager_node."""
+    response = await get_llm(temperature=0.3).ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
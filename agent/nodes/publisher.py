@@ -1,28 +1,50 @@
 import os
 import json
 from agent.state import AgentState
-from agent.tools.git import create_branch, commit_changes, push_branch, create_pr
+from agent.tools.git import commit_changes, push_branch, create_pr
+from agent.tools.worktree import issue_branch, workspace_for
 from agent.adapters.linear_adapter import LinearAdapter
+from agent.nodes.stack_manager import with_work_item
+from agent.pr_index import get_pr_index
+
+
+def _write_artifact(root: str, path: str, content: str):
+    """Write an artifact at path relative to the checkout root."""
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
 
 
 def publisher_node(state: AgentState) -> dict:
-    """Handle git operations and PR creation."""
+    """Handle git operations and PR creation.
+
+    Every issue is published from its own git worktree: a stacked work item
+    from the one start_work_item_node set up, with a PR against the branch
+    it stacks on, and any other issue from a worktree on ai/<identifier>.
+    """
     issue = state.get("current_issue")
     if not issue:
-        return {"messages": state.get("messages", []) + ["No issue to publish"]}
+        return {"messages": ["No issue to publish"]}
 
     request_type = state.get("request_type", "general")
+    work_item = state.get("current_work_item")
 
-    # Create branch name from issue identifier
-    branch_name = f"ai/{issue.identifier.lower()}"
+    if work_item is not None:
+        branch_name = work_item.branch_name
+        pr_base = state.get("stack_base_branch") or "main"
+        root = state.get("workspace_path") or "."
+    else:
+        branch_name = issue_branch(issue.identifier)
+        pr_base = "main"
 
-    # Create and checkout branch
-    success, branch_msg = create_branch(branch_name)
-    if not success:
-        return {
-            "status": "failed",
-            "messages": state.get("messages", []) + [branch_msg],
-        }
+        # The issue's own worktree on its branch, never the shared checkout
+        success, root = workspace_for(state)
+        if not success:
+            return {
+                "status": "failed",
+                "messages": [f"Failed to create branch {branch_name}: {root}"],
+            }
 
     # Handle based on request type
     artifact = state.get("current_contract")
@@ -30,7 +52,6 @@ def publisher_node(state: AgentState) -> dict:
     if request_type == "requires_contract" and artifact:
         # Contract request - write to contracts/
         contracts_dir = "contracts"
-        os.makedirs(contracts_dir, exist_ok=True)
 
         try:
             artifact_data = json.loads(artifact)
@@ -39,11 +60,10 @@ def publisher_node(state: AgentState) -> dict:
             artifact_name = issue.identifier.lower()
 
         artifact_file = os.path.join(contracts_dir, f"{artifact_name}.json")
-        with open(artifact_file, "w") as f:
-            f.write(artifact)
+        _write_artifact(root, artifact_file, artifact)
 
         commit_message = f"feat({issue.identifier}): Add {artifact_name} data contract\n\nGenerated by AI Factory"
-        commit_changes(commit_message, [artifact_file])
+        commit_changes(commit_message, [artifact_file], cwd=root)
 
     elif request_type == "infrastructure" and artifact:
         # Infrastructure request - write to infra/
@@ -58,7 +78,6 @@ def publisher_node(state: AgentState) -> dict:
             artifact_content = artifact
 
         infra_dir = f"infra/{artifact_name}"
-        os.makedirs(infra_dir, exist_ok=True)
 
         extensions = {
             "dockerfile": "",
@@ -70,13 +89,12 @@ def publisher_node(state: AgentState) -> dict:
         filename = f"{artifact_name}{ext}" if ext else "Dockerfile"
 
         artifact_file = os.path.join(infra_dir, filename)
-        with open(artifact_file, "w") as f:
-            f.write(artifact_content)
+        _write_artifact(root, artifact_file, artifact_content)
 
         commit_message = (
             f"chore({issue.identifier}): Add {artifact_name}\n\nGenerated by AI Factory"
         )
-        commit_changes(commit_message, [artifact_file])
+        commit_changes(commit_message, [artifact_file], cwd=root)
 
     elif artifact:
         # General request - write to src/
@@ -91,45 +109,59 @@ def publisher_node(state: AgentState) -> dict:
             artifact_content = artifact
 
         src_dir = f"src/{artifact_name}"
-        os.makedirs(src_dir, exist_ok=True)
 
         lang_extensions = {"python": ".py", "typescript": ".ts", "javascript": ".js"}
         ext = lang_extensions.get(language, ".txt")
 
         artifact_file = os.path.join(src_dir, f"{artifact_name}{ext}")
-        with open(artifact_file, "w") as f:
-            f.write(artifact_content)
+        _write_artifact(root, artifact_file, artifact_content)
 
         commit_message = (
             f"feat({issue.identifier}): Add {artifact_name}\n\nGenerated by AI Factory"
         )
-        commit_changes(commit_message, [artifact_file])
+        commit_changes(commit_message, [artifact_file], cwd=root)
     else:
-        return {
-            "status": "failed",
-            "messages": state.get("messages", []) + ["No artifact generated to commit"],
-        }
+        return with_work_item(
+            state,
+            {"status": "failed", "messages": ["No artifact generated to commit"]},
+            status="failed",
+        )
+
+    title = f"[{issue.identifier}] {issue.title}"
+    if work_item is not None:
+        title = f"[{issue.identifier}] {work_item.type}: {work_item.title}"
 
     # Push and create PR
-    push_branch(branch_name)
+    push_branch(branch_name, cwd=root)
     success, pr_result = create_pr(
-        title=f"[{issue.identifier}] {issue.title}",
+        title=title,
         body=f"## Summary\n\n{issue.description or 'AI-generated implementation'}\n\n---\n*Generated by Software Factory*",
+        base=pr_base,
+        cwd=root,
     )
 
     if success:
-        adapter = LinearAdapter()
-        adapter.transition_issue(issue.id, "Human: Review PR")
-        adapter.add_comment(issue.id, f"✅ PR created: {pr_result}")
-
-        return {
-            "status": "published",
-            "pr_url": pr_result,
-            "stack_base_branch": branch_name,
-            "messages": state.get("messages", []) + [f"PR created: {pr_result}"],
-        }
+        get_pr_index().record(issue, pr_result, branch_name)
+
+        with LinearAdapter() as adapter, adapter.batch():
+            adapter.transition_issue(issue.id, "Human: Review PR")
+            adapter.add_comment(issue.id, f"✅ PR created: {pr_result}")
+
+        return with_work_item(
+            state,
+            {
+                "status": "published",
+                "pr_url": pr_result,
+                "stack_base_branch": branch_name,
+                "workspace_path": root,
+                "messages": [f"PR created: {pr_result}"],
+            },
+            status="completed",
+            pr_url=pr_result,
+        )
 
-    return {
-        "status": "failed",
-        "messages": state.get("messages", []) + [f"Failed to create PR: {pr_result}"],
-    }
+    return with_work_item(
+        state,
+        {"status": "failed", "messages": [f"Failed to create PR: {pr_result}"]},
+        status="failed",
+    )
@@ -1,6 +1,7 @@
 import subprocess
 from agent.state import AgentState
 from agent.adapters.linear_adapter import LinearAdapter
+from agent.pr_index import get_pr_index
 
 
 def reverter_node(state: AgentState) -> dict:
@@ -13,24 +14,31 @@ def reverter_node(state: AgentState) -> dict:
         return {"revert_status": "skipped"}
 
     try:
-        result = subprocess.run(
-            [
-                "gh",
-                "pr",
-                "view",
-                pr_url,
-                "--json",
-                "mergeCommit",
-                "-q",
-                ".mergeCommit.oid",
-            ],
-            capture_output=True,
-            text=True,
-        )
+        index = get_pr_index()
+        record = index.by_url(pr_url)
+        merge_sha = record.merge_sha if record else None
 
-        if result.returncode == 0 and result.stdout.strip():
-            merge_sha = result.stdout.strip()
+        if not merge_sha:
+            # Not seen merged by the poller yet - ask GitHub
+            result = subprocess.run(
+                [
+                    "gh",
+                    "pr",
+                    "view",
+                    pr_url,
+                    "--json",
+                    "mergeCommit",
+                    "-q",
+                    ".mergeCommit.oid",
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                merge_sha = result.stdout.strip()
+                index.mark_merged(pr_url, merge_sha)
 
+        if merge_sha:
             subprocess.run(["git", "revert", merge_sha, "--no-edit"])
             subprocess.run(["git", "push", "origin", "main"])
 
@@ -38,32 +46,30 @@ def reverter_node(state: AgentState) -> dict:
 
             if issue:
                 try:
-                    adapter = LinearAdapter()
-                    adapter.add_comment(
-                        issue.id,
-                        f"⚠️ **Auto-Reverted**\n\nError spike detected after deployment.\nRevert commit: {merge_sha}",
-                    )
-                    adapter.transition_issue(issue.id, "AI: Failed")
+                    with LinearAdapter() as adapter, adapter.batch():
+                        adapter.add_comment(
+                            issue.id,
+                            f"⚠️ **Auto-Reverted**\n\nError spike detected after deployment.\nRevert commit: {merge_sha}",
+                        )
+                        adapter.transition_issue(issue.id, "AI: Failed")
                 except Exception:
                     pass
 
             return {
                 "revert_status": "completed",
                 "reverted_commit": merge_sha,
-                "messages": state.get("messages", [])
-                + [f"Reverted commit {merge_sha}"],
+                "messages": [f"Reverted commit {merge_sha}"],
             }
         else:
             print("   ⏪ Reverter: PR not merged yet")
             return {
                 "revert_status": "skipped",
-                "messages": state.get("messages", [])
-                + ["PR not merged, nothing to revert"],
+                "messages": ["PR not merged, nothing to revert"],
             }
 
     except Exception as e:
         print(f"   ⏪ Reverter: Failed - {e}")
         return {
             "revert_status": "failed",
-            "messages": state.get("messages", []) + [f"Revert failed: {e}"],
+            "messages": [f"Revert failed: {e}"],
         }
@@ -1,12 +1,8 @@
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agent.llm import get_llm
 from agent.state import AgentState, ReviewFeedback
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
-
 SECURITY_PROMPT = """You are a Security Engineer reviewing a data contract for a healthcare application.
 
 Contract under review:
@@ -30,11 +26,13 @@ If fields mention validation, sanitization, or proper types, that's sufficient.
 """
 
 
-def security_node(state: AgentState) -> dict:
-    """Review the contract for security issues."""
-    prompt = SECURITY_PROMPT.format(contract=state.get("current_contract", "{}"))
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
+    return SECURITY_PROMPT.format(contract=state.get("current_contract", "{}"))
 
-    response = llm.invoke(prompt)
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     content = response.content
     if isinstance(content, list):
         content = content[0] if content else ""
@@ -62,6 +60,16 @@ def security_node(state: AgentState) -> dict:
             suggestions=["Retry the review"],
         )
 
-    existing_feedback = state.get("review_feedback", [])
+    return {"review_feedback": [feedback]}
+
+
+def security_node(state: AgentState) -> dict:
+    """Review the contract for security issues."""
+    response = get_llm(cached=True).invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
 
-    return {"review_feedback": existing_feedback + [feedback]}
+async def asecurity_node(state: AgentState) -> dict:
+    """Async variant of security_node."""
+    response = await get_llm(cached=True).ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
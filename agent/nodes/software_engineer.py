@@ -1,11 +1,8 @@
 import json
 import re
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agent.llm import get_llm
 from agent.state import AgentState
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
 
 SOFTWARE_ENGINEER_PROMPT = """You are a Software Engineer.
 Your job is to take a feature request and produce code implementation artifacts.
@@ -27,8 +24,8 @@ Output raw JSON only, no markdown code blocks.
 """
 
 
-def software_engineer_node(state: AgentState) -> dict:
-    """Generate code implementations based on the task."""
+def _build_prompt(state: AgentState) -> str:
+    """Format the prompt for this node from state."""
     feedback_list = state.get("review_feedback", [])
     feedback_str = (
         "\n".join(
@@ -39,11 +36,13 @@ def software_engineer_node(state: AgentState) -> dict:
         or "None - this is the first draft."
     )
 
-    prompt = SOFTWARE_ENGINEER_PROMPT.format(
+    return SOFTWARE_ENGINEER_PROMPT.format(
         task_description=state["task_description"], feedback=feedback_str
     )
 
-    response = llm.invoke(prompt)
+
+def _handle_response(state: AgentState, response) -> dict:
+    """Parse the LLM response into a state update."""
     content = response.content
     if isinstance(content, list):
         content = content[0] if content else ""
@@ -72,3 +71,15 @@ def software_engineer_node(state: AgentState) -> dict:
         "iteration_count": state.get("iteration_count", 0) + 1,
         "review_feedback": [],
     }
+
+
+def software_engineer_node(state: AgentState) -> dict:
+    """Generate code implementations based on the task."""
+    response = get_llm().invoke(_build_prompt(state))
+    return _handle_response(state, response)
+
+
+async def asoftware_engineer_node(state: AgentState) -> dict:
+    """Async variant of software_engineer_node."""
+    response = await get_llm().ainvoke(_build_prompt(state))
+    return _handle_response(state, response)
@@ -1,62 +1,150 @@
-from agent.state import AgentState
-from agent.tools.git import create_branch
+from agent.state import AgentState, WorkItem
+from agent.tools.worktree import issue_branch, worktree_key, worktrees
 
 
-def stack_manager_node(state: AgentState) -> dict:
-    """Manage the stacked PR workflow."""
-    work_items = state.get("work_items", [])
-    current_index = state.get("current_work_index", 0)
+def with_work_item(state: AgentState, update: dict, **item_update) -> dict:
+    """Report the current stacked work item's outcome along with update."""
+    item = state.get("current_work_item")
+    if item is None:
+        return update
+    return {**update, "work_items": [item.model_copy(update=item_update)]}
+
+
+def ready_work_items(work_items: list[WorkItem]) -> list[WorkItem]:
+    """Pending items whose dependency (if any) has completed."""
+    completed = {item.type for item in work_items if item.status == "completed"}
+    return [
+        item
+        for item in work_items
+        if item.status == "pending"
+        and (item.depends_on is None or item.depends_on in completed)
+    ]
+
+
+def _dependency_branch(work_items: list[WorkItem], item: WorkItem) -> str:
+    """Branch a work item stacks on - its dependency's branch, or main."""
+    for other in work_items:
+        if other.type == item.depends_on and other.branch_name:
+            return other.branch_name
+    return "main"
+
+
+def work_item_input(state: AgentState, item: WorkItem) -> dict:
+    """Initial state for one work item's run (see graph.build_work_item_graph).
+
+    Each item gets its own review loop, so only issue-level context is
+    carried over from the parent run.
+    """
+    return {
+        "task_description": state["task_description"],
+        "current_issue": state.get("current_issue"),
+        "request_type": state.get("request_type"),
+        "workflow_phase": state.get("workflow_phase"),
+        "work_items": [item],
+        "current_work_item": item,
+        "stack_base_branch": _dependency_branch(state["work_items"], item),
+        "current_contract": None,
+        "review_feedback": [],
+        "iteration_count": 0,
+        "status": "drafting",
+        "messages": [],
+    }
 
-    if current_index >= len(work_items):
-        return {"status": "stack_complete"}
 
-    current_item = work_items[current_index]
+def stack_manager_node(state: AgentState) -> dict:
+    """Schedule the stacked PR workflow.
+
+    Work items form a DAG through depends_on. Every item whose dependency
+    has completed is started at once (see graph.route_from_stack_manager),
+    so CONTRACT runs first and BACKEND and FRONTEND then run side by side.
+    Once every item has completed, the last published PR becomes the run's
+    pr_url for the deployer, test agent and reverter.
+    """
+    work_items = state.get("work_items") or []
     issue = state.get("current_issue")
 
     if not issue:
         return {
             "status": "failed",
-            "messages": state.get("messages", []) + ["No issue for stack"],
+            "messages": ["No issue for stack"],
         }
 
-    item_type = (
-        current_item.get("type", "CONTRACT")
-        if isinstance(current_item, dict)
-        else current_item.type
-    )
+    if not work_items:
+        return {
+            "status": "failed",
+            "messages": ["No work items to stack"],
+        }
+
+    if all(item.status == "completed" for item in work_items):
+        print("   📚 Stack Manager: All work items completed")
+        published = [item.pr_url for item in work_items if item.pr_url]
+        return {
+            "status": "stack_complete",
+            "stack_base_branch": work_items[-1].branch_name,
+            "pr_url": published[-1] if published else None,
+            "messages": [f"Completed {len(work_items)} work items"],
+        }
+
+    ready = ready_work_items(work_items)
+    if not ready:
+        unfinished = [
+            f"{item.type} ({item.status})"
+            for item in work_items
+            if item.status != "completed"
+        ]
+        print(f"   📚 Stack Manager: Blocked on {', '.join(unfinished)}")
+        return {
+            "status": "failed",
+            "messages": [f"Stack blocked: {', '.join(unfinished)}"],
+        }
+
+    types = ", ".join(item.type for item in ready)
+    print(f"   📚 Stack Manager: Starting {types}")
+    return {"messages": [f"Started {types}"]}
 
-    if item_type == "CONTRACT":
-        base_branch = "main"
-        stack_base = f"ai/{issue.identifier.lower()}/contract"
-    else:
-        stack_base = state.get("stack_base_branch", "main")
-        base_branch = stack_base
 
-    branch_name = f"ai/{issue.identifier.lower()}/{item_type.lower()}"
-    success, msg = create_branch(branch_name, base_branch)
+def start_work_item_node(state: AgentState) -> dict:
+    """Put a work item on its own branch, in its own worktree."""
+    item = state["current_work_item"]
+    issue = state["current_issue"]
+
+    branch_name = issue_branch(issue.identifier, item.type)
+    success, path = worktrees.acquire(
+        worktree_key(issue.identifier, item.type),
+        branch_name,
+        base=state.get("stack_base_branch") or "main",
+    )
 
     if not success:
+        failed = item.model_copy(update={"status": "failed"})
         return {
+            "work_items": [failed],
+            "current_work_item": failed,
             "status": "failed",
-            "messages": state.get("messages", []) + [f"Failed to create branch: {msg}"],
+            "messages": [f"Failed to create branch for {item.type}: {path}"],
         }
 
-    if isinstance(current_item, dict):
-        work_items[current_index]["branch_name"] = branch_name
-        work_items[current_index]["status"] = "in_progress"
-    else:
-        work_items[current_index].branch_name = branch_name
-        work_items[current_index].status = "in_progress"
-
-    print(f"   📚 Stack Manager: Working on {item_type} → {branch_name}")
+    started = item.model_copy(
+        update={"branch_name": branch_name, "status": "in_progress"}
+    )
+    print(f"   📚 Stack Manager: Working on {item.type} → {branch_name}")
 
     return {
-        "work_items": work_items,
-        "current_work_item": current_item,
-        "stack_base_branch": stack_base
-        if item_type == "CONTRACT"
-        else state.get("stack_base_branch"),
-        "status": f"working_{item_type.lower()}",
-        "messages": state.get("messages", [])
-        + [f"Started {item_type} on {branch_name}"],
+        "work_items": [started],
+        "current_work_item": started,
+        "workspace_path": path,
+        "status": f"working_{item.type.lower()}",
+        "messages": [f"Started {item.type} on {branch_name}"],
     }
+
+
+def fail_work_item_node(state: AgentState) -> dict:
+    """Mark a work item failed when its review loop ends without publishing.
+
+    Without this the item would stay in_progress, and the stack manager
+    would report it as still running instead of failed.
+    """
+    item = state.get("current_work_item")
+    if item is not None:
+        print(f"   📚 Stack Manager: {item.type} failed review")
+    return with_work_item(state, {"status": "failed"}, status="failed")
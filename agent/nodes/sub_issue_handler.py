@@ -118,8 +118,7 @@ def sub_issue_handler_node(state: AgentState) -> dict:
     if not tech_spec or not issue:
         return {
             "status": "failed",
-            "messages": state.get("messages", [])
-            + ["No technical spec or issue to create sub-issue from"],
+            "messages": ["No technical spec or issue to create sub-issue from"],
         }
 
     # Format the spec for the sub-issue description
@@ -132,39 +131,39 @@ def sub_issue_handler_node(state: AgentState) -> dict:
     sub_issue_title = f"[Tech Spec] {spec_title}"
 
     # Create the sub-issue
-    adapter = LinearAdapter()
     try:
-        sub_issue = adapter.create_sub_issue(
-            parent_id=issue.id,
-            team_key=TEAM_KEY,
-            title=sub_issue_title,
-            description=spec_markdown,
-            state_name="Human: Review ERD",
-        )
-
-        if sub_issue:
-            print(f"   📋 Created sub-issue: {sub_issue.identifier}")
-            print(f"      Title: {sub_issue_title}")
-            print("      State: Human: Review ERD")
-
-            # Transition parent issue to In Progress (waiting for sub-issues to complete)
-            adapter.transition_issue(issue.id, "AI: In Progress")
-
-            return {
-                "status": "awaiting_technical_review",
-                "messages": state.get("messages", [])
-                + [f"Created sub-issue {sub_issue.identifier} for technical review"],
-            }
-        else:
-            return {
-                "status": "failed",
-                "messages": state.get("messages", []) + ["Failed to create sub-issue"],
-            }
+        with LinearAdapter() as adapter:
+            sub_issue = adapter.create_sub_issue(
+                parent_id=issue.id,
+                team_key=TEAM_KEY,
+                title=sub_issue_title,
+                description=spec_markdown,
+                state_name="Human: Review ERD",
+            )
+
+            if sub_issue:
+                print(f"   📋 Created sub-issue: {sub_issue.identifier}")
+                print(f"      Title: {sub_issue_title}")
+                print("      State: Human: Review ERD")
+
+                # Transition parent issue to In Progress (waiting for sub-issues to complete)
+                adapter.transition_issue(issue.id, "AI: In Progress")
+
+                return {
+                    "status": "awaiting_technical_review",
+                    "messages": [
+                        f"Created sub-issue {sub_issue.identifier} for technical review"
+                    ],
+                }
+            else:
+                return {
+                    "status": "failed",
+                    "messages": ["Failed to create sub-issue"],
+                }
 
     except Exception as e:
         print(f"   ⚠️ Error creating sub-issue: {e}")
         return {
             "status": "failed",
-            "messages": state.get("messages", [])
-            + [f"Error creating sub-issue: {str(e)}"],
+            "messages": [f"Error creating sub-issue: {str(e)}"],
         }
@@ -15,11 +15,11 @@ def supervisor_node(state: AgentState) -> dict:
         return {"status": "approved"}
 
     if iteration >= MAX_ITERATIONS:
-        messages = state.get("messages", [])
         return {
             "status": "failed",
-            "messages": messages
-            + [f"Failed to reach approval after {MAX_ITERATIONS} iterations."],
+            "messages": [
+                f"Failed to reach approval after {MAX_ITERATIONS} iterations."
+            ],
         }
 
     # Need another iteration
@@ -5,60 +5,92 @@ from agent.state import AgentState
 SENTRY_API = "https://sentry.io/api/0"
 
 
-def telemetry_node(state: AgentState) -> dict:
-    """Monitor production for error spikes after deployment."""
+ERROR_THRESHOLD = 100
+
+
+def _sentry_request() -> dict | None:
+    """Build the Sentry stats request, or None if Sentry isn't configured."""
     sentry_token = os.getenv("SENTRY_AUTH_TOKEN")
     sentry_org = os.getenv("SENTRY_ORG")
     sentry_project = os.getenv("SENTRY_PROJECT")
 
     if not all([sentry_token, sentry_org, sentry_project]):
-        print("   📊 Telemetry: Skipped (Sentry not configured)")
+        return None
+
+    return {
+        "url": f"{SENTRY_API}/projects/{sentry_org}/{sentry_project}/stats/",
+        "headers": {"Authorization": f"Bearer {sentry_token}"},
+        "params": {"stat": "received", "resolution": "1m", "since": "-5m"},
+    }
+
+
+def _not_configured(state: AgentState) -> dict:
+    print("   📊 Telemetry: Skipped (Sentry not configured)")
+    return {
+        "telemetry_status": "skipped",
+        "messages": ["Sentry not configured"],
+    }
+
+
+def _handle_response(state: AgentState, response: httpx.Response) -> dict:
+    """Turn Sentry stats into a telemetry status."""
+    if response.status_code != 200:
+        print("   📊 Telemetry: Error fetching stats")
         return {
-            "telemetry_status": "skipped",
-            "messages": state.get("messages", []) + ["Sentry not configured"],
+            "telemetry_status": "error",
+            "messages": ["Failed to fetch Sentry stats"],
         }
 
-    try:
-        response = httpx.get(
-            f"{SENTRY_API}/projects/{sentry_org}/{sentry_project}/stats/",
-            headers={"Authorization": f"Bearer {sentry_token}"},
-            params={"stat": "received", "resolution": "1m", "since": "-5m"},
-        )
-
-        if response.status_code != 200:
-            print("   📊 Telemetry: Error fetching stats")
-            return {
-                "telemetry_status": "error",
-                "messages": state.get("messages", [])
-                + ["Failed to fetch Sentry stats"],
-            }
-
-        stats = response.json()
-        recent_errors = sum(point[1] for point in stats[-5:]) if stats else 0
-
-        ERROR_THRESHOLD = 100
-
-        if recent_errors > ERROR_THRESHOLD:
-            print(f"   📊 Telemetry: ⚠️ Error spike! {recent_errors} errors")
-            return {
-                "telemetry_status": "error_spike",
-                "error_count": recent_errors,
-                "action": "revert",
-                "messages": state.get("messages", [])
-                + [f"Error spike: {recent_errors} errors in 5min"],
-            }
-
-        print(f"   📊 Telemetry: ✅ Healthy ({recent_errors} errors)")
+    stats = response.json()
+    recent_errors = sum(point[1] for point in stats[-5:]) if stats else 0
+
+    if recent_errors > ERROR_THRESHOLD:
+        print(f"   📊 Telemetry: ⚠️ Error spike! {recent_errors} errors")
         return {
-            "telemetry_status": "healthy",
+            "telemetry_status": "error_spike",
             "error_count": recent_errors,
-            "messages": state.get("messages", [])
-            + [f"Production healthy: {recent_errors} errors"],
+            "action": "revert",
+            "messages": [f"Error spike: {recent_errors} errors in 5min"],
         }
 
+    print(f"   📊 Telemetry: ✅ Healthy ({recent_errors} errors)")
+    return {
+        "telemetry_status": "healthy",
+        "error_count": recent_errors,
+        "messages": [f"Production healthy: {recent_errors} errors"],
+    }
+
+
+def _handle_error(state: AgentState, error: Exception) -> dict:
+    print(f"   📊 Telemetry: Error - {error}")
+    return {
+        "telemetry_status": "error",
+        "messages": [f"Telemetry error: {error}"],
+    }
+
+
+def telemetry_node(state: AgentState) -> dict:
+    """Monitor production for error spikes after deployment."""
+    request = _sentry_request()
+    if not request:
+        return _not_configured(state)
+
+    try:
+        response = httpx.get(**request)
+        return _handle_response(state, response)
     except Exception as e:
-        print(f"   📊 Telemetry: Error - {e}")
-        return {
-            "telemetry_status": "error",
-            "messages": state.get("messages", []) + [f"Telemetry error: {e}"],
-        }
+        return _handle_error(state, e)
+
+
+async def atelemetry_node(state: AgentState) -> dict:
+    """Async variant of telemetry_node."""
+    request = _sentry_request()
+    if not request:
+        return _not_configured(state)
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(**request)
+        return _handle_response(state, response)
+    except Exception as e:
+        return _handle_error(state, e)
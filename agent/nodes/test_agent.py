@@ -1,57 +1,95 @@
 import os
 import subprocess
 from agent.state import AgentState
+from agent.tools.process import arun_process
 
+PLAYWRIGHT_CMD = ["npx", "playwright", "test", "--reporter=json"]
+TEST_TIMEOUT = 300
 
-def test_agent_node(state: AgentState) -> dict:
-    """Run E2E tests against the ephemeral environment."""
-    preview_url = state.get("preview_url")
-    if not preview_url:
-        print("   🧪 Tests: Skipped (no preview URL)")
-        return {
-            "test_status": "skipped",
-            "messages": state.get("messages", []) + ["No preview URL for testing"],
-        }
 
-    try:
-        result = subprocess.run(
-            ["npx", "playwright", "test", "--reporter=json"],
-            env={**os.environ, "BASE_URL": preview_url},
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
+def _skip_without_preview(state: AgentState) -> dict | None:
+    """Return a skipped result when there is no preview to test against."""
+    if state.get("preview_url"):
+        return None
+    print("   🧪 Tests: Skipped (no preview URL)")
+    return {
+        "test_status": "skipped",
+        "messages": ["No preview URL for testing"],
+    }
 
-        if result.returncode == 0:
-            print("   🧪 Tests: ✅ All passed")
-            return {
-                "test_status": "passed",
-                "test_output": result.stdout[:1000],
-                "messages": state.get("messages", []) + ["All E2E tests passed"],
-            }
 
-        print("   🧪 Tests: ❌ Failed")
+def _handle_result(
+    state: AgentState, returncode: int, stdout: str, stderr: str
+) -> dict:
+    """Turn the Playwright run into a state update."""
+    if returncode == 0:
+        print("   🧪 Tests: ✅ All passed")
         return {
-            "test_status": "failed",
-            "test_output": (result.stdout + result.stderr)[:1000],
-            "messages": state.get("messages", []) + ["E2E tests failed"],
+            "test_status": "passed",
+            "test_output": stdout[:1000],
+            "messages": ["All E2E tests passed"],
         }
 
-    except subprocess.TimeoutExpired:
+    print("   🧪 Tests: ❌ Failed")
+    return {
+        "test_status": "failed",
+        "test_output": (stdout + stderr)[:1000],
+        "messages": ["E2E tests failed"],
+    }
+
+
+def _handle_error(state: AgentState, error: Exception) -> dict:
+    """Map a failure to launch or finish Playwright into a state update."""
+    if isinstance(error, subprocess.TimeoutExpired):
         print("   🧪 Tests: ⏰ Timeout")
         return {
             "test_status": "timeout",
-            "messages": state.get("messages", []) + ["E2E tests timed out"],
+            "messages": ["E2E tests timed out"],
         }
-    except FileNotFoundError:
+    if isinstance(error, FileNotFoundError):
         print("   🧪 Tests: Skipped (playwright not found)")
         return {
             "test_status": "skipped",
-            "messages": state.get("messages", []) + ["Playwright not installed"],
+            "messages": ["Playwright not installed"],
         }
+    print(f"   🧪 Tests: Error - {error}")
+    return {
+        "test_status": "error",
+        "messages": [f"Test error: {error}"],
+    }
+
+
+def test_agent_node(state: AgentState) -> dict:
+    """Run E2E tests against the ephemeral environment."""
+    skipped = _skip_without_preview(state)
+    if skipped:
+        return skipped
+
+    try:
+        result = subprocess.run(
+            PLAYWRIGHT_CMD,
+            env={**os.environ, "BASE_URL": state["preview_url"]},
+            capture_output=True,
+            text=True,
+            timeout=TEST_TIMEOUT,
+        )
+        return _handle_result(state, result.returncode, result.stdout, result.stderr)
     except Exception as e:
-        print(f"   🧪 Tests: Error - {e}")
-        return {
-            "test_status": "error",
-            "messages": state.get("messages", []) + [f"Test error: {e}"],
-        }
+        return _handle_error(state, e)
+
+
+async def atest_agent_node(state: AgentState) -> dict:
+    """Async variant of test_agent_node."""
+    skipped = _skip_without_preview(state)
+    if skipped:
+        return skipped
+
+    try:
+        returncode, stdout, stderr = await arun_process(
+            *PLAYWRIGHT_CMD,
+            env={**os.environ, "BASE_URL": state["preview_url"]},
+            timeout=TEST_TIMEOUT,
+        )
+        return _handle_result(state, returncode, stdout, stderr)
+    except Exception as e:
+        return _handle_error(state, e)
@@ -3,16 +3,57 @@
 import re
 import time
 import os
+import queue
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dotenv import load_dotenv
-from agent.graph import app
+from agent.graph import build_graph, get_app
+from agent.checkpoints import (
+    ashould_resume,
+    open_async_checkpointer,
+    open_checkpointer,
+    should_resume,
+    thread_config,
+)
 from agent.state import AgentState
-from agent.adapters.linear_adapter import LinearAdapter
+from agent.adapters.linear_adapter import BoardSnapshot, LinearAdapter, LinearIssue
+from agent.adapters.rate_limit import is_transient_error
+from agent.adapters.watermarks import WatermarkStore
+from agent.job_queue import (
+    HEARTBEAT_INTERVAL,
+    MAX_ATTEMPTS,
+    WORKER_ID,
+    Job,
+    get_job_queue,
+)
+from agent.pr_index import get_pr_index
+from agent.tools.worktree import worktrees
+from agent.webhooks import WebhookEvent, events as webhook_events, start_webhook_server
 
 load_dotenv()
 
 POLL_INTERVAL = 30  # seconds
+
+# Webhook mode: events drive the work, polling becomes a slow reconciliation sweep
+USE_WEBHOOKS = os.getenv("FACTORY_WEBHOOKS", "").lower() in {"1", "true", "yes"}
+RECONCILE_INTERVAL = int(os.getenv("RECONCILE_INTERVAL", "300"))  # seconds
+
+# Async mode: issues share one event loop and run through app.ainvoke
+USE_ASYNC = os.getenv("FACTORY_ASYNC", "").lower() in {"1", "true", "yes"}
 TEAM_KEY = os.getenv("LINEAR_TEAM_KEY", "ENG")
 
+# Total number of issues processed concurrently
+MAX_WORKERS = int(os.getenv("FACTORY_MAX_WORKERS", "4"))
+
+# Per-phase concurrency caps (Claude Code heavy phases get fewer slots)
+PHASE_CONCURRENCY = {
+    "prd": int(os.getenv("FACTORY_PRD_CONCURRENCY", str(MAX_WORKERS))),
+    "erd": int(os.getenv("FACTORY_ERD_CONCURRENCY", "2")),
+    "implement": int(os.getenv("FACTORY_IMPLEMENT_CONCURRENCY", "2")),
+}
+
 # Workflow columns that trigger AI action
 ACTION_COLUMNS = [
     "AI: Create PRD",  # Product Manager creates PRD
@@ -20,6 +61,27 @@ ACTION_COLUMNS = [
     "AI: Implement",  # Engineer implements sub-issue code
 ]
 
+# Every column a poll cycle reads, fetched together in one board snapshot
+WATCHED_COLUMNS = ACTION_COLUMNS + ["Human: Review PR", "AI: In Progress"]
+# Only these columns need nested data in the snapshot: comments carry the PR
+# URLs of issues under review, children decide parent completion
+SNAPSHOT_NESTED_STATES = {
+    "comment_states": ["Human: Review PR"],
+    "children_states": ["AI: In Progress"],
+}
+
+# Incremental polling: action columns only return issues changed since the
+# team's updatedAt watermark. Review PR / In Progress are always read in full
+# because PR merges and sub-issue progress don't touch those issues' updatedAt.
+INCREMENTAL_POLLING = os.getenv("FACTORY_INCREMENTAL_POLLING", "true").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+FULL_SYNC_INTERVAL = int(os.getenv("FULL_SYNC_INTERVAL", "600"))  # seconds
+
+watermarks = WatermarkStore()
+
 
 def determine_workflow_phase(issue, state_name: str) -> dict:
     """Determine workflow phase based on state and issue properties."""
@@ -56,21 +118,9 @@ def determine_workflow_phase(issue, state_name: str) -> dict:
         }
 
 
-def process_issue(issue, adapter: LinearAdapter, phase_info: dict):
-    """Process a single issue through the workflow."""
-    print(f"\n📋 Processing: {issue.identifier} - {issue.title}")
-    print(f"   Phase: {phase_info['phase']}")
-
-    if phase_info["is_sub_issue"]:
-        print(f"   📎 Sub-issue of parent: {issue.parent_id}")
-
-    # Don't transition to In Progress at start - let nodes handle their own transitions
-    # Only ERD and Implement phases should auto-transition
-    if phase_info["phase"] in ["erd", "implement"]:
-        adapter.transition_issue(issue.id, "AI: In Progress")
-
-    # Build initial state
-    initial_state: AgentState = {
+def build_initial_state(issue, phase_info: dict) -> AgentState:
+    """Build the graph input for an issue."""
+    return {
         "task_description": f"{issue.title}\n\n{issue.description or ''}",
         "current_contract": None,
         "review_feedback": [],
@@ -81,9 +131,9 @@ def process_issue(issue, adapter: LinearAdapter, phase_info: dict):
         "pr_url": None,
         "request_type": None,
         "work_items": None,
-        "current_work_index": None,
         "current_work_item": None,
         "stack_base_branch": None,
+        "workspace_path": None,
         "ephemeral_status": None,
         "preview_url": None,
         "ephemeral_db_url": None,
@@ -102,45 +152,274 @@ def process_issue(issue, adapter: LinearAdapter, phase_info: dict):
         "workflow_phase": phase_info["phase"],
     }
 
-    try:
-        result = app.invoke(initial_state)
-
-        status = result.get("status", "unknown")
-        if status == "published":
-            print(f"   ✅ PR created: {result.get('pr_url')}")
-            # Publisher node handles transition to Human: Review PR
-        elif status == "awaiting_prd_review":
-            print("   ✅ PRD created, moved to Human: Review PRD")
-        elif status == "awaiting_technical_review":
-            print("   ✅ ERD created, sub-issues in Human: Review ERD")
-        elif status in ["failed", "error"]:
-            messages = result.get("messages", [])
-            feedback = result.get("review_feedback", [])
-
-            error_details = []
-            if messages:
-                error_details.append(f"Messages: {messages}")
-            if feedback:
-                for fb in feedback:
-                    if not fb.approved and fb.concerns:
-                        error_details.append(f"{fb.agent}: {fb.concerns}")
-
-            error_summary = "; ".join(error_details) if error_details else "No details"
 
+def start_issue(issue, adapter: LinearAdapter, phase_info: dict) -> AgentState:
+    """Announce an issue, move it to In Progress if needed and build its state."""
+    print(f"\n📋 Processing: {issue.identifier} - {issue.title}")
+    print(f"   Phase: {phase_info['phase']}")
+
+    if phase_info["is_sub_issue"]:
+        print(f"   📎 Sub-issue of parent: {issue.parent_id}")
+
+    # Don't transition to In Progress at start - let nodes handle their own transitions
+    # Only ERD and Implement phases should auto-transition
+    if phase_info["phase"] in ["erd", "implement"]:
+        adapter.transition_issue(issue.id, "AI: In Progress")
+
+    return build_initial_state(issue, phase_info)
+
+
+def handle_result(issue, adapter: LinearAdapter, result: dict):
+    """Report a finished graph run back to Linear."""
+    status = result.get("status", "unknown")
+    if status in ("published", "stack_complete"):
+        print(f"   ✅ PR created: {result.get('pr_url')}")
+        # Publisher node handles transition to Human: Review PR
+    elif status == "awaiting_prd_review":
+        print("   ✅ PRD created, moved to Human: Review PRD")
+    elif status == "awaiting_technical_review":
+        print("   ✅ ERD created, sub-issues in Human: Review ERD")
+    elif status in ["failed", "error"]:
+        messages = result.get("messages", [])
+        feedback = result.get("review_feedback", [])
+
+        error_details = []
+        if messages:
+            error_details.append(f"Messages: {messages}")
+        if feedback:
+            for fb in feedback:
+                if not fb.approved and fb.concerns:
+                    error_details.append(f"{fb.agent}: {fb.concerns}")
+
+        error_summary = "; ".join(error_details) if error_details else "No details"
+
+        with adapter.batch():
             adapter.transition_issue(issue.id, "AI: Failed")
             adapter.add_comment(issue.id, f"❌ Failed: {error_summary[:500]}")
-            print(f"   ❌ Failed: {status}")
-            print(f"      Details: {error_summary}")
+        print(f"   ❌ Failed: {status}")
+        print(f"      Details: {error_summary}")
+    else:
+        print(f"   ℹ️  Completed with status: {status}")
+
+
+def handle_error(issue, adapter: LinearAdapter, error: Exception):
+    """Mark an issue failed after the graph raised."""
+    import traceback
+
+    with adapter.batch():
+        adapter.transition_issue(issue.id, "AI: Failed")
+        adapter.add_comment(issue.id, f"❌ Error: {str(error)}")
+    print(f"   ❌ Error: {error}")
+    traceback.print_exception(error)
+
+
+_graph = None
+_async_graph = None
+
+
+def get_graph():
+    """Get the graph used for polling, with durable checkpoints when available."""
+    global _graph
+    if _graph is None:
+        checkpointer = open_checkpointer()
+        _graph = build_graph(checkpointer) if checkpointer else get_app()
+    return _graph
+
+
+def process_issue(issue, adapter: LinearAdapter, phase_info: dict):
+    """Process a single issue through the workflow.
+
+    Runs are checkpointed per issue, so a run interrupted by a crash resumes
+    from its last completed node the next time the issue is picked up.
+    Transient errors (network, rate limits, 5xx) are re-raised so the job
+    queue retries the issue with backoff; any other error marks it failed.
+    """
+    graph = get_graph()
+    config = thread_config(issue.id)
+    initial_state = start_issue(issue, adapter, phase_info)
+
+    try:
+        if should_resume(graph, config, phase_info["phase"]):
+            print("   ⏯️  Resuming from checkpoint")
+            result = graph.invoke(None, config)
         else:
-            print(f"   ℹ️  Completed with status: {status}")
+            # Fresh run - don't inherit files from an abandoned attempt
+            worktrees.release_issue(issue.identifier)
+            result = graph.invoke(initial_state, config)
+        handle_result(issue, adapter, result)
+    except Exception as e:
+        # Worktrees are kept so a resumed run continues with their files
+        if is_transient_error(e):
+            raise
+        handle_error(issue, adapter, e)
+    else:
+        worktrees.release_issue(issue.identifier)
 
+
+async def aprocess_issue(issue, adapter: LinearAdapter, phase_info: dict):
+    """Async variant of process_issue, running the graph with app.ainvoke.
+
+    Linear calls go through asyncio.to_thread since the adapter is synchronous.
+    """
+    graph = _async_graph or get_app()
+    config = thread_config(issue.id)
+    initial_state = await asyncio.to_thread(start_issue, issue, adapter, phase_info)
+
+    try:
+        if await ashould_resume(graph, config, phase_info["phase"]):
+            print("   ⏯️  Resuming from checkpoint")
+            result = await graph.ainvoke(None, config)
+        else:
+            await asyncio.to_thread(worktrees.release_issue, issue.identifier)
+            result = await graph.ainvoke(initial_state, config)
+        await asyncio.to_thread(handle_result, issue, adapter, result)
     except Exception as e:
-        import traceback
+        if is_transient_error(e):
+            raise
+        await asyncio.to_thread(handle_error, issue, adapter, e)
+    else:
+        await asyncio.to_thread(worktrees.release_issue, issue.identifier)
 
-        adapter.transition_issue(issue.id, "AI: Failed")
-        adapter.add_comment(issue.id, f"❌ Error: {str(e)}")
-        print(f"   ❌ Error: {e}")
-        traceback.print_exc()
+
+_executor: ThreadPoolExecutor | None = None
+# Jobs this process has leased (futures in threaded mode, tasks in async mode)
+_in_flight: dict[str, Future | asyncio.Task] = {}
+_phase_running: Counter = Counter()
+_in_flight_lock = threading.Lock()
+_heartbeat_thread: threading.Thread | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, MAX_WORKERS), thread_name_prefix="factory"
+        )
+    return _executor
+
+
+def _full_phases() -> list[str]:
+    """Phases with no free slot in this process (call with _in_flight_lock held)."""
+    return [
+        phase
+        for phase, limit in PHASE_CONCURRENCY.items()
+        if _phase_running[phase] >= max(1, limit)
+    ]
+
+
+def _heartbeat_loop():
+    """Keep this worker's leases alive while their jobs run."""
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL)
+        with _in_flight_lock:
+            issue_ids = list(_in_flight)
+        held = get_job_queue().heartbeat(issue_ids)
+        if held < len(issue_ids):
+            print(f"   ⚠️ Lost {len(issue_ids) - held} job lease(s) to other workers")
+
+
+def _start_heartbeat():
+    global _heartbeat_thread
+    with _in_flight_lock:
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(
+                target=_heartbeat_loop, name="job-heartbeat", daemon=True
+            )
+            _heartbeat_thread.start()
+
+
+def report_final_failure(job: Job, adapter: LinearAdapter, error: Exception):
+    """Mark an issue failed in Linear once its job has no retries left."""
+    try:
+        handle_error(job.issue, adapter, error)
+    except Exception as e:
+        print(f"   ⚠️ {job.issue.identifier}: Could not report failure: {e}")
+
+
+def _finish_job(job: Job, error: Exception | None):
+    """Record a job's outcome in the queue and free its slot."""
+    jobs = get_job_queue()
+    if error is None:
+        jobs.complete(job.issue.id)
+    else:
+        delay = jobs.fail(job.issue.id, str(error))
+        if delay is None:
+            print(
+                f"   ❌ {job.issue.identifier}: Giving up after {job.attempts} attempts"
+            )
+        else:
+            print(f"   🔁 {job.issue.identifier}: Retrying in {delay:.0f}s")
+
+    with _in_flight_lock:
+        _in_flight.pop(job.issue.id, None)
+        _phase_running[job.phase_info["phase"]] -= 1
+
+
+def _run_job(job: Job, adapter: LinearAdapter):
+    """Run one leased job, never letting errors escape the worker."""
+    error = None
+    if job.attempts > 1:
+        print(f"   🔁 {job.issue.identifier}: Attempt {job.attempts}")
+    try:
+        process_issue(job.issue, adapter, job.phase_info)
+    except Exception as e:
+        # Transient graph errors and adapter failures - left to the queue's retry
+        print(f"   ❌ {job.issue.identifier}: Worker error: {e}")
+        error = e
+        if job.attempts >= MAX_ATTEMPTS:
+            report_final_failure(job, adapter, e)
+    _finish_job(job, error)
+
+    # A slot just freed up - take the next queued job
+    dispatch_jobs(adapter)
+
+
+def dispatch_jobs(adapter: LinearAdapter) -> list[Future]:
+    """Lease queued jobs onto this process's free worker and phase slots.
+
+    Returns:
+        Futures for the jobs started.
+    """
+    jobs = get_job_queue()
+    started = []
+
+    while True:
+        with _in_flight_lock:
+            if len(_in_flight) >= MAX_WORKERS:
+                break
+            job = jobs.lease(exclude_phases=_full_phases())
+            if job is None:
+                break
+            _phase_running[job.phase_info["phase"]] += 1
+            future = get_executor().submit(_run_job, job, adapter)
+            _in_flight[job.issue.id] = future
+        started.append(future)
+
+    if started:
+        _start_heartbeat()
+    return started
+
+
+def wait_for_jobs():
+    """Block until this process has no running jobs."""
+    while True:
+        with _in_flight_lock:
+            running = [f for f in _in_flight.values() if isinstance(f, Future)]
+        if not running:
+            return
+        wait(running)
+
+
+def submit_issue(issue, adapter: LinearAdapter, phase_info: dict) -> bool:
+    """Queue an issue and start it right away if a worker slot is free.
+
+    Returns:
+        False if the issue already has a queued or running job.
+    """
+    queued = get_job_queue().enqueue(issue, phase_info)
+    dispatch_jobs(adapter)
+    return queued
 
 
 def extract_pr_url_from_comments(comments: list) -> str | None:
@@ -155,8 +434,19 @@ def extract_pr_url_from_comments(comments: list) -> str | None:
     return None
 
 
-def check_pr_merges_and_complete(adapter: LinearAdapter):
-    """Check issues in Human: Review PR for merged PRs and complete them."""
+def check_pr_merges_and_complete(
+    adapter: LinearAdapter, snapshot: BoardSnapshot | None = None
+):
+    """Check issues in Human: Review PR for merged PRs and complete them.
+
+    PR URLs come from the PR index; only issues published before the index
+    existed have their comments scanned (from the board snapshot when one is
+    given, otherwise fetched from Linear), once. The merge state of every PR
+    comes from each repo's recent-PR listing - a conditional request that
+    costs a 304 while nothing changed - with a batched GraphQL query for
+    PRs outside it. An issue is done once all of its PRs (one per stacked
+    work item) are merged.
+    """
     print("\n🔍 Checking for merged PRs...")
 
     # Try to import GitHub adapter - skip if not configured
@@ -172,7 +462,10 @@ def check_pr_merges_and_complete(adapter: LinearAdapter):
         return
 
     # Get issues in Human: Review PR
-    pr_issues = adapter.get_issues_in_state(TEAM_KEY, "Human: Review PR")
+    if snapshot:
+        pr_issues = snapshot.issues_in_state("Human: Review PR")
+    else:
+        pr_issues = adapter.get_issues_in_state(TEAM_KEY, "Human: Review PR")
 
     if not pr_issues:
         print("   No issues awaiting PR review.")
@@ -180,87 +473,290 @@ def check_pr_merges_and_complete(adapter: LinearAdapter):
 
     print(f"   Found {len(pr_issues)} issue(s) in Human: Review PR")
 
+    index = get_pr_index()
+    recorded = index.for_issues([issue.id for issue in pr_issues])
+    open_prs: dict[str, list[str]] = {}
     for issue in pr_issues:
-        # Get comments to find PR URL
-        comments = adapter.get_issue_comments(issue.id)
+        records = recorded.get(issue.id)
+        if records:
+            open_prs[issue.id] = [r.pr_url for r in records if not r.merged]
+            continue
+
+        # Published before the PR index existed - find the URL in its comments
+        if snapshot and issue.id in snapshot.comments:
+            comments = snapshot.comments[issue.id]
+        else:
+            comments = adapter.get_issue_comments(issue.id)
         pr_url = extract_pr_url_from_comments(comments)
 
         if not pr_url:
             print(f"   ⚠️ {issue.identifier}: No PR URL found in comments")
             continue
+        index.record(issue, pr_url)
+        open_prs[issue.id] = [pr_url]
+
+    urls = [url for issue_urls in open_prs.values() for url in issue_urls]
+    prs = github.get_prs_by_urls(urls) if urls else {}
+    for url, pr in prs.items():
+        if pr and pr.merged:
+            index.mark_merged(url, pr.merge_commit_sha)
+
+    # Every completion of the cycle is written in one request
+    completed_parents: set[str] = set()
+    with adapter.batch():
+        for issue in pr_issues:
+            if issue.id not in open_prs:
+                continue
+
+            if all(prs.get(url) and prs[url].merged for url in open_prs[issue.id]):
+                print(f"   ✅ {issue.identifier}: PR merged! Moving to Done")
+                adapter.transition_issue(issue.id, "Done")
+                adapter.add_comment(issue.id, "🎉 PR merged! Issue completed.")
+
+                if issue.parent_id:
+                    completed_parents.add(issue.parent_id)
+            else:
+                print(f"   ⏳ {issue.identifier}: PR not yet merged")
+
+    # Check if parents should be completed, all at once
+    if completed_parents:
+        check_parent_completion(adapter, completed_parents)
+
+
+def complete_parents(
+    adapter: LinearAdapter, parents: list[tuple[LinearIssue, list[LinearIssue]]]
+):
+    """Complete every parent whose already-fetched sub-issues are all done.
+
+    Completion is decided in memory and every completion is written in one
+    batched request, so evaluating any number of parents costs at most one
+    request.
+    """
+    with adapter.batch():
+        for parent, sub_issues in parents:
+            if adapter.sub_issues_completed(sub_issues):
+                print(
+                    f"   🎉 All sub-issues complete! Moving {parent.identifier} to Done"
+                )
+                adapter.transition_issue(parent.id, "Done")
+                adapter.add_comment(
+                    parent.id,
+                    "🎉 All sub-issues completed! Parent issue marked as done.",
+                )
+            else:
+                done_count = sum(
+                    1 for s in sub_issues if s.state in {"Done", "Completed", "Closed"}
+                )
+                print(
+                    f"   ⏳ {parent.identifier}: {done_count}/{len(sub_issues)} sub-issues complete"
+                )
+
+
+def check_parent_completion(adapter: LinearAdapter, parent_ids: set[str]):
+    """Complete the given parents if all their sub-issues are done.
+
+    Parents with a sub-issue whose PR is still unmerged in the PR index are
+    skipped without asking Linear; the rest are loaded with their children
+    in one query. check_in_progress_parents sweeps up anything the index
+    misses.
+    """
+    index = get_pr_index()
+    pending = [p for p in parent_ids if not index.has_open_prs(p)]
+    if len(pending) < len(parent_ids):
+        print(
+            f"   ⏳ {len(parent_ids) - len(pending)} parent(s) still have "
+            "sub-issues with open PRs"
+        )
 
-        # Check if PR is merged
-        if github.is_pr_merged(pr_url):
-            print(f"   ✅ {issue.identifier}: PR merged! Moving to Done")
-            adapter.transition_issue(issue.id, "Done")
-            adapter.add_comment(issue.id, "🎉 PR merged! Issue completed.")
+    parents = [
+        (parent, sub_issues)
+        for parent, sub_issues in adapter.iter_issues_with_children(issue_ids=pending)
+        if parent.state not in {"Done", "Completed", "Closed", "Canceled"}
+    ]
+    complete_parents(adapter, parents)
 
-            # Check if parent should be completed
-            if issue.parent_id:
-                check_parent_completion(adapter, issue.parent_id)
-        else:
-            print(f"   ⏳ {issue.identifier}: PR not yet merged")
 
+def check_in_progress_parents(
+    adapter: LinearAdapter, snapshot: BoardSnapshot | None = None
+):
+    """Check parent issues in AI: In Progress to see if they should be completed.
 
-def check_parent_completion(adapter: LinearAdapter, parent_id: str):
-    """Check if all sub-issues are complete and complete the parent if so."""
-    parent = adapter.get_issue_by_id(parent_id)
-    if not parent:
-        print(f"   ⚠️ Could not find parent issue: {parent_id}")
-        return
+    Parents and sub-issues are read from the board snapshot when one is
+    given, otherwise every parent is fetched together with its children in
+    one paginated query.
+    """
+    print("\n🔍 Checking parent issues for completion...")
 
-    # Check if all sub-issues are done
-    if adapter.all_sub_issues_completed(parent_id):
-        print(
-            f"   🎉 All sub-issues complete! Moving parent {parent.identifier} to Done"
+    if snapshot:
+        # Filter to only parent issues (no parent_id)
+        parent_issues = [
+            i
+            for i in snapshot.issues_in_state("AI: In Progress")
+            if i.parent_id is None
+        ]
+        parents = [
+            (p, snapshot.sub_issues[p.id])
+            for p in parent_issues
+            if p.id in snapshot.sub_issues
+        ]
+        # Parents whose children overflowed the snapshot, in one batch
+        overflow = [p.id for p in parent_issues if p.id not in snapshot.sub_issues]
+        parents.extend(adapter.iter_issues_with_children(issue_ids=overflow))
+    else:
+        parents = list(
+            adapter.iter_issues_with_children(
+                team_key=TEAM_KEY, state_name="AI: In Progress", top_level_only=True
+            )
         )
-        adapter.transition_issue(parent_id, "Done")
-        adapter.add_comment(
-            parent_id, "🎉 All sub-issues completed! Parent issue marked as done."
+
+    if not parents:
+        print("   No parent issues in progress.")
+        return
+
+    print(f"   Found {len(parents)} parent issue(s) in AI: In Progress")
+    complete_parents(adapter, parents)
+
+
+def fetch_board_snapshot(adapter: LinearAdapter) -> BoardSnapshot:
+    """Fetch this cycle's board snapshot, incrementally when a watermark exists.
+
+    A full sync runs when there is no watermark yet and every
+    FULL_SYNC_INTERVAL seconds, to pick up issues whose processing was lost.
+    """
+    if not INCREMENTAL_POLLING:
+        return adapter.get_board_snapshot(
+            TEAM_KEY, WATCHED_COLUMNS, **SNAPSHOT_NESTED_STATES
         )
 
+    started_at = time.time()
+    watermark = watermarks.get_watermark(TEAM_KEY)
+    full_sync = (
+        not watermark
+        or started_at - watermarks.last_full_sync(TEAM_KEY) >= FULL_SYNC_INTERVAL
+    )
+
+    snapshot = adapter.get_board_snapshot(
+        TEAM_KEY,
+        WATCHED_COLUMNS,
+        updated_after=None if full_sync else watermark,
+        incremental_states=ACTION_COLUMNS,
+        **SNAPSHOT_NESTED_STATES,
+    )
+
+    latest = max(
+        (
+            issue.updated_at
+            for issues in snapshot.states.values()
+            for issue in issues
+            if issue.updated_at
+        ),
+        default=None,
+    )
+    watermarks.advance(TEAM_KEY, latest)
+    if full_sync:
+        watermarks.mark_full_sync(TEAM_KEY, started_at)
+        print("\n🔄 Full board sync")
+
+    return snapshot
+
+
+def print_llm_cache_stats():
+    """Report LLM cache effectiveness for this process."""
+    from agent.llm_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    if not cache:
+        return
+    stats = cache.stats()
+    print(
+        f"\n💾 LLM cache: {stats['hits']} hits / {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%}), {stats['entries']} entries, "
+        f"{stats['bytes'] / 1024:.0f} KB"
+    )
 
-def check_in_progress_parents(adapter: LinearAdapter):
-    """Check parent issues in AI: In Progress to see if they should be completed."""
-    print("\n🔍 Checking parent issues for completion...")
 
-    # Get parent issues in AI: In Progress
-    in_progress = adapter.get_issues_in_state(TEAM_KEY, "AI: In Progress")
+def print_github_cache_stats():
+    """Report GitHub ETag cache effectiveness for this process."""
+    from agent.adapters.etag_cache import get_etag_cache
+
+    cache = get_etag_cache()
+    if not cache:
+        return
+    stats = cache.stats()
+    if not stats["hits"] + stats["misses"]:
+        return
+    print(
+        f"🐙 GitHub cache: {stats['hits']} not modified / {stats['misses']} fetched "
+        f"({stats['hit_rate']:.0%}), {stats['entries']} entries"
+    )
+
 
-    # Filter to only parent issues (no parent_id)
-    parent_issues = [i for i in in_progress if i.parent_id is None]
+def print_claude_pool_stats():
+    """Report Claude Code pool usage for this process."""
+    from agent.tools.claude_pool import claude_pool
 
-    if not parent_issues:
-        print("   No parent issues in progress.")
+    stats = claude_pool.stats()
+    if not stats["runs"]:
         return
+    statuses = ", ".join(f"{n} {s}" for s, n in sorted(stats["statuses"].items()))
+    print(
+        f"🤖 Claude Code: {stats['runs']} runs ({statuses}), "
+        f"avg wait {stats['avg_queue_wait']:.1f}s (max {stats['max_queue_wait']:.1f}s), "
+        f"avg run {stats['avg_run_time']:.1f}s, {stats['tokens']} tokens"
+    )
 
-    print(f"   Found {len(parent_issues)} parent issue(s) in AI: In Progress")
 
-    for parent in parent_issues:
-        if adapter.all_sub_issues_completed(parent.id):
-            print(f"   🎉 All sub-issues complete! Moving {parent.identifier} to Done")
-            adapter.transition_issue(parent.id, "Done")
-            adapter.add_comment(
-                parent.id, "🎉 All sub-issues completed! Parent issue marked as done."
-            )
-        else:
-            sub_issues = adapter.get_sub_issues(parent.id)
-            done_count = sum(
-                1 for s in sub_issues if s.state in {"Done", "Completed", "Closed"}
-            )
-            print(
-                f"   ⏳ {parent.identifier}: {done_count}/{len(sub_issues)} sub-issues complete"
-            )
+def print_rate_limit_stats():
+    """Report remaining API budget and throttling for Linear and GitHub."""
+    from agent.adapters.rate_limit import github_limiter, linear_limiter
+
+    for limiter in (linear_limiter, github_limiter):
+        stats = limiter.stats()
+        if not stats["requests"]:
+            continue
+        budget = (
+            f"{stats['remaining']}/{stats['limit']} left"
+            if stats["remaining"] is not None
+            else "budget unknown"
+        )
+        if stats["reset_in"] is not None:
+            budget += f", resets in {stats['reset_in']:.0f}s"
+        print(
+            f"🚦 {limiter.name}: {budget}; {stats['requests']} requests, "
+            f"{stats['retries']} retries, throttled {stats['throttled']}x "
+            f"({stats['wait_time']:.1f}s)"
+        )
+
+
+def poll_and_process(
+    wait_for_completion: bool = True, adapter: LinearAdapter | None = None
+):
+    """Poll Linear for issues in all action columns and process them.
+
+    Issues are added to the shared job queue (deduplicated by issue ID, so
+    issues already queued or running - in this process or another worker -
+    are skipped) and then leased onto this process's worker pool.
 
+    Args:
+        wait_for_completion: Block until every job this process picked up has
+            finished. The continuous loop passes False so one slow ticket does
+            not delay the next scan.
+        adapter: Long-lived adapter shared with the worker threads. When
+            omitted, a temporary adapter is created and the cycle always waits
+            for its workers.
+    """
+    owns_adapter = adapter is None
+    if owns_adapter:
+        adapter = LinearAdapter()
+    jobs = get_job_queue()
 
-def poll_and_process():
-    """Poll Linear for issues in all action columns and process them."""
-    adapter = LinearAdapter()
+    # One request for every column this cycle looks at
+    snapshot = fetch_board_snapshot(adapter)
 
     # Phase 1-3: Process AI action columns
     for column in ACTION_COLUMNS:
         print(f"\n🔄 Checking '{column}' column...")
-        issues = adapter.get_issues_in_state(TEAM_KEY, column)
+        issues = snapshot.issues_in_state(column)
 
         if not issues:
             print("   No issues found.")
@@ -270,13 +766,160 @@ def poll_and_process():
 
         for issue in issues:
             phase_info = determine_workflow_phase(issue, column)
-            process_issue(issue, adapter, phase_info)
+            if not jobs.enqueue(issue, phase_info):
+                print(f"   ⏳ {issue.identifier}: Already queued, skipping")
+
+    # Every column is queued first so the most urgent issues start first
+    dispatch_jobs(adapter)
+    if wait_for_completion or owns_adapter:
+        wait_for_jobs()
 
     # Phase 4: Check for merged PRs and complete issues
-    check_pr_merges_and_complete(adapter)
+    check_pr_merges_and_complete(adapter, snapshot)
 
     # Phase 5: Check parent issues for auto-completion
-    check_in_progress_parents(adapter)
+    check_in_progress_parents(adapter, snapshot)
+
+    print_llm_cache_stats()
+    print_claude_pool_stats()
+    print_rate_limit_stats()
+    print_github_cache_stats()
+
+
+def dispatch_event(event: WebhookEvent, adapter: LinearAdapter):
+    """Route a webhook event onto the same processing path as polling."""
+    if event.kind == "issue_state":
+        if event.state_name not in ACTION_COLUMNS:
+            return
+        # Work from Linear's copy of the issue, not the payload's
+        issue = adapter.get_issue_by_id(event.issue_id)
+        if not issue or issue.state not in ACTION_COLUMNS:
+            return
+        print(f"\n📨 Webhook: {issue.identifier} moved to '{issue.state}'")
+        phase_info = determine_workflow_phase(issue, issue.state)
+        if not submit_issue(issue, adapter, phase_info):
+            print(f"   ⏳ {issue.identifier}: Already queued, skipping")
+    elif event.kind == "pr_merged":
+        print(f"\n📨 Webhook: PR merged {event.pr_url}")
+        check_pr_merges_and_complete(adapter)
+
+
+def run_webhook_loop(adapter: LinearAdapter):
+    """Consume webhook events, with a periodic full sweep to catch missed ones."""
+    start_webhook_server()
+    next_sweep = 0.0
+
+    while True:
+        if time.monotonic() >= next_sweep:
+            print("\n🧹 Reconciliation sweep...")
+            poll_and_process(wait_for_completion=False, adapter=adapter)
+            next_sweep = time.monotonic() + RECONCILE_INTERVAL
+
+        try:
+            event = webhook_events.get(timeout=max(0.0, next_sweep - time.monotonic()))
+        except queue.Empty:
+            continue
+        dispatch_event(event, adapter)
+
+
+_adispatch_lock: asyncio.Lock | None = None
+
+
+async def _arun_job(job: Job, adapter: LinearAdapter):
+    """Async counterpart of _run_job."""
+    error = None
+    if job.attempts > 1:
+        print(f"   🔁 {job.issue.identifier}: Attempt {job.attempts}")
+    try:
+        await aprocess_issue(job.issue, adapter, job.phase_info)
+    except Exception as e:
+        print(f"   ❌ {job.issue.identifier}: Task error: {e}")
+        error = e
+        if job.attempts >= MAX_ATTEMPTS:
+            await asyncio.to_thread(report_final_failure, job, adapter, e)
+    await asyncio.to_thread(_finish_job, job, error)
+    await adispatch_jobs(adapter)
+
+
+async def adispatch_jobs(adapter: LinearAdapter):
+    """Async counterpart of dispatch_jobs, starting jobs as event loop tasks.
+
+    Only the per-phase caps apply - tasks are cheap, so MAX_WORKERS doesn't.
+    """
+    global _adispatch_lock
+    if _adispatch_lock is None:
+        _adispatch_lock = asyncio.Lock()
+
+    jobs = get_job_queue()
+    started = False
+    async with _adispatch_lock:
+        while True:
+            with _in_flight_lock:
+                full = _full_phases()
+            job = await asyncio.to_thread(jobs.lease, full)
+            if job is None:
+                break
+            with _in_flight_lock:
+                _phase_running[job.phase_info["phase"]] += 1
+                _in_flight[job.issue.id] = asyncio.create_task(
+                    _arun_job(job, adapter), name=job.issue.identifier
+                )
+            started = True
+
+    if started:
+        _start_heartbeat()
+
+
+async def apoll_and_process(adapter: LinearAdapter):
+    """Async variant of poll_and_process that never waits for its issues.
+
+    Issue tasks keep running on the event loop across cycles; Linear and
+    GitHub calls run via asyncio.to_thread.
+    """
+    jobs = get_job_queue()
+    snapshot = await asyncio.to_thread(fetch_board_snapshot, adapter)
+
+    # Phase 1-3: Process AI action columns
+    for column in ACTION_COLUMNS:
+        print(f"\n🔄 Checking '{column}' column...")
+        issues = snapshot.issues_in_state(column)
+
+        if not issues:
+            print("   No issues found.")
+            continue
+
+        print(f"   Found {len(issues)} issue(s)")
+
+        for issue in issues:
+            phase_info = determine_workflow_phase(issue, column)
+            if not await asyncio.to_thread(jobs.enqueue, issue, phase_info):
+                print(f"   ⏳ {issue.identifier}: Already queued, skipping")
+
+    await adispatch_jobs(adapter)
+
+    # Phase 4: Check for merged PRs and complete issues
+    await asyncio.to_thread(check_pr_merges_and_complete, adapter, snapshot)
+
+    # Phase 5: Check parent issues for auto-completion
+    await asyncio.to_thread(check_in_progress_parents, adapter, snapshot)
+
+    print_llm_cache_stats()
+    print_claude_pool_stats()
+    print_rate_limit_stats()
+    print_github_cache_stats()
+
+
+async def arun_poll_loop(adapter: LinearAdapter):
+    """Polling loop for async mode."""
+    global _async_graph
+
+    async with open_async_checkpointer() as checkpointer:
+        _async_graph = build_graph(checkpointer) if checkpointer else get_app()
+
+        while True:
+            await apoll_and_process(adapter)
+            print(f"\n⏳ Sleeping for {POLL_INTERVAL}s...")
+            await asyncio.sleep(POLL_INTERVAL)
 
 
 def main():
@@ -285,11 +928,28 @@ def main():
     print("=" * 50)
     print(f"Monitoring columns: {', '.join(ACTION_COLUMNS)}")
     print("Also checking: Human: Review PR (for merged PRs)")
-
-    while True:
-        poll_and_process()
-        print(f"\n⏳ Sleeping for {POLL_INTERVAL}s...")
-        time.sleep(POLL_INTERVAL)
+    print(f"Workers: {MAX_WORKERS} (per phase: {PHASE_CONCURRENCY})")
+    print(f"Worker ID: {WORKER_ID}")
+
+    # One adapter for the lifetime of the process
+    with LinearAdapter() as adapter:
+        # Warm the team/state ID cache so transitions skip the lookup round-trip
+        adapter.get_workflow_states(TEAM_KEY)
+
+        if USE_WEBHOOKS:
+            print(f"Webhooks enabled (reconciling every {RECONCILE_INTERVAL}s)")
+            run_webhook_loop(adapter)
+            return
+
+        if USE_ASYNC:
+            print("Async mode: issues share one event loop (app.ainvoke)")
+            asyncio.run(arun_poll_loop(adapter))
+            return
+
+        while True:
+            poll_and_process(wait_for_completion=False, adapter=adapter)
+            print(f"\n⏳ Sleeping for {POLL_INTERVAL}s...")
+            time.sleep(POLL_INTERVAL)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+"""Persistent index of the pull requests the factory has opened.
+
+The publisher records every PR the moment it is created: issue, PR URL, branch
+and (once merged) the merge commit. The poller looks up an issue's PRs here
+instead of downloading and regex-scanning its comments every cycle, the
+reverter finds the merge commit to revert, and parent-completion checks can
+tell that a child still has an open PR without asking Linear.
+
+An issue can own several PRs (one per stacked work item), so records are keyed
+by PR URL and indexed by issue and parent issue.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from agent.config.storage import data_path
+
+PR_INDEX_DB = os.getenv("FACTORY_PR_INDEX_DB")
+
+_COLUMNS = "pr_url, issue_id, identifier, parent_id, branch, merge_sha, merged_at"
+
+
+class PRRecord(BaseModel):
+    """One published PR and what it belongs to."""
+
+    pr_url: str
+    issue_id: str
+    identifier: str
+    parent_id: Optional[str] = None
+    branch: Optional[str] = None
+    merge_sha: Optional[str] = None
+    merged_at: Optional[str] = None
+
+    @property
+    def merged(self) -> bool:
+        return self.merged_at is not None
+
+
+class PRIndex:
+    """SQLite-backed issue ID ↔ PR URL ↔ branch ↔ merge SHA index."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or PR_INDEX_DB or data_path("pr_index.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS prs (
+                pr_url TEXT PRIMARY KEY,
+                issue_id TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                parent_id TEXT,
+                branch TEXT,
+                merge_sha TEXT,
+                merged_at TEXT,
+                created_at TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS prs_issue ON prs (issue_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS prs_parent ON prs (parent_id)")
+        self._conn.commit()
+
+    def record(self, issue, pr_url: str, branch: Optional[str] = None):
+        """Record a PR opened for an issue (re-recording keeps its merge state).
+
+        Args:
+            issue: The LinearIssue the PR implements
+            pr_url: Full PR URL
+            branch: Head branch of the PR, if known
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO prs (pr_url, issue_id, identifier, parent_id, branch, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (pr_url) DO UPDATE SET issue_id = excluded.issue_id, "
+                "identifier = excluded.identifier, parent_id = excluded.parent_id, "
+                "branch = COALESCE(excluded.branch, branch)",
+                (
+                    pr_url,
+                    issue.id,
+                    issue.identifier,
+                    issue.parent_id,
+                    branch,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self._conn.commit()
+
+    def mark_merged(self, pr_url: str, merge_sha: Optional[str] = None):
+        """Record that a PR was merged, with its merge commit if known."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE prs SET merged_at = COALESCE(merged_at, ?), "
+                "merge_sha = COALESCE(?, merge_sha) WHERE pr_url = ?",
+                (datetime.now(timezone.utc).isoformat(), merge_sha, pr_url),
+            )
+            self._conn.commit()
+
+    def by_url(self, pr_url: str) -> Optional[PRRecord]:
+        """Get the record for a PR URL."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM prs WHERE pr_url = ?", (pr_url,)
+            ).fetchone()
+        return _record(row) if row else None
+
+    def for_issues(self, issue_ids: List[str]) -> Dict[str, List[PRRecord]]:
+        """Get the PRs of many issues in one lookup.
+
+        Returns:
+            Mapping of issue ID to its PRs (oldest first); issues without any
+            recorded PR are left out.
+        """
+        if not issue_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in issue_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM prs WHERE issue_id IN ({placeholders}) "
+                "ORDER BY created_at",
+                list(issue_ids),
+            ).fetchall()
+        records: Dict[str, List[PRRecord]] = {}
+        for row in rows:
+            record = _record(row)
+            records.setdefault(record.issue_id, []).append(record)
+        return records
+
+    def has_open_prs(self, parent_id: str) -> bool:
+        """Whether any sub-issue of a parent still has an unmerged PR."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM prs WHERE parent_id = ? AND merged_at IS NULL LIMIT 1",
+                (parent_id,),
+            ).fetchone()
+        return row is not None
+
+
+def _record(row: tuple) -> PRRecord:
+    return PRRecord(**dict(zip(_COLUMNS.split(", "), row)))
+
+
+_index: Optional[PRIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_pr_index() -> PRIndex:
+    """Get the process-wide PR index, opening it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PRIndex()
+    return _index
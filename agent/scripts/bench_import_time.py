@@ -0,0 +1,88 @@
+"""Benchmark cold-start import time of the factory entry points.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the cumulative import time of each entry point (best of N runs), plus
+the heaviest imports pulled in by the first one. Graph compilation is timed
+separately since it is deferred until first use.
+
+Usage: python scripts/bench_import_time.py [runs]
+"""
+
+import os
+import sys
+import subprocess
+
+ENTRY_POINTS = ["agent.graph", "agent.poll", "agent.main", "agent.webhooks"]
+TOP_IMPORTS = 10
+
+# Run from the repository root so `agent` is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(os.path.dirname(current_dir))
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Run code under -X importtime and return cumulative microseconds per module."""
+    env = {**os.environ, "PYTHONPATH": repo_root}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def best_of(module: str, runs: int) -> tuple[int, dict[str, int]]:
+    best, best_times = None, {}
+    for _ in range(runs):
+        times = import_times(f"import {module}")
+        total = times.get(module, 0)
+        if best is None or total < best:
+            best, best_times = total, times
+    return best or 0, best_times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"Cold import time (best of {runs})")
+    heaviest = {}
+    for module in ENTRY_POINTS:
+        total, times = best_of(module, runs)
+        if not heaviest:
+            heaviest = times
+        print(f"  {module:<24} {total / 1000:>8.1f} ms")
+
+    print(f"\nHeaviest imports in a fresh `import {ENTRY_POINTS[0]}`")
+    top = sorted(heaviest.items(), key=lambda item: item[1], reverse=True)
+    for module, cumulative in top[1 : TOP_IMPORTS + 1]:
+        print(f"  {module:<40} {cumulative / 1000:>8.1f} ms")
+
+    # Deferred work: first get_app() call imports langgraph and compiles
+    code = (
+        "import time; t = time.perf_counter(); "
+        "from agent.graph import get_app; get_app(); "
+        "print(time.perf_counter() - t)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=repo_root,
+        env={**os.environ, "PYTHONPATH": repo_root},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode == 0:
+        print(
+            f"\nFirst get_app() (import + compile): {float(result.stdout) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark state growth over a long review loop.
+
+Compares the AgentState reducer channels (nodes return deltas) against the
+old pattern of returning `state["messages"] + [...]` on every step. Prints
+the serialized size of each step's update and the average time per step,
+per block of iterations, so the two can be compared as the run grows.
+
+Usage: python scripts/bench_state_growth.py [steps]
+"""
+
+import os
+import sys
+import time
+import pickle
+from typing import List, TypedDict
+
+# Add parent directory to path to allow imports from agent package
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.append(parent_dir)
+
+from langgraph.graph import StateGraph, END  # noqa: E402
+from agent.state import AgentState, ReviewFeedback  # noqa: E402
+
+BLOCK = 100
+
+
+class CopyingState(TypedDict):
+    """Same channels as AgentState but without reducers (last write wins)."""
+
+    iteration_count: int
+    messages: List[str]
+    review_feedback: List[ReviewFeedback]
+
+
+def _feedback(i: int) -> ReviewFeedback:
+    return ReviewFeedback(
+        agent="security", approved=False, concerns=[f"concern {i}"], suggestions=[]
+    )
+
+
+def delta_step(state: AgentState) -> dict:
+    i = state["iteration_count"] + 1
+    return {
+        "iteration_count": i,
+        "messages": [f"step {i}"],
+        "review_feedback": [_feedback(i)],
+    }
+
+
+def copying_step(state: CopyingState) -> dict:
+    i = state["iteration_count"] + 1
+    return {
+        "iteration_count": i,
+        "messages": state.get("messages", []) + [f"step {i}"],
+        "review_feedback": state.get("review_feedback", []) + [_feedback(i)],
+    }
+
+
+def build(state_type, step, steps: int):
+    workflow = StateGraph(state_type)
+    workflow.add_node("step", step)
+    workflow.set_entry_point("step")
+    workflow.add_conditional_edges(
+        "step",
+        lambda state: "end" if state["iteration_count"] >= steps else "step",
+        {"step": "step", "end": END},
+    )
+    return workflow.compile()
+
+
+def run(label: str, graph, steps: int):
+    initial = {"iteration_count": 0, "messages": [], "review_feedback": []}
+    sizes, timings = [], []
+    last = time.perf_counter()
+
+    for update in graph.stream(
+        initial, {"recursion_limit": steps + 10}, stream_mode="updates"
+    ):
+        now = time.perf_counter()
+        timings.append(now - last)
+        sizes.append(len(pickle.dumps(update)))
+        last = now
+
+    print(f"\n{label}")
+    print(f"  {'steps':>11}  {'update bytes':>12}  {'ms/step':>8}")
+    for start in range(0, len(sizes), BLOCK):
+        block_sizes = sizes[start : start + BLOCK]
+        block_times = timings[start : start + BLOCK]
+        print(
+            f"  {start + 1:>5}-{start + len(block_sizes):<5}"
+            f"  {sum(block_sizes) / len(block_sizes):>12.0f}"
+            f"  {1000 * sum(block_times) / len(block_times):>8.3f}"
+        )
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    run("Reducer channels (delta updates)", build(AgentState, delta_step, steps), steps)
+    run("Copying updates (legacy)", build(CopyingState, copying_step, steps), steps)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from typing import TypedDict, Literal, List, Optional, Any
+import operator
+from typing import Annotated, TypedDict, Literal, List, Optional, Any
 from pydantic import BaseModel
 
 
@@ -32,12 +33,48 @@ class WorkItem(BaseModel):
     status: Literal["pending", "in_progress", "completed", "failed"] = "pending"
 
 
+def add_review_feedback(
+    existing: List[ReviewFeedback], new: List[ReviewFeedback]
+) -> List[ReviewFeedback]:
+    """Reducer for review_feedback.
+
+    Reviewers return only their own feedback, which is appended so reviewers
+    running in parallel don't overwrite each other. Writing an empty list
+    starts a new review round.
+    """
+    if not new:
+        return []
+    return (existing or []) + new
+
+
+def merge_work_items(existing: List[Any], new: List[Any]) -> List[Any]:
+    """Reducer for work_items.
+
+    Items are keyed by type, so each work item running in parallel reports
+    only its own item and updates replace the matching entry in place.
+    """
+    merged = list(existing or [])
+    positions = {_item_type(item): i for i, item in enumerate(merged)}
+    for item in new or []:
+        position = positions.get(_item_type(item))
+        if position is None:
+            positions[_item_type(item)] = len(merged)
+            merged.append(item)
+        else:
+            merged[position] = item
+    return merged
+
+
+def _item_type(item: Any) -> str:
+    return item.get("type") if isinstance(item, dict) else item.type
+
+
 class AgentState(TypedDict):
     """Shared state across all agents in the graph."""
 
     task_description: str
     current_contract: Optional[str]
-    review_feedback: List[ReviewFeedback]
+    review_feedback: Annotated[List[ReviewFeedback], add_review_feedback]
     iteration_count: int
     status: Literal[
         "drafting",
@@ -56,7 +93,8 @@ class AgentState(TypedDict):
         "awaiting_technical_review",
         "awaiting_prd_review",
     ]
-    messages: List[str]
+    # Append-only: nodes return just their new messages
+    messages: Annotated[List[str], operator.add]
     # Phase 2: Linear integration
     current_issue: Optional[Any]
     pr_url: Optional[str]
@@ -66,10 +104,11 @@ class AgentState(TypedDict):
     # Request classification
     request_type: Optional[Literal["requires_contract", "infrastructure", "general"]]
     # Phase 3: Stacked PRs
-    work_items: Optional[List[Any]]
-    current_work_index: Optional[int]
+    work_items: Annotated[Optional[List[Any]], merge_work_items]
     current_work_item: Optional[Any]
     stack_base_branch: Optional[str]
+    # Checkout the current work item is implemented and published in
+    workspace_path: Optional[str]
     # Phase 3: Ephemeral environments
     ephemeral_status: Optional[str]
     preview_url: Optional[str]
@@ -91,3 +130,10 @@ class AgentState(TypedDict):
     technical_spec: Optional[Any]
     # Workflow phase (prd, erd, implement)
     workflow_phase: Optional[Literal["prd", "erd", "implement"]]
+
+
+class WorkItemOutput(TypedDict):
+    """What a work item run reports back to the parent graph."""
+
+    work_items: Annotated[Optional[List[Any]], merge_work_items]
+    messages: Annotated[List[str], operator.add]
@@ -0,0 +1,61 @@
+"""Job queue deduplication, lease and retry behaviour on a scratch database."""
+
+import pytest
+
+from agent.adapters.linear_adapter import LinearIssue
+from agent.job_queue import JobQueue
+
+
+def make_issue(priority: int = 3, updated_at: str = "2026-01-01T00:00:00Z"):
+    return LinearIssue(
+        id="issue-1",
+        identifier="ENG-1",
+        title="Add appointment reminders",
+        description=None,
+        state="AI: Create PRD",
+        priority=priority,
+        updated_at=updated_at,
+    )
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return JobQueue(path=str(tmp_path / "jobs.sqlite"), worker_id="test-worker")
+
+
+def test_enqueue_deduplicates_pending_jobs(jobs):
+    assert jobs.enqueue(make_issue(), {"phase": "prd"})
+    assert not jobs.enqueue(make_issue(), {"phase": "prd"})
+    assert jobs.stats() == {"queued": 1}
+
+
+def test_enqueue_refreshes_job_still_queued(jobs):
+    jobs.enqueue(make_issue(priority=3), {"phase": "prd"})
+    moved = make_issue(priority=1).model_copy(update={"state": "AI: Implement"})
+    jobs.enqueue(moved, {"phase": "implement"})
+
+    job = jobs.lease()
+    assert job.phase_info == {"phase": "implement"}
+    assert job.issue.state == "AI: Implement"
+    assert job.issue.priority == 1
+
+
+def test_enqueue_leaves_leased_job_alone(jobs):
+    jobs.enqueue(make_issue(), {"phase": "prd"})
+    jobs.lease()
+    assert not jobs.enqueue(make_issue(), {"phase": "implement"})
+    assert jobs.lease() is None
+
+
+def test_failed_job_is_retried_then_dead(jobs, monkeypatch):
+    monkeypatch.setattr("agent.job_queue.MAX_ATTEMPTS", 2)
+    jobs.enqueue(make_issue(), {"phase": "prd"})
+
+    jobs.lease()
+    assert jobs.fail("issue-1", "timeout") is not None
+    assert jobs.stats() == {"queued": 1}
+
+    monkeypatch.setattr("agent.job_queue.time.time", lambda: 10**12)
+    assert jobs.lease().attempts == 2
+    assert jobs.fail("issue-1", "timeout") is None
+    assert jobs.stats() == {"dead": 1}
@@ -0,0 +1,200 @@
+"""Replays recorded Linear and GitHub webhook deliveries through agent.webhooks."""
+
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import pytest
+
+from agent import webhooks
+from agent.adapters.linear_adapter import LinearIssue
+from agent.webhooks import (
+    SignatureError,
+    handle_webhook,
+    parse_github_event,
+    parse_linear_event,
+    verify_signature,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+SECRET = "test-webhook-secret"
+
+
+def load_body(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+def load_payload(name: str) -> dict:
+    return json.loads(load_body(name))
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def secrets(monkeypatch):
+    monkeypatch.setattr(webhooks, "LINEAR_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(webhooks, "GITHUB_WEBHOOK_SECRET", SECRET)
+
+
+# --- Signatures -------------------------------------------------------------
+
+
+def test_verify_signature_accepts_matching_digest():
+    body = load_body("linear_issue_moved.json")
+    verify_signature(SECRET, body, sign(body))
+    verify_signature(SECRET, body, f"sha256={sign(body)}")
+
+
+def test_verify_signature_rejects_wrong_digest():
+    body = load_body("linear_issue_moved.json")
+    with pytest.raises(SignatureError):
+        verify_signature(SECRET, body, sign(body, "other-secret"))
+    with pytest.raises(SignatureError):
+        verify_signature(SECRET, body, "")
+
+
+def test_verify_signature_rejects_when_secret_unset():
+    body = load_body("linear_issue_moved.json")
+    with pytest.raises(SignatureError):
+        verify_signature(None, body, sign(body))
+
+
+def test_handle_webhook_rejects_tampered_body(secrets):
+    body = load_body("linear_issue_moved.json")
+    signature = sign(body)
+    tampered = body.replace(b"Add appointment reminders", b"Run rm -rf /")
+    with pytest.raises(SignatureError):
+        handle_webhook("linear", {"Linear-Signature": signature}, tampered)
+
+
+@pytest.mark.parametrize("body", [b"[1, 2]", b'"text"', b"null"])
+def test_handle_webhook_rejects_non_object_body(secrets, body):
+    with pytest.raises(ValueError):
+        handle_webhook("linear", {"Linear-Signature": sign(body)}, body)
+    with pytest.raises(ValueError):
+        handle_webhook(
+            "github",
+            {"X-GitHub-Event": "pull_request", "X-Hub-Signature-256": sign(body)},
+            body,
+        )
+
+
+def test_handle_webhook_rejects_source_without_secret(monkeypatch):
+    monkeypatch.setattr(webhooks, "LINEAR_WEBHOOK_SECRET", None)
+    body = load_body("linear_issue_moved.json")
+    with pytest.raises(SignatureError):
+        handle_webhook("linear", {"Linear-Signature": sign(body)}, body)
+
+
+def test_start_webhook_server_refuses_without_secrets(monkeypatch):
+    monkeypatch.setattr(webhooks, "LINEAR_WEBHOOK_SECRET", None)
+    monkeypatch.setattr(webhooks, "GITHUB_WEBHOOK_SECRET", None)
+    with pytest.raises(ValueError):
+        webhooks.start_webhook_server(port=0)
+
+
+# --- Linear -----------------------------------------------------------------
+
+
+def test_linear_state_change_yields_issue_state_event(secrets):
+    body = load_body("linear_issue_moved.json")
+    events = handle_webhook("linear", {"linear-signature": sign(body)}, body)
+
+    assert len(events) == 1
+    event = events[0]
+    assert event.kind == "issue_state"
+    assert event.issue_id == "8f6a1c2e-7b3d-4e59-a1f0-2d9c4b7e6a01"
+    assert event.state_name == "AI: Implement"
+
+
+def test_linear_edit_without_state_change_is_ignored():
+    assert parse_linear_event(load_payload("linear_issue_edited.json")) == []
+
+
+def test_linear_created_issue_yields_event():
+    events = parse_linear_event(load_payload("linear_issue_created.json"))
+    assert [e.state_name for e in events] == ["AI: Create PRD"]
+
+
+def test_linear_non_issue_payload_is_ignored():
+    assert parse_linear_event(load_payload("linear_comment_created.json")) == []
+
+
+# --- GitHub -----------------------------------------------------------------
+
+
+def test_github_merged_pr_yields_pr_merged_event(secrets):
+    body = load_body("github_pr_merged.json")
+    headers = {
+        "X-GitHub-Event": "pull_request",
+        "X-Hub-Signature-256": f"sha256={sign(body)}",
+    }
+    events = handle_webhook("github", headers, body)
+
+    assert len(events) == 1
+    assert events[0].kind == "pr_merged"
+    assert events[0].pr_url == "https://github.com/acme/clinic/pull/87"
+
+
+def test_github_closed_unmerged_pr_is_ignored():
+    payload = load_payload("github_pr_closed_unmerged.json")
+    assert parse_github_event("pull_request", payload) == []
+
+
+def test_github_other_event_types_are_ignored():
+    payload = load_payload("github_pr_merged.json")
+    assert parse_github_event("push", payload) == []
+
+
+# --- Dispatch ---------------------------------------------------------------
+
+
+class FakeAdapter:
+    """Serves issues by ID like LinearAdapter.get_issue_by_id."""
+
+    def __init__(self, issues: dict):
+        self.issues = issues
+
+    def get_issue_by_id(self, issue_id: str):
+        return self.issues.get(issue_id)
+
+
+def _linear_issue(state: str) -> LinearIssue:
+    return LinearIssue(
+        id="8f6a1c2e-7b3d-4e59-a1f0-2d9c4b7e6a01",
+        identifier="ENG-142",
+        title="Add appointment reminders",
+        description="Send SMS reminders 24h before appointments.",
+        state=state,
+        priority=2,
+        parent_id="c41d7e90-3a55-4b1e-8f2a-6e0b9d3c5f12",
+    )
+
+
+@pytest.mark.parametrize(
+    "linear_state, submitted", [("AI: Implement", True), ("Backlog", False)]
+)
+def test_dispatch_uses_issue_fetched_from_linear(monkeypatch, linear_state, submitted):
+    from agent import poll
+
+    calls = []
+    monkeypatch.setattr(
+        poll,
+        "submit_issue",
+        lambda issue, adapter, phase_info: calls.append((issue, phase_info)) or True,
+    )
+    fetched = _linear_issue(linear_state)
+    adapter = FakeAdapter({fetched.id: fetched})
+
+    (event,) = parse_linear_event(load_payload("linear_issue_moved.json"))
+    poll.dispatch_event(event, adapter)
+
+    if submitted:
+        ((issue, phase_info),) = calls
+        assert issue is fetched
+        assert phase_info["phase"] == "implement"
+    else:
+        assert calls == []
@@ -1,35 +1,28 @@
-"""Claude Code CLI wrapper for headless mode execution."""
+"""Claude Code CLI wrapper for headless mode execution.
 
+These are the process-level primitives; nodes run Claude Code through the
+shared pool in agent.tools.claude_pool, which bounds concurrency.
+"""
+
+import asyncio
 import subprocess
+import threading
 import json
 import logging
+import time
+from typing import AsyncIterator, Callable, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
 
-def run_claude_code(
-    prompt: str,
-    working_dir: str = ".",
-    allowed_tools: list[str] | None = None,
-    output_format: str = "text",
-    timeout: int = 300,
-) -> dict:
-    """Execute Claude Code CLI in headless mode.
-
-    Args:
-        prompt: The task prompt to send to Claude Code.
-        working_dir: Directory to run the command in.
-        allowed_tools: List of tools to auto-approve (Read, Edit, Write, Bash).
-        output_format: Output format - 'json', 'text', or 'stream-json'.
-        timeout: Command timeout in seconds.
-
-    Returns:
-        dict with 'result', 'error', and optionally 'metadata' keys.
-    """
+def _build_command(
+    prompt: str, allowed_tools: list[str] | None, output_format: str
+) -> list[str]:
+    """Build the Claude Code CLI argument list."""
     if allowed_tools is None:
         allowed_tools = ["Read"]
 
-    cmd = [
+    return [
         "claude",
         "-p",
         prompt,
@@ -39,54 +32,14 @@ def run_claude_code(
         output_format,
     ]
 
-    logger.info(f"Running Claude Code CLI: {' '.join(cmd[:3])}...")
 
-    try:
-        result = subprocess.run(
-            cmd, cwd=working_dir, capture_output=True, text=True, timeout=timeout
-        )
-
-        if result.returncode != 0:
-            logger.warning(f"Claude Code exited with code {result.returncode}")
-            if result.stderr:
-                logger.error(f"Claude Code stderr: {result.stderr}")
-            if result.stdout:
-                logger.error(f"Claude Code stdout: {result.stdout}")
-            return {
-                "result": None,
-                "error": result.stderr or f"Exit code: {result.returncode}",
-                "stdout": result.stdout,
-            }
-
-        if output_format == "json":
-            try:
-                parsed = json.loads(result.stdout)
-                return {
-                    "result": parsed.get("result", result.stdout),
-                    "error": None,
-                    "metadata": parsed.get("metadata", {}),
-                }
-            except json.JSONDecodeError:
-                # Claude Code may return plain text even with --output-format json
-                return {"result": result.stdout, "error": None}
-
-        return {
-            "result": result.stdout,
-            "error": result.stderr if result.stderr else None,
-        }
+CLI_NOT_FOUND_ERROR = (
+    "Claude Code CLI not found. Install with: npm install -g @anthropic-ai/claude-code"
+)
 
-    except subprocess.TimeoutExpired:
-        logger.error(f"Claude Code timed out after {timeout}s")
-        return {"result": None, "error": f"Command timed out after {timeout} seconds"}
-    except FileNotFoundError:
-        logger.error("Claude Code CLI not found - ensure it's installed")
-        return {
-            "result": None,
-            "error": "Claude Code CLI not found. Install with: npm install -g @anthropic-ai/claude-code",
-        }
-    except Exception as e:
-        logger.error(f"Claude Code error: {e}")
-        return {"result": None, "error": str(e)}
+# A single stream-json line carries a whole tool result or file, far beyond
+# asyncio's default 64 KB StreamReader limit
+STREAM_LINE_LIMIT = 16 * 1024 * 1024
 
 
 def extract_json_from_response(response: str) -> dict | None:
@@ -110,3 +63,264 @@ def extract_json_from_response(response: str) -> dict | None:
                 pass
 
     return None
+
+
+# --- Streaming (--output-format stream-json) ---------------------------------
+
+
+def _parse_event(line: str) -> dict | None:
+    """Parse one stream-json line; non-JSON output becomes a 'log' event."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        event = json.loads(line)
+    except json.JSONDecodeError:
+        return {"type": "log", "text": line}
+    return event if isinstance(event, dict) else None
+
+
+def is_fatal_event(event: dict) -> bool:
+    """Whether an event means the run cannot succeed and should be cancelled.
+
+    Covers API/auth failures reported on assistant messages, explicit error
+    events and error results.
+    """
+    if event.get("type") == "error":
+        return True
+    if event.get("type") == "assistant" and event.get("error"):
+        return True
+    return event.get("type") == "result" and bool(event.get("is_error"))
+
+
+def describe_event(event: dict) -> list[str]:
+    """Human-readable progress lines for tool use in an assistant event."""
+    if event.get("type") != "assistant":
+        return []
+
+    lines = []
+    for block in (event.get("message") or {}).get("content") or []:
+        if block.get("type") != "tool_use":
+            continue
+        tool_input = block.get("input") or {}
+        target = (
+            tool_input.get("file_path")
+            or tool_input.get("path")
+            or tool_input.get("pattern")
+            or tool_input.get("command")
+            or ""
+        )
+        lines.append(f"{block.get('name', 'tool')}: {str(target)[:100]}".rstrip(": "))
+    return lines
+
+
+def _error_event(message: str, subtype: str = "error") -> dict:
+    return {"type": "error", "subtype": subtype, "error": message}
+
+
+def stream_claude_code(
+    prompt: str,
+    working_dir: str = ".",
+    allowed_tools: list[str] | None = None,
+    timeout: int = 300,
+) -> Iterator[dict]:
+    """Run Claude Code with stream-json output, yielding events as they arrive.
+
+    The process is killed as soon as a fatal event is seen, when the timeout
+    expires, or when the caller stops iterating. Failures that produce no
+    stream-json error are reported as a final {"type": "error"} event.
+
+    Args:
+        prompt: The task prompt to send to Claude Code.
+        working_dir: Directory to run the command in.
+        allowed_tools: List of tools to auto-approve (Read, Edit, Write, Bash).
+        timeout: Seconds before the run is cancelled.
+
+    Yields:
+        Parsed stream-json events (system, assistant, user, result, ...).
+    """
+    # stream-json requires --verbose in print mode
+    cmd = _build_command(prompt, allowed_tools, "stream-json") + ["--verbose"]
+    logger.info(f"Streaming Claude Code CLI: {' '.join(cmd[:3])}...")
+
+    try:
+        process = subprocess.Popen(
+            cmd,
+            cwd=working_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except FileNotFoundError:
+        logger.error("Claude Code CLI not found - ensure it's installed")
+        yield _error_event(CLI_NOT_FOUND_ERROR, "not_found")
+        return
+    except Exception as e:
+        # e.g. OSError E2BIG when the prompt exceeds the argument size limit
+        logger.error(f"Claude Code error: {e}")
+        yield _error_event(str(e))
+        return
+
+    # Drain stderr on a thread so a chatty CLI can't block on a full pipe
+    stderr_lines: list[str] = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_lines.extend(process.stderr), daemon=True
+    )
+    stderr_reader.start()
+
+    timed_out = threading.Event()
+
+    def cancel():
+        timed_out.set()
+        process.kill()
+
+    watchdog = threading.Timer(timeout, cancel)
+    watchdog.start()
+
+    finished = False
+    try:
+        for line in process.stdout:
+            event = _parse_event(line)
+            if event is None:
+                continue
+            yield event
+            if event.get("type") == "result":
+                finished = True
+            if is_fatal_event(event):
+                logger.error(f"Claude Code fatal event, cancelling: {event}")
+                finished = True
+                break
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        stderr_reader.join(timeout=1)
+
+    if timed_out.is_set():
+        logger.error(f"Claude Code timed out after {timeout}s")
+        yield _error_event(f"Command timed out after {timeout} seconds", "timeout")
+    elif not finished and process.returncode != 0:
+        stderr = "".join(stderr_lines).strip()
+        logger.error(f"Claude Code exited with code {process.returncode}: {stderr}")
+        yield _error_event(stderr or f"Exit code: {process.returncode}")
+
+
+async def astream_claude_code(
+    prompt: str,
+    working_dir: str = ".",
+    allowed_tools: list[str] | None = None,
+    timeout: int = 300,
+) -> AsyncIterator[dict]:
+    """Async variant of stream_claude_code."""
+    cmd = _build_command(prompt, allowed_tools, "stream-json") + ["--verbose"]
+    logger.info(f"Streaming Claude Code CLI (async): {' '.join(cmd[:3])}...")
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=working_dir,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LINE_LIMIT,
+        )
+    except FileNotFoundError:
+        logger.error("Claude Code CLI not found - ensure it's installed")
+        yield _error_event(CLI_NOT_FOUND_ERROR, "not_found")
+        return
+    except Exception as e:
+        # e.g. OSError E2BIG when the prompt exceeds the argument size limit
+        logger.error(f"Claude Code error: {e}")
+        yield _error_event(str(e))
+        return
+
+    stderr_task = asyncio.create_task(process.stderr.read())
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    finished = False
+    read_error = None
+
+    try:
+        while True:
+            try:
+                line = await asyncio.wait_for(
+                    process.stdout.readline(), max(0.0, deadline - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+                break
+            except ValueError as e:
+                # Line longer than STREAM_LINE_LIMIT
+                read_error = str(e)
+                break
+            if not line:
+                break
+            event = _parse_event(line.decode())
+            if event is None:
+                continue
+            yield event
+            if event.get("type") == "result":
+                finished = True
+            if is_fatal_event(event):
+                logger.error(f"Claude Code fatal event, cancelling: {event}")
+                finished = True
+                break
+    finally:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+        stderr = (await stderr_task).decode()
+
+    if timed_out:
+        logger.error(f"Claude Code timed out after {timeout}s")
+        yield _error_event(f"Command timed out after {timeout} seconds", "timeout")
+    elif read_error and not finished:
+        logger.error(f"Claude Code output could not be read: {read_error}")
+        yield _error_event(read_error)
+    elif not finished and process.returncode != 0:
+        logger.error(f"Claude Code exited with code {process.returncode}: {stderr}")
+        yield _error_event(stderr.strip() or f"Exit code: {process.returncode}")
+
+
+class StreamResult:
+    """Folds stream-json events into a result dict (result, error, metadata)."""
+
+    def __init__(self, on_progress: Optional[Callable[[str], None]]):
+        self.on_progress = on_progress
+        self.result: dict = {"result": None, "error": "No result event received"}
+        # ok, error, timeout or not_found
+        self.status = "error"
+
+    def feed(self, event: dict):
+        for line in describe_event(event):
+            logger.info(f"Claude Code: {line}")
+            if self.on_progress:
+                self.on_progress(line)
+
+        if event.get("type") == "result":
+            metadata = {
+                key: event[key]
+                for key in ("total_cost_usd", "duration_ms", "num_turns", "session_id")
+                if key in event
+            }
+            if event.get("is_error"):
+                error = event.get("result") or event.get("subtype") or "Run failed"
+                self.result = {"result": None, "error": error, "metadata": metadata}
+                self.status = "error"
+            else:
+                self.status = "ok"
+                self.result = {
+                    "result": event.get("result", ""),
+                    "error": None,
+                    "metadata": metadata,
+                }
+        elif is_fatal_event(event):
+            error = event.get("error") or event.get("text") or "Fatal error"
+            self.result = {"result": None, "error": str(error)}
+            self.status = (
+                event["subtype"]
+                if event.get("subtype") in {"timeout", "not_found"}
+                else "error"
+            )
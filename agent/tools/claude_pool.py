@@ -0,0 +1,274 @@
+"""Shared execution service for Claude Code CLI runs.
+
+Every node that shells out to Claude Code goes through the one pool here, so
+the number of concurrent CLI processes on the host is bounded no matter how
+many issues are being worked at once. Runs waiting for a slot are served by
+Linear issue priority (Urgent first), each run gets a wall-clock and token
+budget, and per-run metrics (queue wait, run time, exit status, tokens) are
+kept for reporting.
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+import threading
+from collections import Counter, deque
+from contextlib import aclosing, closing
+from typing import Callable, Optional
+from pydantic import BaseModel
+from agent.tools.claude_code import (
+    StreamResult,
+    astream_claude_code,
+    stream_claude_code,
+)
+
+logger = logging.getLogger(__name__)
+
+CLAUDE_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "2"))
+CLAUDE_TIMEOUT = int(os.getenv("CLAUDE_TIMEOUT", "300"))
+# Per-run token budget (input + output); 0 disables the check
+CLAUDE_MAX_TOKENS = int(os.getenv("CLAUDE_MAX_TOKENS", "0"))
+
+# Linear priorities are 1 (Urgent) .. 4 (Low), with 0 meaning "No priority"
+NO_PRIORITY = 5
+
+
+def priority_for(issue) -> int:
+    """Queue priority for a Linear issue (lower runs first)."""
+    priority = getattr(issue, "priority", 0) or 0
+    return priority if 1 <= priority <= 4 else NO_PRIORITY
+
+
+class ClaudeRunMetrics(BaseModel):
+    """Measurements for one Claude Code run."""
+
+    priority: int
+    queue_wait: float
+    run_time: float
+    status: str  # ok, error, timeout, budget, not_found
+    tokens: int
+
+
+class _TokenMeter:
+    """Counts tokens from stream-json usage blocks."""
+
+    def __init__(self):
+        self.tokens = 0
+        self._seen: set[str] = set()
+
+    def feed(self, event: dict):
+        if event.get("type") == "assistant":
+            message = event.get("message") or {}
+            # Each content block arrives as its own event with the same usage
+            if message.get("id") in self._seen:
+                return
+            self._seen.add(message.get("id"))
+            self.tokens += _usage_tokens(message.get("usage"))
+        elif event.get("type") == "result" and event.get("usage"):
+            # Final totals are authoritative
+            self.tokens = _usage_tokens(event["usage"])
+
+
+def _usage_tokens(usage: Optional[dict]) -> int:
+    if not usage:
+        return 0
+    return (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+
+
+class ClaudeCodePool:
+    """Bounded, priority-ordered executor for Claude Code CLI runs.
+
+    Usable from worker threads (run) and from the event loop (arun); both
+    draw from the same slots.
+    """
+
+    def __init__(self, max_concurrency: int = CLAUDE_MAX_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self._lock = threading.Lock()
+        self._running = 0
+        # (priority, seq, wake) - seq keeps equal priorities first-come first-served
+        self._waiters: list[tuple[int, int, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._runs: deque[ClaudeRunMetrics] = deque(maxlen=500)
+        self._statuses: Counter = Counter()
+
+    # --- Slots -----------------------------------------------------------
+
+    def _try_acquire(self, priority: int, wake: Callable[[], None]) -> bool:
+        """Take a free slot, or queue wake() to be called when one is handed over."""
+        with self._lock:
+            if self._running < self.max_concurrency and not self._waiters:
+                self._running += 1
+                return True
+            heapq.heappush(self._waiters, (priority, next(self._seq), wake))
+            return False
+
+    def _release(self):
+        """Hand the slot to the highest-priority waiter, or free it."""
+        with self._lock:
+            if not self._waiters:
+                self._running -= 1
+                return
+            _, _, wake = heapq.heappop(self._waiters)
+        wake()
+
+    def _acquire(self, priority: int):
+        granted = threading.Event()
+        if not self._try_acquire(priority, granted.set):
+            granted.wait()
+
+    async def _aacquire(self, priority: int):
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            # A cancelled waiter passes its slot straight on
+            if granted.cancelled():
+                self._release()
+            else:
+                granted.set_result(None)
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(grant)
+            except RuntimeError:
+                # Loop already closed
+                self._release()
+
+        if not self._try_acquire(priority, wake):
+            await granted
+
+    # --- Runs ------------------------------------------------------------
+
+    def run(
+        self,
+        prompt: str,
+        working_dir: str = ".",
+        allowed_tools: list[str] | None = None,
+        priority: int = NO_PRIORITY,
+        timeout: int = CLAUDE_TIMEOUT,
+        max_tokens: int = CLAUDE_MAX_TOKENS,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Run Claude Code once a slot is free and return its result.
+
+        Args:
+            prompt: The task prompt to send to Claude Code.
+            working_dir: Directory to run the command in.
+            allowed_tools: List of tools to auto-approve (Read, Edit, Write, Bash).
+            priority: Queue priority (see priority_for); lower runs first.
+            timeout: Wall-clock seconds for the run itself (queue wait excluded).
+            max_tokens: Cancel the run once it has used this many tokens (0 = no limit).
+            on_progress: Called with a short description of each tool use.
+
+        Returns:
+            dict with 'result', 'error', optionally 'metadata', and 'run'
+            (ClaudeRunMetrics fields) keys.
+        """
+        queued_at = time.monotonic()
+        self._acquire(priority)
+        started_at = time.monotonic()
+        folded, meter = StreamResult(on_progress), _TokenMeter()
+        try:
+            events = stream_claude_code(prompt, working_dir, allowed_tools, timeout)
+            with closing(events):
+                for event in events:
+                    folded.feed(event)
+                    meter.feed(event)
+                    if _over_budget(meter, max_tokens, folded):
+                        break
+        finally:
+            self._release()
+        return self._finish(folded, meter, priority, queued_at, started_at)
+
+    async def arun(
+        self,
+        prompt: str,
+        working_dir: str = ".",
+        allowed_tools: list[str] | None = None,
+        priority: int = NO_PRIORITY,
+        timeout: int = CLAUDE_TIMEOUT,
+        max_tokens: int = CLAUDE_MAX_TOKENS,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Async variant of run."""
+        queued_at = time.monotonic()
+        await self._aacquire(priority)
+        started_at = time.monotonic()
+        folded, meter = StreamResult(on_progress), _TokenMeter()
+        try:
+            events = astream_claude_code(prompt, working_dir, allowed_tools, timeout)
+            async with aclosing(events):
+                async for event in events:
+                    folded.feed(event)
+                    meter.feed(event)
+                    if _over_budget(meter, max_tokens, folded):
+                        break
+        finally:
+            self._release()
+        return self._finish(folded, meter, priority, queued_at, started_at)
+
+    def _finish(
+        self,
+        folded: StreamResult,
+        meter: _TokenMeter,
+        priority: int,
+        queued_at: float,
+        started_at: float,
+    ) -> dict:
+        metrics = ClaudeRunMetrics(
+            priority=priority,
+            queue_wait=started_at - queued_at,
+            run_time=time.monotonic() - started_at,
+            status=folded.status,
+            tokens=meter.tokens,
+        )
+        with self._lock:
+            self._runs.append(metrics)
+            self._statuses[metrics.status] += 1
+
+        logger.info(
+            f"Claude Code run {metrics.status} in {metrics.run_time:.1f}s "
+            f"(queued {metrics.queue_wait:.1f}s, {metrics.tokens} tokens)"
+        )
+        return {**folded.result, "run": metrics.model_dump()}
+
+    # --- Reporting -------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Slot usage and aggregates over recent runs."""
+        with self._lock:
+            runs = list(self._runs)
+            statuses = dict(self._statuses)
+            running, queued = self._running, len(self._waiters)
+
+        count = len(runs)
+        return {
+            "running": running,
+            "queued": queued,
+            "runs": sum(statuses.values()),
+            "statuses": statuses,
+            "avg_queue_wait": sum(r.queue_wait for r in runs) / count if count else 0.0,
+            "max_queue_wait": max((r.queue_wait for r in runs), default=0.0),
+            "avg_run_time": sum(r.run_time for r in runs) / count if count else 0.0,
+            "tokens": sum(r.tokens for r in runs),
+        }
+
+
+def _over_budget(meter: _TokenMeter, max_tokens: int, folded: StreamResult) -> bool:
+    """Mark the run as over budget once the token limit is exceeded."""
+    if not max_tokens or meter.tokens <= max_tokens or folded.status == "ok":
+        return False
+    logger.error(f"Claude Code exceeded token budget ({meter.tokens} > {max_tokens})")
+    folded.result = {
+        "result": None,
+        "error": f"Token budget exceeded ({meter.tokens} > {max_tokens} tokens)",
+    }
+    folded.status = "budget"
+    return True
+
+
+claude_pool = ClaudeCodePool()
@@ -1,64 +1,121 @@
 import os
 import subprocess
+import httpx
 from typing import Tuple, Optional
+from agent.tools.process import arun_process
 
+VERCEL_NOT_CONFIGURED = "VERCEL_TOKEN or VERCEL_PROJECT not set"
+NEON_NOT_CONFIGURED = "NEON_API_KEY not set"
 
-def deploy_preview(branch: str) -> Tuple[bool, Optional[str]]:
-    """Deploy a preview environment for the branch."""
+
+def _vercel_command(branch: str) -> Optional[list[str]]:
+    """Build the vercel deploy command, or None if Vercel isn't configured."""
     vercel_token = os.getenv("VERCEL_TOKEN")
     vercel_project = os.getenv("VERCEL_PROJECT")
 
     if not vercel_token or not vercel_project:
-        return False, "VERCEL_TOKEN or VERCEL_PROJECT not set"
+        return None
+
+    return [
+        "vercel",
+        "deploy",
+        "--token",
+        vercel_token,
+        "--confirm",
+        "--meta",
+        f"branch={branch}",
+    ]
+
+
+def _vercel_result(
+    returncode: int, stdout: str, stderr: str
+) -> Tuple[bool, Optional[str]]:
+    """Turn a finished vercel deploy into (success, preview URL or error)."""
+    if returncode == 0:
+        preview_url = stdout.strip().split("\n")[-1]
+        return True, preview_url
+
+    return False, stderr
+
+
+def deploy_preview(branch: str) -> Tuple[bool, Optional[str]]:
+    """Deploy a preview environment for the branch."""
+    cmd = _vercel_command(branch)
+    if not cmd:
+        return False, VERCEL_NOT_CONFIGURED
 
     try:
         result = subprocess.run(
-            [
-                "vercel",
-                "deploy",
-                "--token",
-                vercel_token,
-                "--confirm",
-                "--meta",
-                f"branch={branch}",
-            ],
+            cmd,
             capture_output=True,
             text=True,
         )
+        return _vercel_result(result.returncode, result.stdout, result.stderr)
+
+    except Exception as e:
+        return False, str(e)
 
-        if result.returncode == 0:
-            preview_url = result.stdout.strip().split("\n")[-1]
-            return True, preview_url
 
-        return False, result.stderr
+async def adeploy_preview(branch: str) -> Tuple[bool, Optional[str]]:
+    """Async variant of deploy_preview."""
+    cmd = _vercel_command(branch)
+    if not cmd:
+        return False, VERCEL_NOT_CONFIGURED
+
+    try:
+        return _vercel_result(*await arun_process(*cmd))
 
     except Exception as e:
         return False, str(e)
 
 
-def provision_ephemeral_db(branch: str) -> Tuple[bool, Optional[str]]:
-    """Provision an ephemeral database branch using Neon."""
+def _neon_request(branch: str) -> Optional[dict]:
+    """Build the Neon branch-creation request, or None if Neon isn't configured."""
     neon_api_key = os.getenv("NEON_API_KEY")
     neon_project = os.getenv("NEON_PROJECT_ID")
 
     if not neon_api_key:
-        return False, "NEON_API_KEY not set"
+        return None
+
+    return {
+        "url": f"https://console.neon.tech/api/v2/projects/{neon_project}/branches",
+        "headers": {"Authorization": f"Bearer {neon_api_key}"},
+        "json": {"branch": {"name": branch, "parent_id": "main"}},
+    }
+
+
+def _neon_result(response: httpx.Response) -> Tuple[bool, Optional[str]]:
+    """Turn the Neon response into (success, connection string or error)."""
+    if response.status_code == 201:
+        data = response.json()
+        connection_string = data.get("connection_uri", "provisioned")
+        return True, connection_string
+
+    return False, response.text
+
+
+def provision_ephemeral_db(branch: str) -> Tuple[bool, Optional[str]]:
+    """Provision an ephemeral database branch using Neon."""
+    request = _neon_request(branch)
+    if not request:
+        return False, NEON_NOT_CONFIGURED
 
     try:
-        import httpx
+        return _neon_result(httpx.post(**request))
+
+    except Exception as e:
+        return False, str(e)
 
-        response = httpx.post(
-            f"https://console.neon.tech/api/v2/projects/{neon_project}/branches",
-            headers={"Authorization": f"Bearer {neon_api_key}"},
-            json={"branch": {"name": branch, "parent_id": "main"}},
-        )
 
-        if response.status_code == 201:
-            data = response.json()
-            connection_string = data.get("connection_uri", "provisioned")
-            return True, connection_string
+async def aprovision_ephemeral_db(branch: str) -> Tuple[bool, Optional[str]]:
+    """Async variant of provision_ephemeral_db."""
+    request = _neon_request(branch)
+    if not request:
+        return False, NEON_NOT_CONFIGURED
 
-        return False, response.text
+    try:
+        async with httpx.AsyncClient() as client:
+            return _neon_result(await client.post(**request))
 
     except Exception as e:
         return False, str(e)
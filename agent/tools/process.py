@@ -0,0 +1,42 @@
+"""Subprocess helpers for nodes running under app.ainvoke."""
+
+import asyncio
+import subprocess
+from typing import Optional, Tuple
+
+
+async def arun_process(
+    *cmd: str,
+    cwd: str = ".",
+    env: Optional[dict] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[int, str, str]:
+    """Run a command without blocking the event loop.
+
+    Args:
+        cmd: Program and arguments
+        cwd: Working directory
+        env: Environment for the child process (inherits when None)
+        timeout: Seconds before the process is killed
+
+    Returns:
+        (returncode, stdout, stderr)
+
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeds the timeout,
+            matching subprocess.run so callers can share error handling
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(list(cmd), timeout)
+    return process.returncode, stdout.decode(), stderr.decode()
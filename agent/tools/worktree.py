@@ -0,0 +1,193 @@
+"""Git worktree manager - one isolated checkout per issue/work item.
+
+Claude Code sessions that edit code each get their own `git worktree` of the
+target repository, so several sub-issues can be implemented at once without
+fighting over a single checked-out branch. Worktrees share the repository's
+object store, so creating one only writes the checked-out files.
+"""
+
+import os
+import re
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+from agent.config.storage import DATA_DIR
+from agent.tools.git import run_git
+
+logger = logging.getLogger(__name__)
+
+# Repository the factory works on, and where its worktrees are created
+REPO_PATH = os.getenv("FACTORY_REPO_PATH", ".")
+WORKTREE_ROOT = Path(os.getenv("FACTORY_WORKTREE_ROOT", DATA_DIR / "worktrees"))
+
+
+def worktree_key(issue_identifier: str, work_type: Optional[str] = None) -> str:
+    """Stable directory name for an issue (and optionally one of its work items)."""
+    key = issue_identifier.lower()
+    if work_type:
+        key = f"{key}-{work_type.lower()}"
+    return re.sub(r"[^a-z0-9._-]+", "-", key)
+
+
+def issue_branch(issue_identifier: str, work_type: Optional[str] = None) -> str:
+    """Branch an issue (or one of its stacked work items) is implemented on."""
+    branch = f"ai/{issue_identifier.lower()}"
+    if work_type:
+        branch = f"{branch}/{work_type.lower()}"
+    return branch
+
+
+class WorktreeManager:
+    """Creates, reuses and removes worktrees under WORKTREE_ROOT."""
+
+    def __init__(self, repo_path: str = REPO_PATH, root: Optional[Path] = None):
+        self.repo_path = repo_path
+        self.root = Path(root or WORKTREE_ROOT).resolve()
+        # git serializes worktree metadata with lock files; serialize here too
+        # so concurrent sessions queue instead of failing
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key
+
+    def _branch_exists(self, branch: str) -> bool:
+        """Whether branch exists locally or on origin (worktree add tracks it)."""
+        for ref in (f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"):
+            exists, _ = run_git(
+                "rev-parse", "--verify", "--quiet", ref, cwd=self.repo_path
+            )
+            if exists:
+                return True
+        return False
+
+    def acquire(
+        self, key: str, branch: Optional[str], base: str = "main"
+    ) -> Tuple[bool, str]:
+        """Get the worktree for key, creating it on branch if needed.
+
+        An existing worktree is reused as-is, so a resumed run continues with
+        the files a previous session left behind.
+
+        Args:
+            key: Worktree name (see worktree_key)
+            branch: Branch to check out; created from <base> if missing
+                (preferring origin/<base>). None checks out <base> detached,
+                for read-only use.
+            base: Base branch for new branches
+
+        Returns:
+            (success, worktree path or error message)
+        """
+        path = self.path_for(key)
+
+        with self._lock:
+            if (path / ".git").exists():
+                return True, str(path)
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            # Drop registrations of worktrees whose directory was deleted
+            run_git("worktree", "prune", cwd=self.repo_path)
+            run_git("fetch", "origin", cwd=self.repo_path)
+
+            exists, _ = run_git(
+                "rev-parse",
+                "--verify",
+                "--quiet",
+                f"refs/remotes/origin/{base}",
+                cwd=self.repo_path,
+            )
+            start = f"origin/{base}" if exists else base
+
+            if branch is None:
+                success, output = run_git(
+                    "worktree", "add", "--detach", str(path), start, cwd=self.repo_path
+                )
+            elif self._branch_exists(branch):
+                success, output = run_git(
+                    "worktree", "add", str(path), branch, cwd=self.repo_path
+                )
+            else:
+                success, output = run_git(
+                    "worktree",
+                    "add",
+                    "-b",
+                    branch,
+                    str(path),
+                    start,
+                    cwd=self.repo_path,
+                )
+
+        if not success:
+            logger.error(f"Failed to create worktree {key}: {output}")
+            return False, output
+
+        logger.info(f"Created worktree {path} on {branch}")
+        return True, str(path)
+
+    def release(self, key: str) -> bool:
+        """Remove a worktree (uncommitted changes in it are discarded)."""
+        path = self.path_for(key)
+        with self._lock:
+            if not path.exists():
+                return True
+            success, output = run_git(
+                "worktree", "remove", "--force", str(path), cwd=self.repo_path
+            )
+            if not success:
+                # Not a registered worktree anymore - just delete the directory
+                logger.warning(f"git worktree remove failed for {key}: {output}")
+                shutil.rmtree(path, ignore_errors=True)
+                run_git("worktree", "prune", cwd=self.repo_path)
+        logger.info(f"Removed worktree {path}")
+        return True
+
+    def release_issue(self, issue_identifier: str):
+        """Remove every worktree that belongs to an issue."""
+        prefix = worktree_key(issue_identifier)
+        if not self.root.exists():
+            return
+        for path in self.root.iterdir():
+            if path.name == prefix or path.name.startswith(f"{prefix}-"):
+                self.release(path.name)
+
+
+worktrees = WorktreeManager()
+
+
+def workspace_for(
+    state: dict, work_type: Optional[str] = None, read_only: bool = False
+) -> Tuple[bool, str]:
+    """Get the checkout a node should work in for the current issue.
+
+    The workspace_path already in state wins while it exists. Otherwise the
+    issue (or its work item) gets its own worktree on its branch, so several
+    issues can be planned, implemented and published on one host at once.
+    Without an issue (CLI runs) the current directory is used.
+
+    Args:
+        state: The node's AgentState
+        work_type: Stacked work item type, for a worktree per work item
+        read_only: Check out the base branch detached instead of the
+            issue's branch (planning)
+
+    Returns:
+        (success, workspace path or error message)
+    """
+    workspace = state.get("workspace_path")
+    if workspace and Path(workspace).exists():
+        return True, workspace
+
+    issue = state.get("current_issue")
+    if not issue:
+        return True, "."
+
+    base = state.get("stack_base_branch") or "main"
+    if read_only:
+        return worktrees.acquire(worktree_key(issue.identifier, "plan"), None, base)
+    return worktrees.acquire(
+        worktree_key(issue.identifier, work_type),
+        issue_branch(issue.identifier, work_type),
+        base,
+    )
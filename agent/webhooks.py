@@ -0,0 +1,238 @@
+"""Webhook receiver for Linear issue and GitHub pull request events.
+
+Incoming deliveries are verified, parsed into WebhookEvent objects and pushed
+onto an in-process queue that poll.py drains through the same process_issue
+path used by polling. Parsing is pure (no network), so recorded payloads can be
+replayed with handle_webhook() or `python -m agent.webhooks replay`.
+
+Deliveries must be signed: a source whose secret is unset has every delivery
+rejected, and the receiver refuses to start with no secret at all. Events only
+carry IDs - the consumer re-fetches the issue from Linear rather than trusting
+payload fields.
+"""
+
+import os
+import hmac
+import json
+import queue
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Literal, Optional, List
+from pydantic import BaseModel
+
+# Loopback by default - expose it through a reverse proxy or set WEBHOOK_HOST
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8787"))
+
+# Signing secrets - deliveries from a source without one are rejected
+LINEAR_WEBHOOK_SECRET = os.getenv("LINEAR_WEBHOOK_SECRET")
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+
+
+class WebhookEvent(BaseModel):
+    """A unit of work derived from a webhook delivery."""
+
+    source: Literal["linear", "github"]
+    kind: Literal["issue_state", "pr_merged"]
+    issue_id: Optional[str] = None
+    # As reported by the payload - the consumer re-checks it against Linear
+    state_name: Optional[str] = None
+    pr_url: Optional[str] = None
+
+
+# Consumed by poll.py
+events: "queue.Queue[WebhookEvent]" = queue.Queue()
+
+
+class SignatureError(Exception):
+    """Raised when a webhook signature is missing or does not match."""
+
+
+def verify_signature(secret: Optional[str], body: bytes, signature: str) -> None:
+    """Check an HMAC-SHA256 hex signature over the raw request body.
+
+    Args:
+        secret: Shared webhook secret; every delivery is rejected when unset
+        body: Raw request body
+        signature: Hex digest from the request, optionally "sha256=" prefixed
+
+    Raises:
+        SignatureError: If no secret is configured or the signature differs
+    """
+    if not secret:
+        raise SignatureError("Webhook secret not configured")
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    received = signature.removeprefix("sha256=")
+    if not hmac.compare_digest(expected, received):
+        raise SignatureError("Invalid webhook signature")
+
+
+def parse_linear_event(payload: dict) -> List[WebhookEvent]:
+    """Turn a Linear Issue webhook payload into issue_state events.
+
+    Only new issues and updates that changed the issue's state count; other
+    edits (title, description, labels, ...) are ignored.
+    """
+    action = payload.get("action")
+    if payload.get("type") != "Issue" or action not in {"create", "update"}:
+        return []
+    # updatedFrom holds the previous value of every field the update changed
+    if action == "update" and "stateId" not in (payload.get("updatedFrom") or {}):
+        return []
+
+    data = payload.get("data") or {}
+    state_name = (data.get("state") or {}).get("name")
+    if not data.get("id") or not state_name:
+        return []
+
+    return [
+        WebhookEvent(
+            source="linear",
+            kind="issue_state",
+            issue_id=data["id"],
+            state_name=state_name,
+        )
+    ]
+
+
+def parse_github_event(event_type: str, payload: dict) -> List[WebhookEvent]:
+    """Turn a GitHub pull_request webhook payload into pr_merged events."""
+    if event_type != "pull_request" or payload.get("action") != "closed":
+        return []
+
+    pr = payload.get("pull_request") or {}
+    if not pr.get("merged"):
+        return []
+
+    return [WebhookEvent(source="github", kind="pr_merged", pr_url=pr.get("html_url"))]
+
+
+def _load_payload(body: bytes) -> dict:
+    """Decode a webhook body, which both providers send as a JSON object."""
+    payload = json.loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError("Webhook payload is not a JSON object")
+    return payload
+
+
+def handle_webhook(source: str, headers: dict, body: bytes) -> List[WebhookEvent]:
+    """Verify and parse a raw webhook delivery.
+
+    Args:
+        source: "linear" or "github"
+        headers: Request headers (any casing)
+        body: Raw request body
+
+    Returns:
+        Events derived from the delivery (possibly empty)
+
+    Raises:
+        SignatureError: If the signature does not verify
+        ValueError: If the source is unknown or the body is not a JSON object
+    """
+    lowered = {k.lower(): v for k, v in headers.items()}
+
+    if source == "linear":
+        verify_signature(
+            LINEAR_WEBHOOK_SECRET, body, lowered.get("linear-signature", "")
+        )
+        return parse_linear_event(_load_payload(body))
+    if source == "github":
+        verify_signature(
+            GITHUB_WEBHOOK_SECRET, body, lowered.get("x-hub-signature-256", "")
+        )
+        return parse_github_event(
+            lowered.get("x-github-event", ""), _load_payload(body)
+        )
+
+    raise ValueError(f"Unknown webhook source: {source}")
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Accepts POST /webhooks/linear and POST /webhooks/github."""
+
+    def do_POST(self):
+        source = self.path.rstrip("/").rsplit("/", 1)[-1]
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+
+        try:
+            received = handle_webhook(source, dict(self.headers), body)
+        except SignatureError:
+            self.send_response(401)
+            self.end_headers()
+            return
+        except (ValueError, json.JSONDecodeError):
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        for event in received:
+            events.put(event)
+
+        self.send_response(202)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Deliveries are reported by the consumer instead of per request
+        pass
+
+
+def start_webhook_server(
+    host: str = WEBHOOK_HOST, port: int = WEBHOOK_PORT
+) -> ThreadingHTTPServer:
+    """Start the webhook receiver on a daemon thread and return the server.
+
+    Raises:
+        ValueError: If neither LINEAR_WEBHOOK_SECRET nor GITHUB_WEBHOOK_SECRET
+            is set (every delivery would be rejected)
+    """
+    if not LINEAR_WEBHOOK_SECRET and not GITHUB_WEBHOOK_SECRET:
+        raise ValueError(
+            "LINEAR_WEBHOOK_SECRET or GITHUB_WEBHOOK_SECRET must be set to "
+            "receive webhooks"
+        )
+    for name, secret in (
+        ("Linear", LINEAR_WEBHOOK_SECRET),
+        ("GitHub", GITHUB_WEBHOOK_SECRET),
+    ):
+        if not secret:
+            print(f"⚠️ No {name} webhook secret set - rejecting {name} deliveries")
+
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    thread = threading.Thread(target=server.serve_forever, name="webhooks", daemon=True)
+    thread.start()
+    print(f"📡 Webhook receiver listening on http://{host}:{port}/webhooks/<source>")
+    return server
+
+
+def main():
+    """Replay a recorded payload: python -m agent.webhooks replay <source> <file>."""
+    import sys
+
+    if len(sys.argv) < 4 or sys.argv[1] != "replay":
+        print("Usage: python -m agent.webhooks replay <linear|github> <payload.json>")
+        print("       (GitHub payloads read the event type from GITHUB_EVENT)")
+        return
+
+    source, path = sys.argv[2], sys.argv[3]
+    with open(path) as f:
+        payload = json.load(f)
+
+    # Replays are trusted local files - skip signature checks
+    if source == "linear":
+        received = parse_linear_event(payload)
+    else:
+        received = parse_github_event(
+            os.getenv("GITHUB_EVENT", "pull_request"), payload
+        )
+
+    for event in received:
+        print(event.model_dump_json(indent=2))
+    if not received:
+        print("No events derived from payload.")
+
+
+if __name__ == "__main__":
+    main()